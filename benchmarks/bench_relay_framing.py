@@ -0,0 +1,91 @@
+"""Decode large tool_result messages from the Chrome extension.
+
+Three ways a message reaches :meth:`WebSocketBridgeSession.handle_message`:
+
+* ``json, full``     -- text frame, ``ToolResultMessage(**data)`` (before)
+* ``json, envelope`` -- text frame, ``ToolResultMessage.from_envelope``
+* ``binary (v2)``    -- protocol-2 frame with raw attachments
+
+Every path starts from the bytes read off the socket.  For images it ends
+with the base64 string that ``ImageContent`` needs.
+
+    python benchmarks/bench_relay_framing.py [IMAGE_KB] [PAGE_NODES]
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+
+from viyv_mcp.app.ws_bridge_protocol import ToolResultMessage, decode_frame, encode_frame
+
+ENVELOPE = {"type": "tool_result", "id": "c1", "success": True}
+
+
+def json_full(raw: bytes):
+    return ToolResultMessage(**json.loads(raw.decode("utf-8"))).result
+
+
+def json_envelope(raw: bytes):
+    return ToolResultMessage.from_envelope(json.loads(raw.decode("utf-8"))).result
+
+
+def binary(frame: bytes):
+    return ToolResultMessage.from_envelope(decode_frame(frame)).result
+
+
+def image_of(result) -> str:
+    data = result["data"]
+    return data if isinstance(data, str) else base64.b64encode(data).decode("ascii")
+
+
+def bench(fn, payload, rounds: int) -> float:
+    fn(payload)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(payload)
+    return (time.perf_counter() - t0) / rounds
+
+
+def report(title: str, text: bytes, frame: bytes, paths, rounds: int) -> None:
+    print(f"{title}  (wire: json {len(text) / 1024:.0f} KB, binary {len(frame) / 1024:.0f} KB)")
+    baseline = None
+    for name, fn, payload in paths:
+        secs = bench(fn, payload, rounds)
+        baseline = baseline or secs
+        print(f"  {name:<15} {secs * 1e3:7.2f} ms/msg  {baseline / secs:4.1f}x")
+
+
+def main() -> None:
+    size_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    # full-page screenshot
+    image = os.urandom(size_kb * 1024)
+    text = json.dumps({**ENVELOPE, "result": {
+        "data": base64.b64encode(image).decode("ascii"), "format": "jpeg",
+    }}).encode()
+    frame = encode_frame({**ENVELOPE, "result": {"data": {"$bin": 0}, "format": "jpeg"}}, [image])
+    report(f"screenshot {size_kb} KB", text, frame, [
+        ("json, full", lambda t: image_of(json_full(t)), text),
+        ("json, envelope", lambda t: image_of(json_envelope(t)), text),
+        ("binary (v2)", lambda f: image_of(binary(f)), frame),
+    ], rounds=max(10, 20_000 // size_kb))
+
+    # read_page accessibility tree
+    page = {"nodes": [
+        {"ref": f"e{i}", "role": "link", "name": f"Item {i}", "children": [f"e{i + 1}"]}
+        for i in range(nodes)
+    ]}
+    text = json.dumps({**ENVELOPE, "result": page}).encode()
+    frame = encode_frame({**ENVELOPE, "result": page})
+    report(f"read_page {nodes} nodes", text, frame, [
+        ("json, full", json_full, text),
+        ("json, envelope", json_envelope, text),
+        ("binary (v2)", binary, frame),
+    ], rounds=50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Resolve concrete URIs against 10k registered resource templates.
+
+Compares :class:`viyv_mcp.server.uri_template.TemplateIndex` with a linear
+scan over compiled templates (the only alternative for a flat dict).
+
+    python benchmarks/bench_resource_templates.py [N_TEMPLATES]
+"""
+
+import random
+import sys
+import time
+
+from viyv_mcp.server.uri_template import TemplateIndex, UriTemplate
+
+
+def build(n: int):
+    templates = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            templates.append(f"svc{i}://{{id}}")
+        elif kind == 1:
+            templates.append(f"db://table{i}/rows/{{id}}")
+        else:
+            templates.append(f"files://repo{i}/{{+path}}")
+    return templates
+
+
+def concrete(template: str) -> str:
+    return template.replace("{id}", "42").replace("{+path}", "src/pkg/mod.py")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    templates = build(n)
+
+    t0 = time.perf_counter()
+    index = TemplateIndex()
+    for t in templates:
+        index.add(t, t)
+    build_s = time.perf_counter() - t0
+    compiled = [UriTemplate(t) for t in templates]
+    for c in compiled:
+        c.match("")  # compile the regexes up front
+
+    rng = random.Random(0)
+    queries = [concrete(rng.choice(templates)) for _ in range(2_000)]
+
+    t0 = time.perf_counter()
+    for uri in queries:
+        assert index.resolve(uri) is not None
+    trie_us = (time.perf_counter() - t0) / len(queries) * 1e6
+
+    sample = queries[:200]
+    t0 = time.perf_counter()
+    for uri in sample:
+        assert any(c.match(uri) is not None for c in compiled)
+    scan_us = (time.perf_counter() - t0) / len(sample) * 1e6
+
+    print(f"templates:     {n}")
+    print(f"index build:   {build_s * 1e3:.1f} ms")
+    print(f"trie resolve:  {trie_us:.1f} us/lookup")
+    print(f"linear scan:   {scan_us:.1f} us/lookup ({scan_us / trie_us:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Shared fixtures for bridge tests."""
+
+import json
+import sys
+import textwrap
+
+import pytest
+
+# Minimal stdio MCP server used as a bridged external server.  It sleeps
+# STARTUP_DELAY seconds, exits at once if CRASH / CRASH_FILE is set, and serves
+# echo_<name> plus any tool names listed in TOOLS_FILE (re-read on every
+# tools/list) and any resource URIs listed in RESOURCES_FILE.  Calling a tool
+# with ``notify=True`` sends tools/resources list_changed notifications.
+SERVER_SCRIPT = textwrap.dedent('''
+    import os, sys, time
+    time.sleep(float(os.environ.get("STARTUP_DELAY", "0")))
+    import anyio
+    import mcp.types as types
+    from mcp.server.lowlevel import Server
+    from mcp.server.stdio import stdio_server
+
+    if os.environ.get("CRASH") or os.path.exists(os.environ.get("CRASH_FILE", "")):
+        sys.exit(1)
+    server = Server(os.environ["BRIDGE_NAME"])
+
+    def _lines(var):
+        path = os.environ.get(var, "")
+        return open(path).read().split() if os.path.exists(path) else []
+
+    @server.list_tools()
+    async def list_tools():
+        tool_names = ["echo_" + os.environ["BRIDGE_NAME"]] + _lines("TOOLS_FILE")
+        return [types.Tool(name=n, description="echo",
+                           inputSchema={"type": "object", "properties": {"text": {"type": "string"}}})
+                for n in tool_names]
+
+    if os.environ.get("RESOURCES_FILE"):
+        @server.list_resources()
+        async def list_resources():
+            return [types.Resource(uri=u, name=u) for u in _lines("RESOURCES_FILE")]
+
+    @server.call_tool()
+    async def call_tool(name, arguments):
+        # Blocking sleep: behaves like a single-threaded external server
+        time.sleep(float(arguments.get("block", 0)))
+        if arguments.get("notify"):
+            session = server.request_context.session
+            await session.send_tool_list_changed()
+            await session.send_resource_list_changed()
+        return [types.TextContent(type="text", text=arguments.get("text", "")),
+                types.TextContent(type="text", text=str(os.getpid()))]
+
+    async def main():
+        async with stdio_server() as (r, w):
+            await server.run(r, w, server.create_initialization_options())
+
+    anyio.run(main)
+''')
+
+
+@pytest.fixture
+def write_bridge(tmp_path):
+    """Return ``write(name, delay=0, extra_cfg=None, **env)`` that adds a bridge JSON."""
+
+    def _write(name, delay=0.0, extra_cfg=None, **extra_env):
+        _write_bridge(tmp_path, name, delay, extra_cfg, **extra_env)
+
+    return _write
+
+
+def _write_bridge(tmp_path, name, delay=0.0, extra_cfg=None, **extra_env):
+    script = tmp_path / "server.py"
+    if not script.exists():
+        script.write_text(SERVER_SCRIPT)
+    env = {"BRIDGE_NAME": name, "STARTUP_DELAY": str(delay), **extra_env}
+    cfg = {"name": name, "command": sys.executable, "args": [str(script)],
+           "env": env, "namespace": "ext", "tags": ["bridge"], **(extra_cfg or {})}
+    (tmp_path / f"{name}.json").write_text(json.dumps(cfg))
@@ -0,0 +1,121 @@
+"""Tests for memory-mapped file resources, byte ranges and the blob cache."""
+
+import base64
+import hashlib
+import json
+import os
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from viyv_mcp.app.bridge_manager import BridgeSet
+from viyv_mcp.server import FileResource, McpServer
+from viyv_mcp.server.blob import BlobReader, parse_byte_range
+from viyv_mcp.server.registry import ResourceEntry
+
+PAYLOAD = bytes(range(256)) * 40  # 10 KiB, not valid UTF-8
+
+
+@pytest.fixture
+def blob_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(PAYLOAD)
+    return path
+
+
+def _server(blob_file, **reader):
+    mcp = McpServer("blobs")
+    if reader:
+        mcp.blob_reader = BlobReader(**reader)
+    mcp.registry.register_resource(ResourceEntry(
+        "blob://data", "data", "", lambda uri: FileResource(blob_file),
+    ))
+    mcp.registry.register_resource(ResourceEntry(
+        "mem://raw", "raw", "", lambda uri: PAYLOAD[:16], "image/png",
+    ))
+    return mcp
+
+
+async def test_file_resource_is_served_as_blob(blob_file):
+    mcp = _server(blob_file)
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        result = await client.read_resource(AnyUrl("blob://data"))
+        (contents,) = result.contents
+        assert base64.b64decode(contents.blob) == PAYLOAD
+        assert contents.mimeType == "application/octet-stream"
+        assert contents.meta == {"sha256": hashlib.sha256(PAYLOAD).hexdigest(), "size": len(PAYLOAD)}
+
+        result = await client.read_resource(AnyUrl("mem://raw"))
+        assert base64.b64decode(result.contents[0].blob) == PAYLOAD[:16]
+        assert result.contents[0].mimeType == "image/png"
+
+
+async def test_byte_ranges_and_inline_limit(blob_file):
+    mcp = _server(blob_file, max_inline_bytes=4096, cache_bytes=1 << 20)
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        with pytest.raises(Exception, match=r"limited to 4096 bytes.*\?bytes=0-4095"):
+            await client.read_resource(AnyUrl("blob://data"))
+
+        chunks = []
+        for start in range(0, len(PAYLOAD), 4096):
+            result = await client.read_resource(AnyUrl(f"blob://data?bytes={start}-{start + 4095}"))
+            contents = result.contents[0]
+            assert contents.meta["size"] == len(PAYLOAD)
+            assert contents.meta["range"][0] == start
+            chunks.append(base64.b64decode(contents.blob))
+        assert b"".join(chunks) == PAYLOAD
+
+        result = await client.read_resource(AnyUrl("mem://raw?bytes=4-"))
+        assert base64.b64decode(result.contents[0].blob) == PAYLOAD[4:16]
+
+
+async def test_unchanged_files_are_served_from_cache(blob_file):
+    reader = BlobReader(max_inline_bytes=0, cache_bytes=1 << 20)
+    first = await reader.read_file("blob://data", FileResource(blob_file))
+    again = await reader.read_file("blob://data", FileResource(blob_file))
+    assert again.blob is first.blob
+    assert reader.stats()["hits"] == 1
+
+    blob_file.write_bytes(b"changed")
+    os.utime(blob_file, ns=(0, 0))  # size and mtime both differ
+    changed = await reader.read_file("blob://data", FileResource(blob_file))
+    assert base64.b64decode(changed.blob) == b"changed"
+    assert reader.stats()["misses"] == 2
+
+    # over the byte budget, the oldest entry is evicted first
+    small = BlobReader(max_inline_bytes=0, cache_bytes=16)
+    await small.read_file("blob://data", FileResource(blob_file))  # 12 encoded bytes
+    await small.read_file("blob://data", FileResource(blob_file, offset=1))  # 8
+    assert (small.stats()["entries"], small.stats()["cached_bytes"]) == (1, 8)
+
+
+def test_parse_byte_range():
+    assert parse_byte_range("file://a?bytes=0-9") == ("file://a", 0, 10)
+    assert parse_byte_range("file://a?v=1&bytes=5-") == ("file://a?v=1", 5, None)
+    assert parse_byte_range("file://a") is None
+    with pytest.raises(Exception, match="Invalid byte range"):
+        parse_byte_range("file://a?bytes=9-1")
+
+
+async def test_bridged_blobs_are_not_decoded(tmp_path, monkeypatch):
+    pkg = tmp_path / "pkgs"
+    pkg.mkdir()
+    (pkg / "blob_upstream.py").write_text(
+        "from viyv_mcp.server import McpServer\n"
+        "from viyv_mcp.server.registry import ResourceEntry\n"
+        "server = McpServer('upstream')\n"
+        f"server.registry.register_resource(ResourceEntry('bin://x', 'x', '', lambda uri: {PAYLOAD[:300]!r}))\n"
+    )
+    monkeypatch.syspath_prepend(str(pkg))
+    (tmp_path / "up.json").write_text(json.dumps({"name": "up", "module": "blob_upstream:server"}))
+
+    mcp = McpServer("host")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    try:
+        async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+            result = await client.read_resource(AnyUrl("bin://x"))
+            assert base64.b64decode(result.contents[0].blob) == PAYLOAD[:300]
+    finally:
+        await bridge_set.close()
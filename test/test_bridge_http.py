@@ -0,0 +1,128 @@
+"""Tests for HTTP-transport bridges over a shared connection pool."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import uvicorn
+
+from viyv_mcp.app.bridge_manager import BridgeConfig, BridgeSet
+from viyv_mcp.app.bridge_manifest import manifest_key
+from viyv_mcp.app.bridge_transport import HttpConnectionPool, _RetryingTransport
+from viyv_mcp.server import McpServer
+
+
+@pytest.fixture
+async def upstream():
+    """A second in-process McpServer served over Streamable HTTP."""
+    server = McpServer("upstream")
+
+    async def remote_echo(text: str) -> str:
+        return f"upstream:{text}"
+
+    server.register_tool(
+        "remote_echo", "Echo from upstream", remote_echo,
+        {"type": "object", "properties": {"text": {"type": "string"}}},
+    )
+    config = uvicorn.Config(
+        server.http_app(), host="127.0.0.1", port=0, log_level="warning", lifespan="on",
+    )
+    uv = uvicorn.Server(config)
+    task = asyncio.create_task(uv.serve())
+    while not uv.started:
+        await asyncio.sleep(0.02)
+    port = uv.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}/"
+    finally:
+        uv.should_exit = True
+        await task
+
+
+def _write(tmp_path, name, **cfg):
+    (tmp_path / f"{name}.json").write_text(json.dumps({"name": name, **cfg}))
+
+
+async def test_http_bridge_registers_and_calls_remote_tools(tmp_path, upstream):
+    _write(tmp_path, "remote", transport="http", url=upstream, namespace="ext",
+           instances=2)
+    mcp = McpServer("downstream")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    try:
+        assert handle.state == "ready" and len(handle.instances) == 2
+        fn = mcp.registry.get_tool("remote_echo").fn
+        results = await asyncio.gather(*(fn(text=str(i)) for i in range(20)))
+        assert [r.content[0].text for r in results] == [f"upstream:{i}" for i in range(20)]
+
+        # both instances share one keep-alive pool: connections are reused,
+        # not opened per call
+        pool = bridge_set.http_pool.transport._pool
+        assert 0 < len(pool.connections) <= 6
+    finally:
+        await bridge_set.close()
+    assert bridge_set.http_pool._transport is None
+
+
+async def test_unreachable_http_bridge_fails_without_blocking_others(tmp_path, write_bridge):
+    write_bridge("local")
+    _write(tmp_path, "down", transport="http", url="http://127.0.0.1:9/", retries=0,
+           timeout=2)
+    mcp = McpServer("mixed")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    try:
+        states = {h.name: h.state for h in bridge_set.handles}
+        assert states == {"down": "failed", "local": "ready"}
+    finally:
+        await bridge_set.close()
+
+
+async def test_retrying_transport_retries_connect_errors_only():
+    class _Flaky(httpx.AsyncBaseTransport):
+        def __init__(self, failures, error):
+            self.failures, self.error, self.calls = failures, error, 0
+
+        async def handle_async_request(self, request):
+            self.calls += 1
+            if self.calls <= self.failures:
+                raise self.error("boom", request=request)
+            return httpx.Response(200)
+
+    request = httpx.Request("POST", "http://upstream/")
+    flaky = _Flaky(2, httpx.ConnectError)
+    response = await _RetryingTransport(flaky, retries=2, backoff=0).handle_async_request(request)
+    assert response.status_code == 200 and flaky.calls == 3
+
+    flaky = _Flaky(5, httpx.ConnectError)
+    with pytest.raises(httpx.ConnectError):
+        await _RetryingTransport(flaky, retries=1, backoff=0).handle_async_request(request)
+    assert flaky.calls == 2
+
+    # a read error may mean the request was processed: never retried
+    flaky = _Flaky(1, httpx.ReadError)
+    with pytest.raises(httpx.ReadError):
+        await _RetryingTransport(flaky, retries=3, backoff=0).handle_async_request(request)
+    assert flaky.calls == 1
+
+
+def test_http_config_parsing_and_validation():
+    cfg = BridgeConfig.from_dict({
+        "name": "r", "transport": "http", "url": "https://mcp.example.com/mcp",
+        "headers": {"Authorization": "Bearer x"}, "timeout": 5, "retries": 4,
+    })
+    assert (cfg.transport, cfg.timeout, cfg.retries) == ("http", 5.0, 4)
+    transport = cfg.make_transport(HttpConnectionPool())
+    assert transport.kind == "http" and transport.url == "https://mcp.example.com/mcp"
+
+    other = BridgeConfig.from_dict({**cfg.__dict__, "headers": {"Authorization": "Bearer y"}})
+    assert manifest_key(other) != manifest_key(cfg)
+
+    with pytest.raises(ValueError, match="without a url"):
+        BridgeConfig.from_dict({"name": "r", "transport": "http"})
+    with pytest.raises(ValueError, match="Unknown transport"):
+        BridgeConfig.from_dict({"name": "r", "transport": "carrier-pigeon", "url": "x"})
+    with pytest.raises(KeyError):
+        BridgeConfig.from_dict({"name": "r"})  # stdio still needs a command
@@ -0,0 +1,113 @@
+"""Tests for in-process ("module") bridges over memory streams."""
+
+import json
+import os
+import textwrap
+
+import pytest
+
+from viyv_mcp.app.bridge_manager import BridgeConfig, BridgeSet
+from viyv_mcp.app.bridge_transport import load_server_object
+from viyv_mcp.server import McpServer
+
+SERVER_MODULE = textwrap.dedent('''
+    import os
+    import mcp.types as types
+    from mcp.server.lowlevel import Server
+
+    from viyv_mcp.server import McpServer
+
+    server = Server("inproc")
+
+    @server.list_tools()
+    async def list_tools():
+        return [types.Tool(name="whoami", description="pid of the serving process",
+                           inputSchema={"type": "object", "properties": {}})]
+
+    @server.call_tool()
+    async def call_tool(name, arguments):
+        return [types.TextContent(type="text", text=str(os.getpid()))]
+
+    def make_server():
+        return server
+
+    viyv = McpServer("inproc-viyv")
+
+    async def ping() -> str:
+        return "pong"
+
+    viyv.register_tool("viyv_ping", "", ping, {"type": "object", "properties": {}})
+
+    from viyv_mcp.server.registry import ResourceEntry
+
+    viyv.registry.register_resource(
+        ResourceEntry("notes://{+path}", "notes", "", lambda path: path)
+    )
+
+    not_a_server = 42
+''')
+
+
+@pytest.fixture
+def server_module(tmp_path, monkeypatch):
+    pkg = tmp_path / "pkgs"
+    pkg.mkdir()
+    (pkg / "inproc_server.py").write_text(SERVER_MODULE)
+    monkeypatch.syspath_prepend(str(pkg))
+    return "inproc_server"
+
+
+def _write(tmp_path, name, **cfg):
+    (tmp_path / f"{name}.json").write_text(json.dumps({"name": name, **cfg}))
+
+
+async def test_module_bridge_runs_in_process(tmp_path, server_module):
+    _write(tmp_path, "inproc", module=f"{server_module}:server", instances=2)
+    mcp = McpServer("host")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    try:
+        assert handle.config.transport == "module"
+        assert handle.state == "ready" and len(handle.instances) == 2
+        result = await mcp.registry.get_tool("whoami").fn()
+        assert result.content[0].text == str(os.getpid())
+    finally:
+        await bridge_set.close()
+    assert handle.state == "closed"
+
+
+def test_load_server_object_accepts_factories_and_wrappers(server_module):
+    plain = load_server_object(f"{server_module}:server")
+    assert load_server_object(f"{server_module}:make_server") is plain
+    assert load_server_object(f"{server_module}:viyv").name == "inproc-viyv"
+
+    with pytest.raises(TypeError, match="not an MCP server"):
+        load_server_object(f"{server_module}:not_a_server")
+    with pytest.raises(ValueError, match="expected 'pkg.module:attr'"):
+        load_server_object(server_module)
+
+
+async def test_wrapped_mcp_server_and_bad_module(tmp_path, server_module):
+    _write(tmp_path, "viyv", module=f"{server_module}:viyv")
+    _write(tmp_path, "broken", module="no_such_module_xyz:app")
+    mcp = McpServer("host")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    try:
+        states = {h.name: h.state for h in bridge_set.handles}
+        assert states == {"broken": "failed", "viyv": "ready"}
+        result = await mcp.registry.get_tool("viyv_ping").fn()
+        assert result.content[0].text == "pong"
+        # resources/templates/list is bridged and indexed as a template
+        entry, variables = mcp.registry.resolve_resource("notes://a/b.md")
+        assert entry.name == "notes" and variables == {"path": "a/b.md"}
+    finally:
+        await bridge_set.close()
+
+
+def test_module_config_validation():
+    cfg = BridgeConfig.from_dict({"name": "m", "module": "pkg.server:app"})
+    assert cfg.transport == "module" and cfg.module == "pkg.server:app"
+    with pytest.raises(ValueError, match="without a module"):
+        BridgeConfig.from_dict({"name": "m", "transport": "module"})
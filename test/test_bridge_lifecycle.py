@@ -0,0 +1,103 @@
+"""Tests for lazy-start / idle-stop bridges ("lifecycle": "lazy")."""
+
+import asyncio
+import os
+import signal
+
+import pytest
+
+from viyv_mcp.app.bridge_manager import BridgeConfig, BridgeSet
+from viyv_mcp.app.bridge_supervisor import BridgeSupervisor
+from viyv_mcp.server import McpServer
+
+LAZY = {"lifecycle": "lazy", "idle_timeout": 0.5}
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def _wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.05)
+
+
+def test_lifecycle_parsing():
+    cfg = BridgeConfig.from_dict({"name": "a", "command": "x", **LAZY})
+    assert cfg.lifecycle == "lazy" and cfg.idle_timeout == 0.5
+    assert BridgeConfig.from_dict({"name": "b", "command": "x"}).lifecycle == "eager"
+    assert BridgeConfig.from_dict(
+        {"name": "c", "command": "x", "lifecycle": "sometimes"}
+    ).lifecycle == "eager"
+
+
+@pytest.mark.asyncio
+async def test_idle_stop_and_restart_on_next_call(tmp_path, write_bridge):
+    write_bridge("sleepy", extra_cfg=LAZY)
+    mcp = McpServer("lazy-idle")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    fn = mcp.registry.get_tool("echo_sleepy").fn
+    try:
+        first_pid = int((await fn(text="a")).content[1].text)
+        await _wait_for(lambda: handle.state == "idle")
+
+        # tools stay registered; the subprocess is gone
+        assert handle.instances == []
+        assert mcp.registry.get_tool("echo_sleepy") is not None
+        await _wait_for(lambda: not _alive(first_pid))
+
+        result = await fn(text="again")
+        assert result.content[0].text == "again"
+        assert int(result.content[1].text) != first_pid
+        assert handle.state == "ready"
+        await _wait_for(lambda: handle.state == "idle")
+    finally:
+        await bridge_set.close()
+
+
+@pytest.mark.asyncio
+async def test_in_flight_call_keeps_bridge_running(tmp_path, write_bridge):
+    write_bridge("busy", extra_cfg=LAZY)
+    mcp = McpServer("lazy-busy")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    try:
+        result = await mcp.registry.get_tool("echo_busy").fn(text="slow", block=1.2)
+        assert result.content[0].text == "slow"
+        assert handle.state == "ready" and len(handle.instances) == 1
+    finally:
+        await bridge_set.close()
+
+
+@pytest.mark.asyncio
+async def test_crashed_lazy_bridge_is_respawned_by_next_call(tmp_path, write_bridge):
+    write_bridge("fragile", extra_cfg={"lifecycle": "lazy", "idle_timeout": 0})
+    mcp = McpServer("lazy-crash")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    supervisor = BridgeSupervisor(mcp, bridge_set.handles, interval=0, ping_timeout=2)
+    fn = mcp.registry.get_tool("echo_fragile").fn
+    try:
+        pid = int((await fn(text="x")).content[1].text)
+        os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.3)
+        await supervisor.check_once()
+        assert handle.state == "idle" and handle.instances == []
+        assert handle.restarts == 0
+
+        result = await fn(text="y")
+        assert result.content[0].text == "y"
+        assert handle.state == "ready"
+    finally:
+        await bridge_set.close()
@@ -0,0 +1,186 @@
+"""Tests for concurrent bridge startup (init_bridges / close_bridges)."""
+
+import asyncio
+import json
+import os
+import signal
+import time
+
+import pytest
+
+from viyv_mcp.app.bridge_manager import (
+    BridgeConfig,
+    BridgeSet,
+    close_bridges,
+    init_bridges,
+    load_bridge_configs,
+)
+from viyv_mcp.server import McpServer
+
+def test_bridge_config_parsing(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps({
+        "name": "a", "command": "run", "security_level": "2",
+        "security_level_map": {"t": "x", "u": 1},
+    }))
+    (tmp_path / "broken.json").write_text("{")
+    configs = load_bridge_configs(str(tmp_path))
+    assert [c.name for c in configs] == ["a"]
+    assert configs[0].security_level == 2
+    assert configs[0].security_level_map == {"u": 1}
+    assert (configs[0].min_instances, configs[0].max_instances) == (1, 1)
+
+
+def test_instances_config():
+    fixed = BridgeConfig.from_dict({"name": "x", "command": "run", "instances": 3})
+    assert (fixed.min_instances, fixed.max_instances) == (3, 3)
+    scaled = BridgeConfig.from_dict(
+        {"name": "x", "command": "run", "instances": {"min": 1, "max": 4}}
+    )
+    assert (scaled.min_instances, scaled.max_instances) == (1, 4)
+
+
+def test_env_merge_prefers_os_environment(monkeypatch):
+    monkeypatch.setenv("BRIDGE_TOKEN", "from-os")
+    cfg = BridgeConfig.from_dict({"name": "x", "command": "run",
+                                  "env": {"BRIDGE_TOKEN": "from-json", "OTHER": "1"}})
+    assert cfg.server_params().env == {"BRIDGE_TOKEN": "from-os", "OTHER": "1"}
+
+
+@pytest.mark.asyncio
+async def test_bridges_start_concurrently(tmp_path, write_bridge):
+    for name in ("alpha", "beta", "gamma"):
+        write_bridge(name, delay=3.0)
+    mcp = McpServer("bridge-concurrency")
+
+    t0 = time.perf_counter()
+    bridges = await init_bridges(mcp, str(tmp_path), concurrency=3)
+    elapsed = time.perf_counter() - t0
+    try:
+        assert sorted(h.name for h in bridges) == ["alpha", "beta", "gamma"]
+        # Sequential startup would take at least 3 x 3s
+        assert elapsed < 8.0
+        for h in bridges:
+            assert h.state == "ready"
+            assert set(h.timings) == {"connect", "list", "total"}
+            entry = mcp.registry.get_tool(f"echo_{h.name}")
+            assert entry is not None and entry.security.namespace == "ext"
+
+        result = await mcp.registry.get_tool("echo_beta").fn(text="hi")
+        assert result.content[0].text == "hi"
+    finally:
+        await close_bridges(bridges)
+    assert all(h.state == "closed" for h in bridges)
+
+
+@pytest.mark.asyncio
+async def test_failed_bridge_does_not_block_others(tmp_path, write_bridge):
+    write_bridge("good")
+    write_bridge("bad", CRASH="1")
+    mcp = McpServer("bridge-failure")
+
+    bridges = await init_bridges(mcp, str(tmp_path))
+    try:
+        assert [h.name for h in bridges] == ["good"]
+        assert mcp.registry.get_tool("echo_bad") is None
+    finally:
+        await close_bridges(bridges)
+
+
+@pytest.mark.asyncio
+async def test_background_attach_reports_readiness(tmp_path, write_bridge):
+    write_bridge("slow", delay=0.5)
+    mcp = McpServer("bridge-background")
+    ready = []
+
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    task = bridge_set.start_background(mcp, on_ready=ready.append)
+    try:
+        # Returns immediately; the bridge is still starting
+        status = bridge_set.status()
+        assert status["ready"] is False
+        assert status["bridges"]["slow"]["state"] in ("pending", "starting")
+
+        await task
+        status = bridge_set.status()
+        assert status["ready"] is True
+        assert status["bridges"]["slow"]["state"] == "ready"
+        assert status["bridges"]["slow"]["tools"] == 1
+        assert [h.name for h in ready] == ["slow"]
+        assert mcp.registry.get_tool("echo_slow") is not None
+    finally:
+        await bridge_set.close()
+
+
+@pytest.mark.asyncio
+async def test_instance_pool_routes_least_in_flight(tmp_path, write_bridge):
+    write_bridge("pooled", extra_cfg={"instances": 2})
+    mcp = McpServer("bridge-pool")
+    bridges = await init_bridges(mcp, str(tmp_path))
+    try:
+        handle = bridges[0]
+        assert len(handle.instances) == 2
+        fn = mcp.registry.get_tool("echo_pooled").fn
+
+        t0 = time.perf_counter()
+        results = await asyncio.gather(fn(block=1.0), fn(block=1.0))
+        elapsed = time.perf_counter() - t0
+        pids = {r.content[1].text for r in results}
+        assert len(pids) == 2
+        # Two blocking calls on a single instance would take 2s
+        assert elapsed < 1.8
+        assert sum(i.calls for i in handle.instances) == 2
+        assert all(i.in_flight == 0 for i in handle.instances)
+    finally:
+        await close_bridges(bridges)
+
+
+@pytest.mark.asyncio
+async def test_pool_scales_up_on_queue_depth_and_back_down(tmp_path, write_bridge):
+    write_bridge("elastic", extra_cfg={
+        "instances": {"min": 1, "max": 2}, "scale_down_idle": 0.5,
+    })
+    mcp = McpServer("bridge-autoscale")
+    bridges = await init_bridges(mcp, str(tmp_path))
+    try:
+        handle = bridges[0]
+        fn = mcp.registry.get_tool("echo_elastic").fn
+        assert len(handle.instances) == 1
+
+        # Second concurrent call sees a busy instance and triggers a scale-up
+        await asyncio.gather(fn(block=0.5), fn(block=0.5))
+        for _ in range(100):
+            if len(handle.instances) == 2:
+                break
+            await asyncio.sleep(0.05)
+        assert len(handle.instances) == 2
+
+        for _ in range(100):
+            if len(handle.instances) == 1:
+                break
+            await asyncio.sleep(0.05)
+        assert len(handle.instances) == 1
+    finally:
+        await close_bridges(bridges)
+
+
+@pytest.mark.asyncio
+async def test_dead_instance_leaves_the_pool(tmp_path, write_bridge):
+    write_bridge("fragile", extra_cfg={"instances": 2})
+    mcp = McpServer("bridge-dead")
+    bridges = await init_bridges(mcp, str(tmp_path))
+    try:
+        handle = bridges[0]
+        victim = handle.instances[0]
+        pid = int((await victim.session.call_tool("echo_fragile", {})).content[1].text)
+        os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.3)
+
+        # Calls routed to the dead instance fail over to the live one
+        fn = mcp.registry.get_tool("echo_fragile").fn
+        for _ in range(3):
+            result = await fn(text="still up")
+            assert result.content[0].text == "still up"
+        assert victim not in handle.instances and victim.state == "dead"
+        assert len(handle.instances) == 1
+    finally:
+        await close_bridges(bridges)
@@ -0,0 +1,112 @@
+"""Tests for the persisted bridge manifest cache and lazy first-use startup."""
+
+import asyncio
+import json
+
+import pytest
+
+from viyv_mcp.app.bridge_manager import BridgeSet, load_bridge_configs
+from viyv_mcp.app.bridge_manifest import load_manifest, manifest_key
+from viyv_mcp.server import McpServer
+
+
+async def _boot(tmp_path, name="boot"):
+    mcp = McpServer(name)
+    bridge_set = BridgeSet.from_config(str(tmp_path), manifest_dir=str(tmp_path / "manifests"))
+    await bridge_set.start(mcp)
+    return mcp, bridge_set
+
+
+@pytest.mark.asyncio
+async def test_second_boot_advertises_from_cache_and_reconciles(tmp_path, write_bridge):
+    tools_file = tmp_path / "tools.txt"
+    tools_file.write_text("old_tool")
+    write_bridge("cached", TOOLS_FILE=str(tools_file))
+
+    # 1st boot: spawns the bridge and writes the manifest
+    mcp, bridge_set = await _boot(tmp_path, "first")
+    await bridge_set.close()
+    manifest = load_manifest(str(tmp_path / "manifests"), bridge_set.handles[0].config)
+    assert sorted(t.name for t in manifest.tools) == ["echo_cached", "old_tool"]
+
+    # 2nd boot: tools come from the cache, no subprocess yet
+    tools_file.write_text("new_tool")
+    mcp, bridge_set = await _boot(tmp_path, "second")
+    handle = bridge_set.handles[0]
+    try:
+        assert handle.state == "idle" and handle.instances == []
+        assert mcp.registry.get_tool("old_tool") is not None
+        assert bridge_set.status()["bridges"]["cached"]["state"] == "idle"
+
+        notified = []
+        mcp.notify_list_changed = lambda *kinds: notified.extend(kinds)
+        result = await mcp.registry.get_tool("echo_cached").fn(text="hi")
+        assert result.content[0].text == "hi"
+        assert handle.state == "ready" and len(handle.instances) == 1
+
+        # the live listing replaced the cached one
+        assert mcp.registry.get_tool("old_tool") is None
+        assert mcp.registry.get_tool("new_tool") is not None
+        assert notified == ["tools"]
+    finally:
+        await bridge_set.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_calls_share_one_startup(tmp_path, write_bridge):
+    write_bridge("shared", delay=0.5)
+    _, bridge_set = await _boot(tmp_path, "warm")
+    await bridge_set.close()
+
+    mcp, bridge_set = await _boot(tmp_path, "lazy")
+    handle = bridge_set.handles[0]
+    try:
+        fn = mcp.registry.get_tool("echo_shared").fn
+        results = await asyncio.gather(*(fn(text=str(i)) for i in range(5)))
+        assert [r.content[0].text for r in results] == [str(i) for i in range(5)]
+        assert len({r.content[1].text for r in results}) == 1
+        assert len(handle.instances) == 1
+    finally:
+        await bridge_set.close()
+
+
+def test_manifest_key_tracks_command_args_and_env(tmp_path, write_bridge, monkeypatch):
+    write_bridge("keyed")
+    cfg = load_bridge_configs(str(tmp_path))[0]
+    key = manifest_key(cfg)
+
+    cfg.args = cfg.args + ["--verbose"]
+    assert manifest_key(cfg) != key
+    cfg.args = cfg.args[:-1]
+    assert manifest_key(cfg) == key
+
+    # OS environment overrides the configured value, so it is part of the key
+    monkeypatch.setenv("STARTUP_DELAY", "1")
+    assert manifest_key(cfg) != key
+
+
+@pytest.mark.asyncio
+async def test_stale_or_disabled_cache_starts_eagerly(tmp_path, write_bridge):
+    write_bridge("eager")
+    _, bridge_set = await _boot(tmp_path, "warm")
+    await bridge_set.close()
+
+    # changing the command line invalidates the cached manifest
+    cfg_path = tmp_path / "eager.json"
+    cfg = json.loads(cfg_path.read_text())
+    cfg["env"]["EXTRA"] = "1"
+    cfg_path.write_text(json.dumps(cfg))
+    _, bridge_set = await _boot(tmp_path, "stale")
+    try:
+        assert bridge_set.handles[0].state == "ready"
+    finally:
+        await bridge_set.close()
+
+    # per-bridge opt-out
+    cfg["manifest_cache"] = False
+    cfg_path.write_text(json.dumps(cfg))
+    _, bridge_set = await _boot(tmp_path, "opt-out")
+    try:
+        assert bridge_set.handles[0].state == "ready"
+    finally:
+        await bridge_set.close()
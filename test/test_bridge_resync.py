@@ -0,0 +1,123 @@
+"""Tests for list_changed-driven bridge re-sync and paginated bridge listings."""
+
+import asyncio
+
+import pytest
+import mcp.types as types
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.app.bridge_manager import (
+    BridgeSet,
+    _safe_list_prompts,
+    _safe_list_resources,
+    _safe_list_tools,
+)
+from viyv_mcp.server import McpServer
+
+
+async def _wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_list_changed_applies_only_the_delta(tmp_path, write_bridge):
+    tools_file = tmp_path / "tools.txt"
+    resources_file = tmp_path / "resources.txt"
+    tools_file.write_text("keep_tool drop_tool")
+    resources_file.write_text("res://old")
+    write_bridge("live", TOOLS_FILE=str(tools_file), RESOURCES_FILE=str(resources_file))
+    mcp = McpServer("resync")
+    mcp.tools_changed_delay = 0.05
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    received = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification):
+            received.append(type(message.root).__name__)
+
+    try:
+        async with create_connected_server_and_client_session(
+            mcp.low_level_server, message_handler=on_message,
+        ) as client:
+            await client.list_tools()
+            keep_entry = mcp.registry.get_tool("keep_tool")
+            version = mcp.registry.version
+
+            tools_file.write_text("keep_tool new_tool")
+            resources_file.write_text("res://new")
+            await mcp.registry.get_tool("echo_live").fn(text="x", notify=True)
+            await _wait_for(lambda: mcp.registry.get_tool("new_tool") is not None)
+            await asyncio.sleep(0.3)
+
+            assert mcp.registry.get_tool("drop_tool") is None
+            assert mcp.registry.get_tool("keep_tool") is keep_entry  # untouched
+            assert mcp.registry.get_resource("res://old") is None
+            assert mcp.registry.get_resource("res://new") is not None
+            # +new_tool, -drop_tool, +res://new, -res://old
+            assert mcp.registry.version - version == 4
+            assert sorted(received) == [
+                "ResourceListChangedNotification",
+                "ToolListChangedNotification",
+            ]
+    finally:
+        await bridge_set.close()
+
+
+class _PagedSession:
+    """Serves ``items`` two per page, like a server that sets ``nextCursor``."""
+
+    def __init__(self, result_cls, attr, items, fail=False):
+        self._result_cls, self._attr, self._items, self._fail = result_cls, attr, items, fail
+        self.calls = 0
+
+    async def _list(self, params=None):
+        self.calls += 1
+        if self._fail:
+            raise RuntimeError("boom")
+        start = int(params.cursor) if params else 0
+        end = start + 2
+        return self._result_cls(**{
+            self._attr: self._items[start:end],
+            "nextCursor": str(end) if end < len(self._items) else None,
+        })
+
+    list_tools = list_resources = list_prompts = _list
+
+
+@pytest.mark.asyncio
+async def test_listings_follow_next_cursor():
+    schema = {"type": "object"}
+    tools = [types.Tool(name=f"t{i}", inputSchema=schema) for i in range(5)]
+    session = _PagedSession(types.ListToolsResult, "tools", tools)
+    assert [t.name for t in await _safe_list_tools(session, "paged")] == [
+        "t0", "t1", "t2", "t3", "t4",
+    ]
+    assert session.calls == 3
+
+    resources = [types.Resource(uri=f"res://{i}", name=str(i)) for i in range(3)]
+    session = _PagedSession(types.ListResourcesResult, "resources", resources)
+    assert len(await _safe_list_resources(session, "paged")) == 3
+
+    prompts = [types.Prompt(name=f"p{i}") for i in range(4)]
+    session = _PagedSession(types.ListPromptsResult, "prompts", prompts)
+    assert len(await _safe_list_prompts(session, "paged")) == 4
+
+
+@pytest.mark.asyncio
+async def test_repeated_cursor_stops_and_errors_use_on_error():
+    class _Looping:
+        async def list_tools(self, params=None):
+            return types.ListToolsResult(
+                tools=[types.Tool(name="only", inputSchema={})], nextCursor="same",
+            )
+
+    assert [t.name for t in await _safe_list_tools(_Looping(), "loop")] == ["only"]
+
+    failing = _PagedSession(types.ListToolsResult, "tools", [], fail=True)
+    assert await _safe_list_tools(failing, "down") == []
+    assert await _safe_list_tools(failing, "down", on_error=None) is None
@@ -0,0 +1,104 @@
+"""Tests for bridge health checks, auto-restart and circuit breaking."""
+
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+from mcp.shared.exceptions import McpError
+
+from viyv_mcp.app.bridge_manager import BridgeSet
+from viyv_mcp.app.bridge_supervisor import BridgeSupervisor
+from viyv_mcp.server import McpServer
+
+
+async def _pid(handle):
+    result = await handle.instances[0].session.call_tool(f"echo_{handle.name}", {})
+    return int(result.content[1].text)
+
+
+async def _kill(handle):
+    os.kill(await _pid(handle), signal.SIGKILL)
+    await asyncio.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_ping_detects_dead_process_and_circuit_fails_fast(tmp_path, write_bridge):
+    write_bridge("flaky", CRASH_FILE=str(tmp_path / "crash"))
+    mcp = McpServer("supervisor-circuit")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    supervisor = BridgeSupervisor(mcp, bridge_set.handles, interval=0, ping_timeout=2)
+    try:
+        (tmp_path / "crash").touch()  # restarts fail until removed
+        await _kill(handle)
+        await supervisor.check_once()
+
+        assert handle.circuit_open
+        assert handle.state == "failed"
+        assert handle.retry_at is not None
+        with pytest.raises(McpError, match="Bridge 'flaky' is unavailable"):
+            await mcp.registry.get_tool("echo_flaky").fn(text="x")
+    finally:
+        await bridge_set.close()
+
+
+@pytest.mark.asyncio
+async def test_restart_with_backoff_and_resync(tmp_path, write_bridge):
+    tools_file = tmp_path / "tools.txt"
+    tools_file.write_text("old_tool")
+    crash_file = tmp_path / "crash"
+    write_bridge("phoenix", TOOLS_FILE=str(tools_file), CRASH_FILE=str(crash_file))
+    mcp = McpServer("supervisor-restart")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    assert mcp.registry.get_tool("old_tool") is not None
+    supervisor = BridgeSupervisor(
+        mcp, bridge_set.handles, interval=0, ping_timeout=2, backoff_base=0.2,
+    )
+    try:
+        crash_file.touch()
+        await _kill(handle)
+        await supervisor.check_once()       # detect + first (failing) restart
+        first_retry = handle.retry_at
+        await asyncio.sleep(0.25)
+        await supervisor.check_once()       # second failure doubles the delay
+        assert handle.retry_at - first_retry >= 0.35
+
+        crash_file.unlink()
+        tools_file.write_text("new_tool")
+        await asyncio.sleep(max(0.0, handle.retry_at - time.monotonic()) + 0.5)
+        await supervisor.check_once()
+
+        assert handle.state == "ready" and handle.restarts == 1
+        assert mcp.registry.get_tool("old_tool") is None
+        assert mcp.registry.get_tool("new_tool") is not None
+        result = await mcp.registry.get_tool("echo_phoenix").fn(text="back")
+        assert result.content[0].text == "back"
+    finally:
+        await bridge_set.close()
+
+
+@pytest.mark.asyncio
+async def test_bridge_failing_at_startup_is_retried(tmp_path, write_bridge):
+    crash_file = tmp_path / "crash"
+    crash_file.touch()
+    write_bridge("late", CRASH_FILE=str(crash_file))
+    mcp = McpServer("supervisor-late")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    handle = bridge_set.handles[0]
+    assert handle.state == "failed"
+    assert mcp.registry.get_tool("echo_late") is None
+
+    supervisor = BridgeSupervisor(mcp, bridge_set.handles, interval=0)
+    try:
+        crash_file.unlink()
+        await supervisor.check_once()
+        assert handle.state == "ready"
+        assert mcp.registry.get_tool("echo_late") is not None
+    finally:
+        await bridge_set.close()
@@ -0,0 +1,142 @@
+"""Tests for tool/group/namespace concurrency limits with fair queues."""
+
+import asyncio
+
+import mcp.types as types
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.app.bridge_manager import BridgeConfig
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.concurrency import (
+    OVERLOADED_ERROR_CODE,
+    ConcurrencyLimit,
+    ConcurrencyLimits,
+    FairLimiter,
+    limits_from_json,
+)
+
+SCHEMA = {"type": "object", "properties": {"i": {"type": "integer"}}}
+
+
+async def test_waiters_are_served_round_robin_per_agent():
+    limiter = FairLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=10, max_wait=0))
+    order = []
+
+    async def call(party, i):
+        await limiter.acquire(party)
+        order.append(f"{party}{i}")
+        await asyncio.sleep(0)
+        limiter.release()
+
+    await limiter.acquire("x")  # hold the only slot
+    tasks = [asyncio.create_task(call("a", i)) for i in range(3)]
+    tasks.append(asyncio.create_task(call("b", 0)))
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queue_depth"] == 4
+    limiter.release()
+    await asyncio.gather(*tasks)
+    # "b" is not stuck behind every queued call of "a"
+    assert order == ["a0", "b0", "a1", "a2"]
+    assert limiter.stats()["active"] == 0 and limiter.stats()["wait_max"] > 0
+
+
+async def test_full_queue_and_timeout_are_shed():
+    limiter = FairLimiter(ConcurrencyLimit(max_concurrency=1, max_queue=1, max_wait=0.05))
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(Exception, match="queue full"):
+        await limiter.acquire()
+    with pytest.raises(Exception, match="waited"):
+        await waiter
+    stats = limiter.stats()
+    assert (stats["rejected"], stats["timed_out"], stats["queue_depth"]) == (1, 1, 0)
+
+    # a cancelled waiter leaves the queue without leaking a slot
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    limiter.release()
+    assert (limiter.active, limiter.queued) == (0, 0)
+
+
+async def test_server_enforces_tool_limit_and_reports_shed_calls():
+    mcp = McpServer("limits")
+    running, peak = [0], [0]
+
+    async def work(i: int = 0):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.1)
+        running[0] -= 1
+        return str(i)
+
+    mcp.register_tool("work", "", work, SCHEMA,
+                      concurrency=ConcurrencyLimit(max_concurrency=2, max_queue=2))
+
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        results = await asyncio.gather(
+            *(client.call_tool("work", {"i": i}) for i in range(6)),
+            return_exceptions=True,
+        )
+    ok = [r for r in results if not isinstance(r, Exception)]
+    shed = [r for r in results if isinstance(r, McpError)]
+    assert len(ok) == 4 and len(shed) == 2 and peak[0] == 2
+    assert all(e.error.code == OVERLOADED_ERROR_CODE for e in shed)
+    assert "overloaded" in shed[0].error.message
+    assert mcp.concurrency.stats()["tool:work"]["rejected"] == 2
+
+
+async def test_group_and_namespace_limits_span_tools():
+    limits = ConcurrencyLimits(namespaces={"browser": ConcurrencyLimit(1, max_queue=0)})
+    mcp = McpServer("ns")
+    mcp.concurrency = limits
+    gate = asyncio.Event()
+
+    async def slow():
+        await gate.wait()
+        return "done"
+
+    mcp.register_tool("open", "", slow, {"type": "object"}, namespace="browser")
+    mcp.register_tool("click", "", slow, {"type": "object"}, namespace="browser")
+    mcp.register_tool("other", "", slow, {"type": "object"})
+
+    first = asyncio.create_task(_call(mcp, "open"))
+    await asyncio.sleep(0.01)
+    with pytest.raises(McpError, match="namespace 'browser'"):
+        await _call(mcp, "click")
+    unrelated = asyncio.create_task(_call(mcp, "other"))
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(first, unrelated)
+
+    limits.set_limit("group", "g", ConcurrencyLimit(3))
+    assert set(limits.stats()) == {"namespace:browser", "group:g"}
+    with pytest.raises(ValueError):
+        limits.set_limit("agent", "x", ConcurrencyLimit(1))
+
+
+async def _call(mcp, name):
+    handler = mcp.low_level_server.request_handlers[types.CallToolRequest]
+    return await handler(types.CallToolRequest(
+        method="tools/call", params=types.CallToolRequestParams(name=name, arguments={}),
+    ))
+
+
+def test_limit_parsing():
+    assert limits_from_json('{"a": 2, "b": {"max": 1, "queue": 0, "timeout": 5}}') == {
+        "a": ConcurrencyLimit(2),
+        "b": ConcurrencyLimit(1, max_queue=0, max_wait=5.0),
+    }
+    assert limits_from_json("not json") == {}
+
+    cfg = BridgeConfig.from_dict({
+        "name": "b", "command": "x",
+        "concurrency": {"max": 4, "queue": 8},
+        "concurrency_map": {"heavy": 1},
+    })
+    assert cfg.concurrency.max_concurrency == 4 and cfg.concurrency.max_queue == 8
+    assert cfg.concurrency_map["heavy"].max_concurrency == 1
@@ -323,6 +323,21 @@ class TestASGIBuilder:
         route_paths = [r.path for r in routes if hasattr(r, "path")]
         assert "/static" in route_paths
 
+    def test_readiness_route_reports_bridge_state(self):
+        from starlette.applications import Starlette
+        from starlette.testclient import TestClient
+
+        from viyv_mcp.app.asgi_builder import readiness_route
+
+        status = {"ready": False, "bridges": {"fs": {"state": "starting", "tools": 0}}}
+        client = TestClient(Starlette(routes=[readiness_route(lambda: status)]))
+        resp = client.get("/ready")
+        assert resp.status_code == 503
+        assert resp.json()["bridges"]["fs"]["state"] == "starting"
+
+        status["ready"] = True
+        assert client.get("/ready").status_code == 200
+
 
 class TestLifespanComposer:
     def test_compose_lifespan_calls_startup_shutdown(self):
@@ -356,6 +371,31 @@ class TestLifespanComposer:
 
         asyncio.run(_run())
 
+    def test_compose_lifespan_runs_shutdown_hooks_after_bridges(self):
+        from viyv_mcp.app.lifespan_composer import compose_lifespan
+
+        order = []
+
+        async def startup():
+            pass
+
+        async def shutdown():
+            order.append("bridges")
+
+        async def drain_audit():
+            order.append("audit")
+
+        lifespan = compose_lifespan(
+            None, None, startup, shutdown, None, shutdown_hooks=[drain_audit],
+        )
+
+        async def _run():
+            async with lifespan(None):
+                pass
+
+        asyncio.run(_run())
+        assert order == ["bridges", "audit"]
+
 
 # ========================================================================== #
 # 8. bridge_manager 型整合性テスト
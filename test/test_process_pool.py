@@ -0,0 +1,187 @@
+"""Tests for @tool(executor="process") and the shared-memory argument handoff."""
+
+import hashlib
+import os
+
+import pytest
+from mcp.shared.exceptions import McpError
+
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.process_pool import (
+    ToolProcessPool,
+    _SharedArg,
+    _export_arg,
+    _import_arg,
+)
+
+
+# Tool functions must live at module level to be sent to workers by reference
+def cpu_mean(numbers: list[float]) -> float:
+    return sum(numbers) / len(numbers)
+
+
+def digest(blob: bytes) -> dict:
+    return {"pid": os.getpid(), "sha256": hashlib.sha256(blob).hexdigest()}
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def crash() -> None:
+    os._exit(1)
+
+
+def test_export_small_values_are_passed_through():
+    value, shm = _export_arg(b"abc", threshold=1024)
+    assert value == b"abc" and shm is None
+    value, shm = _export_arg([1, "mixed"], threshold=0)
+    assert value == [1, "mixed"] and shm is None
+
+
+@pytest.mark.parametrize("value", [
+    b"x" * 4096,
+    bytearray(b"y" * 4096),
+    [float(i) for i in range(1000)],
+    list(range(1000)),
+])
+def test_shared_memory_round_trip(value):
+    ref, shm = _export_arg(value, threshold=1024)
+    try:
+        assert isinstance(ref, _SharedArg)
+        restored = _import_arg(ref)
+        assert restored == value
+        assert type(restored) is type(value)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@pytest.mark.asyncio
+async def test_process_tool_runs_in_worker_with_shared_memory():
+    pool = ToolProcessPool(1, shm_threshold=1024)
+    try:
+        blob = os.urandom(256 * 1024)
+        result = await pool.run(digest, blob)
+        assert result["pid"] != os.getpid()
+        assert result["sha256"] == hashlib.sha256(blob).hexdigest()
+        assert await pool.run(cpu_mean, [1.0, 2.0, 3.0] * 1000) == 2.0
+        assert pool.stats()["shared_memory_args"] == 2
+    finally:
+        pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_workers_are_recycled():
+    pool = ToolProcessPool(1, max_calls_per_worker=1)
+    try:
+        first = await pool.run(worker_pid)
+        second = await pool.run(worker_pid)
+        assert first != second
+        assert pool.stats()["recycled"] >= 1
+    finally:
+        pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_becomes_mcp_error_and_pool_recovers():
+    pool = ToolProcessPool(1)
+    try:
+        with pytest.raises(McpError, match="worker process crashed"):
+            await pool.run(crash)
+        assert pool.stats()["crashes"] == 1
+        assert await pool.run(worker_pid) != os.getpid()
+    finally:
+        pool.shutdown(wait=True)
+
+
+TOOL_MODULE = """
+import os
+
+from viyv_mcp import resource, tool
+
+
+def register(mcp):
+    @resource("pool://info")
+    def info() -> str:
+        return "info"
+
+    mcp.some_direct_call()
+
+    @tool(description="Worker pid", executor="process")
+    def nested_pid(n: int) -> dict:
+        return {"pid": os.getpid(), "n": n}
+
+    @tool(name="renamed_square", executor="process")
+    def square(x: int) -> int:
+        return x * x
+"""
+
+
+@pytest.mark.asyncio
+async def test_tool_defined_inside_register_runs_in_worker(tmp_path, monkeypatch):
+    import importlib
+    from unittest.mock import MagicMock
+
+    (tmp_path / "pool_tools_mod.py").write_text(TOOL_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("pool_tools_mod")
+
+    mcp = McpServer("test-process-register")
+    mcp.some_direct_call = MagicMock()
+    module.register(mcp)
+    assert mcp.process_pool.in_use
+    try:
+        result = await mcp.registry.get_tool("nested_pid").fn(n=3)
+        assert result["n"] == 3 and result["pid"] != os.getpid()
+        assert await mcp.registry.get_tool("renamed_square").fn(x=7) == 49
+    finally:
+        mcp.process_pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_template_average_tool_runs_in_worker():
+    from viyv_mcp.templates.app.tools import sample_math_tools
+
+    mcp = McpServer("test-process-template")
+    sample_math_tools.register(mcp)
+    assert mcp.process_pool.in_use
+    try:
+        assert await mcp.registry.get_tool("average").fn(numbers=[1.0, 2.0, 4.0]) == 2.33
+        assert mcp.process_pool.stats()["completed"] == 1
+    finally:
+        mcp.process_pool.shutdown(wait=True)
+
+
+def test_decorator_rejects_functions_workers_cannot_resolve():
+    from viyv_mcp import tool
+
+    mcp = McpServer("test-process-reject")
+
+    def register(mcp):
+        @tool(description="Nested", executor="process")
+        def nested(x: int) -> int:
+            return x
+
+    with pytest.raises(TypeError, match="cannot run in a worker process"):
+        register(mcp)
+    assert mcp.registry.get_tool("nested") is None
+    assert not mcp.process_pool.in_use
+
+
+@pytest.mark.asyncio
+async def test_decorator_registers_module_level_function():
+    from viyv_mcp import tool
+
+    mcp = McpServer("test-process-tool")
+
+    def register(mcp):
+        tool(description="Mean", executor="process")(cpu_mean)
+
+    register(mcp)
+    assert mcp.process_pool.in_use
+    try:
+        result = await mcp.registry.get_tool("cpu_mean").fn(numbers=[2.0, 4.0])
+        assert result == 3.0
+    finally:
+        mcp.process_pool.shutdown(wait=True)
@@ -0,0 +1,289 @@
+"""Tests for per-key routing of relay (browser) tool calls."""
+
+import mcp.types as types
+import pytest
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from mcp.shared.memory import create_connected_server_and_client_session
+from starlette.requests import Request
+
+from viyv_mcp.app.relay_mcp_handler import (
+    BROWSER_TOOLS,
+    RELAY_KEY_SCOPE,
+    RelaySessionRouter,
+    split_relay_path,
+)
+from viyv_mcp.app.security.context import reset_agent_identity, set_agent_identity
+from viyv_mcp.app.security.domain.models import AgentIdentity
+from viyv_mcp.server import McpServer
+
+
+class FakeSession:
+    def __init__(self, key):
+        self.key_prefix = key[:8]
+        self.calls = []
+
+    async def call_tool(self, tool_name, arguments=None, progress=None):
+        self.calls.append((tool_name, arguments))
+        return types.CallToolResult(content=[types.TextContent(type="text", text=self.key_prefix)])
+
+
+class _ClientSession:
+    pass
+
+
+def _with_request(scope_extra=None, headers=()):
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": list(headers)}
+    scope.update(scope_extra or {})
+    return request_ctx.set(RequestContext(
+        request_id=1, meta=None, session=_ClientSession(), lifespan_context=None,
+        request=Request(scope),
+    ))
+
+
+async def _call(mcp, name="tabs_context"):
+    handler = mcp.low_level_server.request_handlers[types.CallToolRequest]
+    result = await handler(types.CallToolRequest(
+        method="tools/call", params=types.CallToolRequestParams(name=name, arguments={}),
+    ))
+    return result.root
+
+
+def test_split_relay_path():
+    assert split_relay_path("") == (None, "/")
+    assert split_relay_path("/") == (None, "/")
+    assert split_relay_path("/abc") == ("abc", "/")
+    assert split_relay_path("/abc/") == ("abc", "/")
+
+
+async def test_tools_are_shared_and_calls_routed_by_key():
+    mcp = McpServer("relay")
+    router = RelaySessionRouter(mcp)
+    alice, bob = FakeSession("alice-key"), FakeSession("bob-key")
+    router.attach("alice-key", alice)
+    version = mcp.registry.version
+    router.attach("bob-key", bob)
+    assert mcp.registry.version == version  # tools registered once
+    assert len(mcp.registry.list_tools()) == len(BROWSER_TOOLS) == len(router.tool_names)
+
+    token = _with_request({RELAY_KEY_SCOPE: "bob-key"})
+    try:
+        assert (await _call(mcp)).content[0].text == "bob-key"
+    finally:
+        request_ctx.reset(token)
+    token = _with_request(headers=[(b"x-relay-key", b"alice-key")])
+    try:
+        assert (await _call(mcp)).content[0].text == "alice-ke"
+    finally:
+        request_ctx.reset(token)
+    assert len(alice.calls) == len(bob.calls) == 1
+
+    # one tenant leaving keeps the others' tools
+    router.detach("alice-key", alice)
+    assert len(mcp.registry.list_tools()) == len(BROWSER_TOOLS)
+    token = _with_request({RELAY_KEY_SCOPE: "alice-key"})
+    try:
+        result = await _call(mcp)
+    finally:
+        request_ctx.reset(token)
+    assert result.isError and "No browser extension connected" in result.content[0].text
+
+    router.detach("bob-key", bob)
+    assert mcp.registry.list_tools() == [] and len(router) == 0
+
+
+async def test_jwt_claim_and_single_tenant_fallback():
+    mcp = McpServer("relay")
+    router = RelaySessionRouter(mcp)
+    router.attach("alice-key", FakeSession("alice-key"))
+
+    # no key at all: the only connected extension serves the call
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        assert (await client.call_tool("tabs_context", {})).content[0].text == "alice-ke"
+
+    router.attach("bob-key", FakeSession("bob-key"))
+    result = await _call(mcp)
+    assert result.isError and "Relay key required" in result.content[0].text
+
+    cv = set_agent_identity(AgentIdentity(sub="a", clearance=0, namespace="x", relay_key="bob-key"))
+    try:
+        assert router.current_key() == "bob-key"
+        assert (await _call(mcp)).content[0].text == "bob-key"
+    finally:
+        reset_agent_identity(cv)
+
+
+async def test_authenticated_listing_matches_what_the_shared_service_allows():
+    import logging
+
+    from viyv_mcp.app.security.domain.models import AuthMode
+    from viyv_mcp.app.security.infrastructure.config_loader import SecurityConfig
+    from viyv_mcp.app.security.service import SecurityService
+
+    # as in apply_security: one service, built on the main server's registry
+    main, relay = McpServer("main"), McpServer("relay")
+    service = SecurityService(
+        SecurityConfig(auth_mode=AuthMode.AUTHENTICATED, jwt_secret="x" * 32),
+        main.registry, logging.getLogger("test.audit"),
+    )
+    main.set_security_service(service)
+    relay.set_security_service(service)
+    router = RelaySessionRouter(relay)
+    router.attach("alice-key", FakeSession("alice-key"))
+
+    async def list_names():
+        handler = relay.low_level_server.request_handlers[types.ListToolsRequest]
+        return [t.name for t in (await handler(types.ListToolsRequest(method="tools/list"))).root.tools]
+
+    cv = set_agent_identity(AgentIdentity(sub="a", clearance=1, namespace="hr"))
+    try:
+        assert await list_names() == list(router.tool_names)
+        assert (await _call(relay)).content[0].text == "alice-ke"
+
+        # metadata changes in the service's registry reach the listing too
+        main.register_tool(
+            "tabs_context", "", FakeSession("x").call_tool,
+            {"type": "object", "properties": {}}, namespace="browser",
+        )
+        assert "tabs_context" not in await list_names()
+        result = await _call(relay)
+        assert result.isError and "not found" in result.content[0].text
+    finally:
+        reset_agent_identity(cv)
+
+
+async def test_fallback_can_be_disabled():
+    mcp = McpServer("relay")
+    router = RelaySessionRouter(mcp, fallback=False)
+    router.attach("alice-key", FakeSession("alice-key"))
+    result = await _call(mcp)
+    assert result.isError and "Relay key required" in result.content[0].text
+
+    # a stale disconnect does not remove a newer connection for the key
+    router.detach("alice-key", FakeSession("alice-key"))
+    assert router.session_for("alice-key") is not None
+
+
+async def test_calls_are_forwarded_to_the_worker_holding_the_key(tmp_path):
+    from viyv_mcp.app.relay_ipc import RelayIpc
+
+    worker_a, worker_b = McpServer("a"), McpServer("b")
+    router_a = RelaySessionRouter(worker_a, ipc=RelayIpc(str(tmp_path), name="a"))
+    router_b = RelaySessionRouter(worker_b, ipc=RelayIpc(str(tmp_path), name="b"))
+    await router_a.start()
+    await router_b.start()
+    try:
+        # both workers list the tools before any extension connects
+        assert len(worker_b.registry.list_tools()) == len(BROWSER_TOOLS)
+
+        alice = FakeSession("alice-key")
+        router_a.attach("alice-key", alice)
+        token = _with_request({RELAY_KEY_SCOPE: "alice-key"})
+        try:
+            assert (await _call(worker_b)).content[0].text == "alice-ke"
+        finally:
+            request_ctx.reset(token)
+        assert alice.calls == [("tabs_context", {})]
+
+        # single-tenant fallback also spans workers
+        assert (await _call(worker_b)).content[0].text == "alice-ke"
+
+        router_a.detach("alice-key", alice)
+        result = await _call(worker_b)
+        assert result.isError and "Relay key required" in result.content[0].text
+        assert len(worker_a.registry.list_tools()) == len(BROWSER_TOOLS)
+    finally:
+        await router_a.close()
+        await router_b.close()
+
+
+async def test_forwarding_errors_and_dead_owners(tmp_path):
+    from viyv_mcp.app.relay_ipc import RelayIpc, key_id
+
+    class FailingSession(FakeSession):
+        async def call_tool(self, tool_name, arguments=None, progress=None):
+            raise TimeoutError("Tool call 'navigate' timed out after 300s")
+
+    ipc_a, ipc_b = RelayIpc(str(tmp_path), name="a"), RelayIpc(str(tmp_path), name="b")
+    router_a = RelaySessionRouter(McpServer("a"), ipc=ipc_a)
+    await router_a.start()
+    await ipc_b.start(lambda *a: None)
+    try:
+        router_a.attach("k" * 43, FailingSession("k" * 43))
+        with pytest.raises(Exception, match="timed out after 300s"):
+            await ipc_b.forward(key_id("k" * 43), "navigate", {})
+    finally:
+        await ipc_b.close()
+        await router_a.close()
+
+    # a worker that died without withdrawing its key: stale files are dropped
+    # by the listing, whether the socket is gone or merely refuses connections
+    import socket
+
+    keys = tmp_path / "keys"
+    (keys / key_id("dead")).write_text(str(tmp_path / "gone.sock"))
+    assert await ipc_b.forward(key_id("dead"), "navigate", {}) is None
+    assert not (keys / key_id("dead")).exists()
+
+    crashed = socket.socket(socket.AF_UNIX)
+    crashed.bind(str(tmp_path / "crashed.sock"))  # bound, never listening
+    crashed.close()
+    (keys / key_id("crashed")).write_text(str(tmp_path / "crashed.sock"))
+    (keys / key_id("gone")).write_text(str(tmp_path / "gone.sock"))
+    assert await ipc_b.published_ids() == []
+    assert list(keys.iterdir()) == []
+
+
+async def test_ipc_directory_is_private_and_timeouts_keep_the_key(tmp_path, monkeypatch):
+    import asyncio
+    import stat
+
+    from mcp.shared.exceptions import McpError
+
+    from viyv_mcp.app.relay_ipc import RelayIpc, key_id
+
+    shared = tmp_path / "relay"
+    shared.mkdir(mode=0o755)
+    ipc = RelayIpc(str(shared), name="b", connect_timeout=0.05)
+    await ipc.start(lambda *a: None)
+    try:
+        assert stat.S_IMODE(shared.stat().st_mode) == 0o700
+        assert stat.S_IMODE((shared / "keys").stat().st_mode) == 0o700
+
+        (shared / "keys" / key_id("busy")).write_text(str(shared / "a.sock"))
+
+        async def never_accepts(path):
+            await asyncio.sleep(1)
+
+        monkeypatch.setattr(asyncio, "open_unix_connection", never_accepts)
+        with pytest.raises(McpError, match="did not accept the call"):
+            await ipc.forward(key_id("busy"), "navigate", {})
+        assert await ipc.published_ids() == [key_id("busy")]
+    finally:
+        await ipc.close()
+
+
+async def test_forwarded_frames_are_capped(tmp_path):
+    from mcp.shared.exceptions import McpError
+
+    from viyv_mcp.app.relay_ipc import RelayIpc
+
+    class BigSession(FakeSession):
+        async def call_tool(self, tool_name, arguments=None, progress=None):
+            return types.CallToolResult(content=[types.TextContent(type="text", text="x" * 4096)])
+
+    ipc_a = RelayIpc(str(tmp_path), name="a", max_frame_bytes=1024)
+    ipc_b = RelayIpc(str(tmp_path), name="b", max_frame_bytes=1024)
+    router_a = RelaySessionRouter(McpServer("a"), ipc=ipc_a)
+    await router_a.start()
+    await ipc_b.start(lambda *a: None)
+    try:
+        router_a.attach("big-key", BigSession("big-key"))
+        kid = (await ipc_b.published_ids())[0]
+        with pytest.raises(McpError, match="too large to forward"):
+            await ipc_b.forward(kid, "read_page", {})
+        with pytest.raises(McpError, match="frame limit"):
+            await ipc_b.forward(kid, "navigate", {"url": "x" * 2048})
+    finally:
+        await ipc_b.close()
+        await router_a.close()
@@ -0,0 +1,136 @@
+"""Tests for the background audit sink."""
+
+import json
+import logging
+
+import pytest
+
+from viyv_mcp.app.security.infrastructure.audit_writer import (
+    AuditSink,
+    emit_audit_record,
+)
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_records_are_batched_to_file(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = AuditSink(str(path), batch_size=50, flush_interval=10)
+    for i in range(120):
+        emit_audit_record(sink, {"tool": f"t{i}", "result": "allowed"})
+    sink.close()
+
+    records = _read(path)
+    assert [r["tool"] for r in records] == [f"t{i}" for i in range(120)]
+    assert all(r["type"] == "audit" and "ts" in r for r in records)
+    stats = sink.stats()
+    assert stats["written"] == 120 and stats["queued"] == 0
+    assert stats["batches"] <= 4
+
+
+def test_flush_waits_for_pending_records(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = AuditSink(str(path), flush_interval=10, fsync="batch")
+    try:
+        sink.emit({"tool": "t", "result": "denied"})
+        assert sink.flush()
+        assert len(_read(path)) == 1
+    finally:
+        sink.close()
+
+
+def test_sampling_keeps_every_denial(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = AuditSink(str(path), sample_allowed=0.0)
+    for _ in range(10):
+        sink.emit({"tool": "t", "result": "allowed"})
+        sink.emit({"tool": "t", "result": "denied"})
+    sink.close()
+
+    assert [r["result"] for r in _read(path)] == ["denied"] * 10
+    assert sink.stats()["sampled_out"] == 10
+
+
+def test_size_rotation(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = AuditSink(str(path), batch_size=1, max_bytes=200, backup_count=2)
+    for i in range(20):
+        sink.emit({"tool": f"t{i}", "result": "allowed"})
+    sink.close()
+
+    assert (tmp_path / "audit.jsonl.1").exists()
+    assert (tmp_path / "audit.jsonl.2").exists()
+    assert not (tmp_path / "audit.jsonl.3").exists()
+    assert path.stat().st_size <= 200
+    assert _read(path)[-1]["tool"] == "t19"
+
+
+def test_zero_backups_never_deletes_records(tmp_path, caplog):
+    path = tmp_path / "audit.jsonl"
+    sink = AuditSink(str(path), batch_size=1, max_bytes=200, backup_count=0)
+    for i in range(10):
+        sink.emit({"tool": f"t{i}", "result": "denied"})
+    sink.close()
+
+    assert [r["tool"] for r in _read(path)] == [f"t{i}" for i in range(10)]
+    assert list(tmp_path.iterdir()) == [path]
+
+    with caplog.at_level(logging.WARNING):
+        sink.emit({"tool": "late", "result": "denied"})
+        sink.emit({"tool": "later", "result": "denied"})
+    assert sink.stats()["dropped"] == 2
+    assert sum("after the sink was closed" in r.message for r in caplog.records) == 1
+
+
+def test_logger_target_runs_off_caller_thread():
+    captured = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            captured.append(record)
+
+    audit = logging.getLogger("test.audit.sink")
+    audit.setLevel(logging.INFO)
+    audit.propagate = False
+    audit.addHandler(_Capture())
+    sink = AuditSink(logger=audit)
+    sink.emit({"tool": "t", "result": "allowed"})
+    sink.close()
+
+    assert len(captured) == 1
+    assert captured[0].threadName == "viyv-audit-writer"
+    assert json.loads(captured[0].getMessage())["tool"] == "t"
+
+
+def test_file_sink_still_feeds_logger_handlers(tmp_path):
+    captured = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            captured.append(record.getMessage())
+
+    audit = logging.getLogger("test.audit.file_sink")
+    audit.setLevel(logging.INFO)
+    audit.propagate = False
+    path = tmp_path / "audit.jsonl"
+
+    sink = AuditSink(str(path), logger=audit)  # no handlers yet: file only
+    sink.emit({"tool": "t0", "result": "allowed"})
+    assert sink.flush()
+    handler = _Capture()
+    audit.addHandler(handler)
+    try:
+        sink.emit({"tool": "t1", "result": "denied"})
+        sink.close()
+    finally:
+        audit.removeHandler(handler)
+
+    assert [r["tool"] for r in _read(path)] == ["t0", "t1"]
+    assert [json.loads(m)["tool"] for m in captured] == ["t1"]
+
+
+def test_invalid_fsync_policy():
+    with pytest.raises(ValueError):
+        AuditSink(fsync="sometimes")
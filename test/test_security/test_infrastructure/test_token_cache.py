@@ -0,0 +1,71 @@
+"""Tests for the verified-JWT LRU cache."""
+
+from viyv_mcp.app.security.domain.models import AgentIdentity
+from viyv_mcp.app.security.infrastructure.token_cache import TokenCache
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+AGENT = AgentIdentity(sub="a", clearance=1, namespace="hr")
+
+
+def test_hit_and_miss():
+    cache = TokenCache(4, 60, clock=_Clock())
+    assert cache.get("tok") is None
+    cache.put("tok", AGENT)
+    assert cache.get("tok") is AGENT
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 1
+
+
+def test_entry_never_outlives_exp():
+    clock = _Clock()
+    cache = TokenCache(4, 300, clock=clock)
+    cache.put("tok", AGENT, exp=clock.now + 10)
+    clock.now += 9
+    assert cache.get("tok") is AGENT
+    clock.now += 1
+    assert cache.get("tok") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_max_ttl_caps_long_lived_tokens():
+    clock = _Clock()
+    cache = TokenCache(4, 30, clock=clock)
+    cache.put("tok", AGENT, exp=clock.now + 3600)
+    clock.now += 31
+    assert cache.get("tok") is None
+
+
+def test_expired_or_future_tokens():
+    clock = _Clock()
+    cache = TokenCache(4, 300, clock=clock)
+    cache.put("old", AGENT, exp=clock.now - 1)
+    assert cache.stats()["size"] == 0
+    cache.put("later", AGENT, nbf=clock.now + 5)
+    assert cache.get("later") is None
+    clock.now += 5
+    assert cache.get("later") is AGENT
+
+
+def test_lru_eviction():
+    cache = TokenCache(2, 60, clock=_Clock())
+    cache.put("a", AGENT)
+    cache.put("b", AGENT)
+    cache.get("a")
+    cache.put("c", AGENT)
+    assert cache.get("b") is None
+    assert cache.get("a") is AGENT and cache.get("c") is AGENT
+
+
+def test_disabled():
+    cache = TokenCache(0, 60)
+    cache.put("tok", AGENT)
+    assert cache.get("tok") is None
+    assert not cache.enabled
@@ -2,9 +2,13 @@
 
 import logging
 import logging.handlers
+import time
+
+import pytest
 
 from viyv_mcp.app.security.domain.models import AgentIdentity, AuthMode, AuthResult, ToolSecurityMeta
 from viyv_mcp.app.security.infrastructure.config_loader import SecurityConfig
+from viyv_mcp.app.security.infrastructure.jwt_codec import JWTDecodeError, encode_jwt
 from viyv_mcp.app.security.service import SecurityService
 from viyv_mcp.server.registry import McpRegistry, ToolEntry
 
@@ -140,6 +144,17 @@ def test_authenticate_token_coerces_trust():
     token = encode_jwt(payload, SECRET)
     identity = svc.authenticate_token(token)
     assert identity.trust == ("123", "common")
+    assert identity.relay_key is None
+
+
+def test_authenticate_token_relay_key():
+    svc = _make_service()
+    payload = {
+        "sub": "agent-1", "namespace": "hr", "relay_key": "k" * 43,
+        "iat": int(time.time()), "exp": int(time.time()) + 3600,
+    }
+    identity = svc.authenticate_token(encode_jwt(payload, SECRET))
+    assert identity.relay_key == "k" * 43
 
 
 def test_log_access_allowed():
@@ -193,3 +208,25 @@ def test_filter_tools_skips_nameless_objects():
         [NoName()],
     )
     assert filtered == []
+
+
+def _token(**overrides):
+    payload = {"sub": "agent-1", "namespace": "hr", "exp": int(time.time()) + 3600}
+    payload.update(overrides)
+    return encode_jwt(payload, SECRET)
+
+
+def test_resolve_identity_is_cached():
+    svc = _make_service()
+    token = _token(clearance=1)
+    first = svc.resolve_identity(token)
+    assert svc.resolve_identity(token) is first
+    assert svc.token_cache.stats()["hits"] == 1
+
+
+def test_resolve_identity_does_not_cache_failures():
+    svc = _make_service()
+    token = _token()
+    with pytest.raises(JWTDecodeError):
+        svc.resolve_identity(token + "x")
+    assert svc.token_cache.stats()["size"] == 0
@@ -51,3 +51,33 @@ def test_overwrite():
     reg.register_tool(_make_entry("t", namespace="old"))
     reg.register_tool(_make_entry("t", namespace="new"))
     assert reg.get("t").namespace == "new"
+
+
+def test_namespace_index():
+    reg = McpRegistry()
+    reg.register_tool(_make_entry("a", namespace="hr"))
+    reg.register_tool(_make_entry("b", namespace="finance"))
+    reg.register_tool(_make_entry("c", namespace="common"))
+    assert sorted(reg.tool_names_in_namespaces({"hr", "common"})) == ["a", "c"]
+    assert reg.tool_names_in_namespaces({"unknown"}) == []
+
+
+def test_namespace_index_keeps_registration_order():
+    reg = McpRegistry()
+    for name, ns in [("z", "hr"), ("y", "common"), ("x", "hr"), ("w", "finance")]:
+        reg.register_tool(_make_entry(name, namespace=ns))
+    reg.register_tool(_make_entry("z", namespace="common"))  # overwrite keeps its slot
+    expected = [e.name for e in reg.list_tools() if e.security.namespace != "finance"]
+    assert expected == ["z", "y", "x"]
+    assert reg.tool_names_in_namespaces({"hr", "common"}) == expected
+    assert reg.tool_names_in_namespaces(["common", "hr"]) == expected
+
+
+def test_namespace_index_follows_overwrite_and_unregister():
+    reg = McpRegistry()
+    reg.register_tool(_make_entry("t", namespace="old"))
+    reg.register_tool(_make_entry("t", namespace="new"))
+    assert reg.tool_names_in_namespaces({"old"}) == []
+    assert reg.tool_names_in_namespaces({"new"}) == ["t"]
+    reg.unregister_tool("t")
+    assert reg.tool_names_in_namespaces({"new"}) == []
@@ -0,0 +1,118 @@
+"""Tests for single-flight coalescing of identical concurrent tool calls."""
+
+import asyncio
+
+import mcp.types as types
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.app.bridge_manager import BridgeConfig
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.single_flight import SingleFlight
+
+
+def _slow(calls, result="done", delay=0.1, error=None):
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return result
+    return fn
+
+
+async def test_followers_share_the_leaders_result_and_error():
+    sf, calls = SingleFlight(), []
+    results = await asyncio.gather(*(sf.run("k", _slow(calls)) for _ in range(5)))
+    assert results == ["done"] * 5 and len(calls) == 1
+    assert sf.stats() == {"in_flight": 0, "leaders": 1, "followers": 4}
+
+    calls.clear()
+    outcomes = await asyncio.gather(
+        *(sf.run("k", _slow(calls, error=ValueError("bad"))) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(o, ValueError) for o in outcomes) and len(calls) == 1
+
+    # distinct keys never share a call
+    calls.clear()
+    await asyncio.gather(sf.run("a", _slow(calls)), sf.run("b", _slow(calls)))
+    assert len(calls) == 2
+
+
+async def test_cancelled_leader_does_not_cancel_followers():
+    sf, calls = SingleFlight(), []
+    leader = asyncio.create_task(sf.run("k", _slow(calls, delay=0.2)))
+    await asyncio.sleep(0.01)
+    followers = [asyncio.create_task(sf.run("k", _slow(calls))) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    leader.cancel()  # e.g. the leader's client disconnected
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await asyncio.gather(*followers) == ["done", "done"]
+    assert len(calls) == 1
+
+
+async def test_call_is_cancelled_when_every_caller_leaves():
+    sf, calls = SingleFlight(), []
+    finished = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        finished.append(1)
+        return "late"
+
+    callers = [asyncio.create_task(sf.run("k", fn)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    for c in callers:
+        c.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    assert len(sf) == 0
+
+    # a new caller starts afresh instead of joining the dying call
+    assert await sf.run("k", _slow(calls, result="fresh", delay=0)) == "fresh"
+    await asyncio.sleep(0.25)
+    assert finished == [] and len(calls) == 2
+
+
+async def test_server_coalesces_identical_calls():
+    mcp = McpServer("sf")
+    calls = []
+
+    async def search(q: str):
+        calls.append(q)
+        await asyncio.sleep(0.1)
+        return f"hits for {q}"
+
+    schema = {"type": "object", "properties": {"q": {"type": "string"}}}
+    mcp.register_tool("search", "", search, schema, single_flight=True)
+    mcp.register_tool("plain", "", search, schema)
+
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        results = await asyncio.gather(
+            *(client.call_tool("search", {"q": "x"}) for _ in range(5)),
+            client.call_tool("search", {"q": "y"}),
+        )
+        assert [r.content[0].text for r in results] == ["hits for x"] * 5 + ["hits for y"]
+        assert sorted(calls) == ["x", "y"]
+
+        calls.clear()
+        await asyncio.gather(*(client.call_tool("plain", {"q": "x"}) for _ in range(3)))
+        assert calls == ["x"] * 3
+
+
+def test_bridge_single_flight_config():
+    def tool(name, **hints):
+        return types.Tool(name=name, inputSchema={"type": "object"},
+                          annotations=types.ToolAnnotations(**hints) if hints else None)
+
+    cfg = BridgeConfig.from_dict({"name": "b", "command": "x", "single_flight": True})
+    assert cfg.coalesces(tool("get", readOnlyHint=True))
+    assert cfg.coalesces(tool("put", idempotentHint=True))
+    assert not cfg.coalesces(tool("send"))
+
+    cfg = BridgeConfig.from_dict({"name": "b", "command": "x", "single_flight": ["send"]})
+    assert cfg.coalesces(tool("send")) and not cfg.coalesces(tool("get", readOnlyHint=True))
+    assert not BridgeConfig.from_dict({"name": "b", "command": "x"}).coalesces(tool("get"))
@@ -0,0 +1,107 @@
+"""Tests for running synchronous @tool functions on the worker thread pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from viyv_mcp.app.security.context import (
+    get_agent_identity,
+    reset_agent_identity,
+    set_agent_identity,
+)
+from viyv_mcp.app.security.domain.models import AgentIdentity
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.executor import ToolThreadPool
+
+
+def _register(mcp, **tool_kwargs):
+    from viyv_mcp import tool
+
+    @tool(description="Report the executing thread", **tool_kwargs)
+    def where_am_i() -> dict:
+        agent = get_agent_identity()
+        return {
+            "thread": threading.get_ident(),
+            "agent": agent.sub if agent else None,
+        }
+
+
+@pytest.mark.asyncio
+async def test_sync_tool_runs_on_worker_thread():
+    mcp = McpServer("test-thread-pool", tool_thread_pool_size=2)
+    _register(mcp)
+
+    result = await mcp.registry.get_tool("where_am_i").fn()
+    assert result["thread"] != threading.get_ident()
+    mcp.tool_pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_inline_executor_runs_on_event_loop():
+    mcp = McpServer("test-inline")
+    _register(mcp, executor="inline")
+
+    result = await mcp.registry.get_tool("where_am_i").fn()
+    assert result["thread"] == threading.get_ident()
+    assert mcp.tool_pool.stats()["submitted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_identity_propagates_to_worker():
+    mcp = McpServer("test-ctx")
+    _register(mcp)
+
+    token = set_agent_identity(AgentIdentity(sub="agent-1", clearance=1, namespace="hr"))
+    try:
+        result = await mcp.registry.get_tool("where_am_i").fn()
+    finally:
+        reset_agent_identity(token)
+    assert result["agent"] == "agent-1"
+    mcp.tool_pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_blocking_tool_does_not_stall_event_loop():
+    pool = ToolThreadPool(max_workers=1)
+    release = threading.Event()
+
+    task = asyncio.create_task(pool.run(release.wait, 5))
+    await asyncio.sleep(0.05)
+    # The loop keeps running while the worker blocks
+    assert pool.stats()["active"] == 1
+    release.set()
+    assert await task is True
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_stats_report_queue_depth_and_failures():
+    pool = ToolThreadPool(max_workers=1)
+    release = threading.Event()
+
+    first = asyncio.create_task(pool.run(release.wait, 5))
+    second = asyncio.create_task(pool.run(lambda: 1 / 0))
+    await asyncio.sleep(0.05)
+    stats = pool.stats()
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+    assert stats["utilization"] == 1.0
+
+    release.set()
+    await first
+    with pytest.raises(ZeroDivisionError):
+        await second
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["queued"] == 0
+    pool.shutdown(wait=True)
+
+
+def test_pool_restarts_after_shutdown():
+    pool = ToolThreadPool(max_workers=1)
+    assert asyncio.run(pool.run(lambda: "a")) == "a"
+    pool.shutdown(wait=True)
+    assert asyncio.run(pool.run(lambda: "b")) == "b"
+    pool.shutdown(wait=True)
@@ -0,0 +1,108 @@
+"""Tests for the versioned registry and the memoized tools/list response."""
+
+import pytest
+import mcp.types as types
+
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.registry import McpRegistry, ToolEntry
+
+
+async def _noop(**kw):
+    return None
+
+
+def _entry(name):
+    return ToolEntry(
+        name=name, description="", fn=_noop,
+        input_schema={"type": "object", "properties": {}},
+    )
+
+
+async def _list_tools(mcp: McpServer) -> types.ServerResult:
+    handler = mcp.low_level_server.request_handlers[types.ListToolsRequest]
+    return await handler(types.ListToolsRequest(method="tools/list"))
+
+
+def test_registry_version_bumps_on_changes():
+    reg = McpRegistry()
+    v0 = reg.version
+    reg.register_tool(_entry("a"))
+    assert reg.version == v0 + 1
+    reg.unregister_tool("a")
+    assert reg.version == v0 + 2
+    # Removing an unknown tool is not a change
+    reg.unregister_tool("a")
+    assert reg.version == v0 + 2
+
+
+@pytest.mark.asyncio
+async def test_repeat_list_returns_memoized_result():
+    mcp = McpServer("test-list-cache")
+    mcp.register_tool("t1", "Tool 1", _noop, {"type": "object", "properties": {}})
+
+    first = await _list_tools(mcp)
+    second = await _list_tools(mcp)
+    assert first is second
+    assert [t.name for t in first.root.tools] == ["t1"]
+
+
+@pytest.mark.asyncio
+async def test_registration_invalidates_cached_list():
+    mcp = McpServer("test-list-invalidate")
+    mcp.register_tool("t1", "Tool 1", _noop, {"type": "object", "properties": {}})
+    first = await _list_tools(mcp)
+
+    mcp.register_tool("t2", "Tool 2", _noop, {"type": "object", "properties": {}})
+    second = await _list_tools(mcp)
+    assert first is not second
+    assert {t.name for t in second.root.tools} == {"t1", "t2"}
+
+    mcp.remove_tool("t1")
+    third = await _list_tools(mcp)
+    assert [t.name for t in third.root.tools] == ["t2"]
+
+
+@pytest.mark.asyncio
+async def test_validation_cache_follows_registry():
+    mcp = McpServer("test-validation-cache")
+    mcp.register_tool("t1", "Tool 1", _noop, {"type": "object", "properties": {}})
+    await _list_tools(mcp)
+    assert set(mcp.low_level_server._tool_cache) == {"t1"}
+
+
+def _secured_server(monkeypatch):
+    import logging
+
+    from viyv_mcp.app.security.domain.models import AgentIdentity, AuthMode
+    from viyv_mcp.app.security.infrastructure.config_loader import SecurityConfig
+    from viyv_mcp.app.security.service import SecurityService
+
+    mcp = McpServer("test-visible-cache")
+    config = SecurityConfig(auth_mode=AuthMode.AUTHENTICATED, jwt_secret="x" * 32)
+    mcp.set_security_service(
+        SecurityService(config, mcp.registry, logging.getLogger("test.audit"))
+    )
+    schema = {"type": "object", "properties": {}}
+    mcp.register_tool("hr_tool", "", _noop, schema, namespace="hr")
+    mcp.register_tool("fin_tool", "", _noop, schema, namespace="finance")
+    mcp.register_tool("common_tool", "", _noop, schema)
+
+    agent = AgentIdentity(sub="a", clearance=1, namespace="hr")
+    monkeypatch.setattr(
+        "viyv_mcp.app.security.context.get_agent_identity", lambda: agent
+    )
+    return mcp
+
+
+@pytest.mark.asyncio
+async def test_filtered_list_is_cached_per_namespace_set(monkeypatch):
+    mcp = _secured_server(monkeypatch)
+
+    first = await _list_tools(mcp)
+    assert {t.name for t in first.root.tools} == {"hr_tool", "common_tool"}
+    assert await _list_tools(mcp) is first
+
+    mcp.register_tool("hr_tool2", "", _noop, {"type": "object", "properties": {}}, namespace="hr")
+    refreshed = await _list_tools(mcp)
+    assert refreshed is not first
+    assert {t.name for t in refreshed.root.tools} == {"hr_tool", "hr_tool2", "common_tool"}
@@ -0,0 +1,153 @@
+"""Tests for the TTL/LRU result cache of read-only tools."""
+
+import json
+import sys
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.app.bridge_manager import BridgeConfig, BridgeSet
+from viyv_mcp.app.security.domain.models import AgentIdentity
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.result_cache import (
+    CachePolicy,
+    ToolResultCache,
+    argument_key,
+    scope_key,
+)
+
+SCHEMA = {"type": "object", "properties": {"q": {"type": "string"}, "n": {"type": "integer"}}}
+
+
+def _counting_server(**register):
+    mcp = McpServer("cache")
+    calls = []
+
+    async def lookup(q: str = "", n: int = 0):
+        calls.append((q, n))
+        if q == "boom" and len(calls) == 1:
+            raise RuntimeError("transient")
+        return f"{q}:{n}:{len(calls)}"
+
+    mcp.register_tool("lookup", "", lookup, SCHEMA, **register)
+    return mcp, calls
+
+
+async def test_identical_calls_are_answered_from_cache():
+    mcp, calls = _counting_server(cache=CachePolicy(ttl=60))
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        first = await client.call_tool("lookup", {"q": "a", "n": 1})
+        again = await client.call_tool("lookup", {"n": 1, "q": "a"})  # key order ignored
+        other = await client.call_tool("lookup", {"q": "b", "n": 1})
+    assert first.content[0].text == again.content[0].text == "a:1:1"
+    assert other.content[0].text == "b:1:2"
+    assert len(calls) == 2
+    stats = mcp.result_cache.stats()["lookup"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+async def test_errors_and_destructive_tools_are_not_cached():
+    mcp, calls = _counting_server(cache=CachePolicy(ttl=60))
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        failed = await client.call_tool("lookup", {"q": "boom"})
+        assert failed.isError
+        ok = await client.call_tool("lookup", {"q": "boom"})
+        assert not ok.isError and len(calls) == 2
+
+    mcp, calls = _counting_server(cache=CachePolicy(ttl=60), destructive=True)
+    assert mcp.registry.get_tool("lookup").cache is None
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        await client.call_tool("lookup", {"q": "a"})
+        await client.call_tool("lookup", {"q": "a"})
+    assert len(calls) == 2
+
+
+def test_ttl_lru_and_reregistration():
+    now = [0.0]
+    cache = ToolResultCache(clock=lambda: now[0])
+
+    class Entry:
+        name = "t"
+        cache = CachePolicy(ttl=10, size=2)
+
+    entry = Entry()
+    keys = [argument_key({"i": i}) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(entry, key, i)
+    assert cache.get(entry, keys[0]) is None  # evicted (size 2)
+    assert cache.get(entry, keys[2]) == 2
+
+    now[0] = 10.0
+    assert cache.get(entry, keys[2]) is None  # expired
+
+    cache.put(entry, keys[1], "old")
+    replaced = Entry()
+    assert cache.get(replaced, keys[1]) is None  # new registration, fresh cache
+    assert cache.stats()["t"]["misses"] == 3
+
+
+def test_scopes_partition_by_agent():
+    alice = AgentIdentity(sub="alice", clearance=None, namespace="team-a")
+    bob = AgentIdentity(sub="bob", clearance=None, namespace="team-a")
+    by_agent = CachePolicy(ttl=1, scope="agent")
+    by_ns = CachePolicy(ttl=1, scope="namespace")
+    assert scope_key(by_agent, alice) != scope_key(by_agent, bob)
+    assert scope_key(by_ns, alice) == scope_key(by_ns, bob)
+    assert scope_key(CachePolicy(ttl=1), alice) == scope_key(by_agent, None) == ""
+    assert argument_key({"a": 1}, "x") != argument_key({"a": 1}, "y")
+    with pytest.raises(ValueError, match="Unknown cache scope"):
+        CachePolicy(ttl=1, scope="tenant")
+
+
+UPSTREAM = '''
+from viyv_mcp.server import McpServer
+
+server = McpServer("upstream")
+calls = []
+
+async def get(key: str) -> str:
+    calls.append(key)
+    return key.upper()
+
+async def put(key: str) -> str:
+    calls.append(key)
+    return "ok"
+
+schema = {"type": "object", "properties": {"key": {"type": "string"}}}
+server.register_tool("get", "", get, schema, read_only=True)
+server.register_tool("put", "", put, schema, destructive=True)
+'''
+
+
+async def test_bridge_caches_read_only_tools(tmp_path, monkeypatch):
+    pkg = tmp_path / "pkgs"
+    pkg.mkdir()
+    (pkg / "cache_upstream.py").write_text(UPSTREAM)
+    monkeypatch.syspath_prepend(str(pkg))
+    (tmp_path / "up.json").write_text(json.dumps({
+        "name": "up", "module": "cache_upstream:server", "cache": {"ttl": 60, "size": 8},
+    }))
+
+    mcp = McpServer("host")
+    bridge_set = BridgeSet.from_config(str(tmp_path))
+    await bridge_set.start(mcp)
+    try:
+        assert mcp.registry.get_tool("get").to_mcp_tool().annotations.readOnlyHint
+        assert mcp.registry.get_tool("put").cache is None
+        async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+            for _ in range(3):
+                assert (await client.call_tool("get", {"key": "x"})).content[0].text == "X"
+                await client.call_tool("put", {"key": "x"})
+        assert sys.modules["cache_upstream"].calls == ["x", "x", "x", "x"]
+    finally:
+        await bridge_set.close()
+
+
+def test_bridge_cache_config():
+    cfg = BridgeConfig.from_dict({
+        "name": "c", "command": "x",
+        "cache": {"ttl": 5, "scope": "agent", "tools": ["search"]},
+    })
+    assert cfg.cache == CachePolicy(ttl=5, size=128, scope="agent")
+    assert cfg.cache_tools == {"search"}
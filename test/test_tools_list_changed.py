@@ -0,0 +1,95 @@
+"""Tests for coalesced notifications/tools/list_changed and background bridge attach."""
+
+import asyncio
+
+import pytest
+import mcp.types as types
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.server import McpServer
+
+
+async def _noop(**kw):
+    return None
+
+
+SCHEMA = {"type": "object", "properties": {}}
+
+
+def test_initialization_advertises_list_changed():
+    mcp = McpServer("test-caps")
+    options = mcp.low_level_server.create_initialization_options()
+    assert options.capabilities.tools.listChanged is True
+
+
+@pytest.mark.asyncio
+async def test_burst_of_changes_sends_one_notification():
+    mcp = McpServer("test-coalesce")
+    mcp.tools_changed_delay = 0.05
+    received = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification):
+            received.append(message.root)
+
+    async with create_connected_server_and_client_session(
+        mcp.low_level_server, message_handler=on_message,
+    ) as client:
+        await client.list_tools()
+        for i in range(5):
+            mcp.register_tool(f"t{i}", "", _noop, SCHEMA)
+            mcp.notify_tools_changed()
+        await asyncio.sleep(0.3)
+
+        assert len(received) == 1
+        assert isinstance(received[0], types.ToolListChangedNotification)
+        assert len((await client.list_tools()).tools) == 5
+
+        # A later change produces a fresh notification
+        mcp.notify_tools_changed()
+        await asyncio.sleep(0.2)
+        assert len(received) == 2
+
+
+@pytest.mark.asyncio
+async def test_notify_without_sessions_is_harmless():
+    mcp = McpServer("test-no-sessions")
+    mcp.tools_changed_delay = 0
+    mcp.notify_tools_changed()
+    await asyncio.sleep(0.01)
+    mcp.notify_tools_changed()  # does not raise outside a request either
+
+
+def test_notify_outside_event_loop_is_noop():
+    McpServer("test-no-loop").notify_tools_changed()
+
+
+@pytest.mark.asyncio
+async def test_list_changed_kinds_are_coalesced_per_kind():
+    mcp = McpServer("test-kinds")
+    mcp.tools_changed_delay = 0.05
+    received = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification):
+            received.append(type(message.root))
+
+    async with create_connected_server_and_client_session(
+        mcp.low_level_server, message_handler=on_message,
+    ) as client:
+        await client.list_tools()
+        mcp.notify_list_changed("resources")
+        mcp.notify_tools_changed()
+        mcp.notify_list_changed("resources", "prompts")
+        await asyncio.sleep(0.3)
+
+    assert sorted(t.__name__ for t in received) == [
+        "PromptListChangedNotification",
+        "ResourceListChangedNotification",
+        "ToolListChangedNotification",
+    ]
+
+
+def test_notify_unknown_kind_raises():
+    with pytest.raises(ValueError):
+        McpServer("test-bad-kind").notify_list_changed("widgets")
@@ -0,0 +1,94 @@
+"""Tests for RFC 6570 URI-template matching and templated resource reads."""
+
+import pytest
+import mcp.types as types
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from viyv_mcp.server import McpServer
+from viyv_mcp.server.registry import McpRegistry, ResourceEntry
+from viyv_mcp.server.uri_template import TemplateIndex, UriTemplate, is_template
+
+
+def test_match_decodes_and_respects_segments():
+    t = UriTemplate("echo://{message}")
+    assert t.match("echo://hi%20there") == {"message": "hi there"}
+    assert t.match("echo://a/b") is None
+    assert t.match("echo://") is None
+
+    path = UriTemplate("file:///{+path}")
+    assert path.match("file:///a/b/c.txt") == {"path": "a/b/c.txt"}
+
+    multi = UriTemplate("db://{table}/rows/{id}.json")
+    assert multi.match("db://users/rows/42.json") == {"table": "users", "id": "42"}
+    assert multi.expand({"table": "a b", "id": 1}) == "db://a%20b/rows/1.json"
+    assert path.expand({"path": "a/b c"}) == "file:///a/b%20c"
+
+
+@pytest.mark.parametrize("bad", ["x://{?q}", "x://{a}{b}", "x://{a", "x://a}"])
+def test_unsupported_templates_are_rejected(bad):
+    with pytest.raises(ValueError):
+        UriTemplate(bad)
+
+
+def test_index_prefers_literals_and_prunes_on_remove():
+    index = TemplateIndex()
+    index.add("users://{id}/profile", "by-id")
+    index.add("users://me/profile", "me")
+    index.add("users://{id}/{+rest}", "rest")
+
+    assert index.resolve("users://me/profile") == ("me", {})
+    assert index.resolve("users://7/profile") == ("by-id", {"id": "7"})
+    assert index.resolve("users://7/a/b") == ("rest", {"id": "7", "rest": "a/b"})
+    assert index.resolve("groups://7/profile") is None
+
+    assert index.remove("users://{id}/profile")
+    assert not index.remove("users://{id}/profile")
+    assert index.resolve("users://7/profile") == ("rest", {"id": "7", "rest": "profile"})
+    index.remove("users://{id}/{+rest}")
+    index.remove("users://me/profile")
+    assert len(index) == 0 and index._root.empty()
+    assert not is_template("users://me/profile")
+
+
+def test_registry_resolves_exact_before_templates():
+    registry = McpRegistry()
+    registry.register_resource(ResourceEntry("echo://{message}", "echo", "", lambda message: message))
+    registry.register_resource(ResourceEntry("echo://fixed", "fixed", "", lambda uri: "fixed"))
+
+    entry, variables = registry.resolve_resource("echo://hello")
+    assert entry.name == "echo" and variables == {"message": "hello"}
+    entry, variables = registry.resolve_resource("echo://fixed")
+    assert entry.name == "fixed" and variables == {}
+
+    registry.unregister_resource("echo://{message}")
+    assert registry.resolve_resource("echo://hello") is None
+
+
+@pytest.mark.asyncio
+async def test_templated_resource_read_end_to_end():
+    mcp = McpServer("test-templates")
+
+    def echo_resource(message: str) -> str:
+        return f"Echo: {message}"
+
+    mcp.registry.register_resource(ResourceEntry(
+        "echo://{message}", "echo", "Echo resource", echo_resource, "text/plain",
+    ))
+    mcp.registry.register_resource(ResourceEntry(
+        "info://version", "version", "", lambda uri: "1.0",
+    ))
+
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        listed = await client.list_resources()
+        assert [str(r.uri) for r in listed.resources] == ["info://version"]
+        templates = await client.list_resource_templates()
+        assert [t.uriTemplate for t in templates.resourceTemplates] == ["echo://{message}"]
+
+        result = await client.read_resource(AnyUrl("echo://hi%20there"))
+        assert result.contents[0].text == "Echo: hi there"
+        result = await client.read_resource(AnyUrl("info://version"))
+        assert result.contents[0].text == "1.0"
+
+        with pytest.raises(Exception, match="not found"):
+            await client.read_resource(AnyUrl("other://x"))
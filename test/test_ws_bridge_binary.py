@@ -0,0 +1,148 @@
+"""Tests for the binary (protocol 2) WebSocket bridge framing."""
+
+import asyncio
+import base64
+import json
+import os
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ImageContent
+from starlette.testclient import TestClient
+
+from viyv_mcp.app.relay_key_manager import RelayKeyManager
+from viyv_mcp.app.ws_bridge import WebSocketBridgeHub, create_ws_bridge_app
+from viyv_mcp.app.ws_bridge_protocol import (
+    PROTOCOL_BINARY,
+    PROTOCOL_JSON,
+    ToolResultMessage,
+    decode_frame,
+    encode_frame,
+    negotiate_protocol,
+)
+from viyv_mcp.app.ws_bridge_session import WebSocketBridgeSession
+
+PNG = b"\x89PNG\r\n\x1a\n" + os.urandom(4096)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def test_frame_round_trip_keeps_attachments_raw():
+    frame = encode_frame(
+        {"type": "tool_result", "id": "c1", "success": True,
+         "result": {"content": [{"type": "image", "data": {"$bin": 0}},
+                                {"type": "text", "text": {"$bin": 1}}]}},
+        [PNG, "héllo".encode()],
+    )
+    data = decode_frame(frame)
+    image, text = data["result"]["content"]
+    assert isinstance(image["data"], memoryview) and image["data"] == PNG
+    assert bytes(text["text"]).decode() == "héllo"
+    assert "att" not in data
+
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_frame(frame[:-1])
+    with pytest.raises(ValueError):
+        decode_frame(encode_frame({"type": "ping"})[:3])
+
+
+@pytest.mark.parametrize("envelope, match", [
+    ({"data": {"$bin": 3}, "att": [1]}, "attachment reference"),
+    ({"data": {"$bin": 0}}, "attachment reference"),
+    ({"data": {"$bin": "0"}, "att": [1]}, "attachment reference"),
+    ({"data": {"$bin": True}, "att": [1]}, "attachment reference"),
+    ({"data": {"$bin": -1}, "att": [1]}, "attachment reference"),
+    ({"att": 5}, "'att'"),
+    ({"att": [-3]}, "'att'"),
+    ({"att": ["1"]}, "'att'"),
+    ({"att": [1.5]}, "'att'"),
+])
+def test_malformed_attachment_table_is_a_value_error(envelope, match):
+    header = json.dumps(envelope).encode()
+    frame = len(header).to_bytes(4, "big") + header + b"x"
+    with pytest.raises(ValueError, match=match):
+        decode_frame(frame)
+
+
+def test_protocol_negotiation_and_envelope_checks():
+    assert negotiate_protocol(None) == PROTOCOL_JSON
+    assert negotiate_protocol("x") == PROTOCOL_JSON
+    assert negotiate_protocol(2) == PROTOCOL_BINARY
+    assert negotiate_protocol(99) == PROTOCOL_BINARY
+
+    msg = ToolResultMessage.from_envelope({"id": "a", "success": True, "result": {"x": 1}})
+    assert msg.result == {"x": 1} and msg.agentId == "cloud"
+    for bad in ({"success": True}, {"id": "a", "success": "yes"},
+                {"id": "a", "success": True, "result": [1]}):
+        with pytest.raises(ValueError):
+            ToolResultMessage.from_envelope(bad)
+
+
+async def test_binary_session_encodes_attachments_once():
+    ws = FakeWebSocket()
+    session = WebSocketBridgeSession(ws, "testkey12345", protocol=PROTOCOL_BINARY)
+    task = asyncio.create_task(session.call_tool("screenshot", {"tabId": 1}))
+    await asyncio.sleep(0)
+    call = decode_frame(ws.sent[0])
+    assert (call["type"], call["tool"], call["input"]) == ("tool_call", "screenshot", {"tabId": 1})
+
+    session.handle_message(decode_frame(encode_frame(
+        {"type": "tool_result", "id": call["id"], "success": True,
+         "result": {"data": {"$bin": 0}, "format": "png"}},
+        [PNG],
+    )))
+    result = await task
+    image = result.content[0]
+    assert isinstance(image, ImageContent) and image.mimeType == "image/png"
+    assert base64.b64decode(image.data) == PNG
+
+    # raw attachments elsewhere in a result are rendered as base64 in JSON
+    task = asyncio.create_task(session.call_tool("read_page"))
+    await asyncio.sleep(0)
+    call_id = decode_frame(ws.sent[1])["id"]
+    session.handle_message(decode_frame(encode_frame(
+        {"type": "tool_result", "id": call_id, "success": True,
+         "result": {"blob": {"$bin": 0}}},
+        [b"abc"],
+    )))
+    assert json.loads((await task).content[0].text) == {"blob": "YWJj"}
+
+
+async def test_malformed_result_fails_only_its_call():
+    ws = FakeWebSocket()
+    session = WebSocketBridgeSession(ws, "testkey12345")
+    task = asyncio.create_task(session.call_tool("navigate", {"url": "x"}))
+    await asyncio.sleep(0)
+    session.handle_message({"type": "tool_result", "id": ws.sent[0]["id"], "success": "no"})
+    with pytest.raises(McpError, match="Malformed tool_result"):
+        await task
+
+
+def test_hub_negotiates_protocol(tmp_path):
+    keys = RelayKeyManager(storage_path=str(tmp_path / "keys.json"))
+    new_key, old_key = keys.create_key(), keys.create_key()
+    connected = {}
+    hub = WebSocketBridgeHub(keys, on_connect=lambda k, s: connected.setdefault(k, s))
+    client = TestClient(create_ws_bridge_app(hub))
+
+    with client.websocket_connect("/") as ws:
+        ws.send_json({"type": "auth", "key": new_key, "protocol": 2})
+        assert ws.receive_json() == {"type": "auth_result", "success": True,
+                                     "error": None, "protocol": 2}
+        ws.send_bytes(b"\x00\x00\x00\x10{")  # garbage is ignored
+        ws.send_bytes(encode_frame({"type": "ping"}))
+        assert ws.receive_json() == {"type": "pong"}
+
+    with client.websocket_connect("/") as ws:
+        ws.send_json({"type": "auth", "key": old_key})
+        assert ws.receive_json()["protocol"] == 1
+    assert connected[new_key].protocol == 2 and connected[old_key].protocol == 1
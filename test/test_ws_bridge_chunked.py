@@ -0,0 +1,158 @@
+"""Tests for chunked tool_result streaming over the WebSocket bridge."""
+
+import asyncio
+import base64
+import json
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.app.relay_mcp_handler import RelaySessionRouter
+from viyv_mcp.app.ws_bridge_protocol import PROTOCOL_BINARY, decode_frame, encode_frame
+from viyv_mcp.app.ws_bridge_session import ResultBudget, WebSocketBridgeSession
+from viyv_mcp.server import McpServer
+
+
+class FakeWebSocket:
+    """Replies to each tool_call with the messages produced by *reply(call_id)*."""
+
+    def __init__(self, session_ref, reply):
+        self.session_ref = session_ref
+        self.reply = reply
+
+    async def send_json(self, msg):
+        self._schedule(msg["id"])
+
+    async def send_bytes(self, frame):
+        self._schedule(decode_frame(frame)["id"])
+
+    def _schedule(self, call_id):
+        async def feed():
+            for message in self.reply(call_id):
+                await asyncio.sleep(0)
+                self.session_ref[0].handle_message(message)
+        asyncio.get_running_loop().create_task(feed())
+
+
+def _session(reply, **kwargs):
+    ref = []
+    session = WebSocketBridgeSession(FakeWebSocket(ref, reply), "testkey12345", **kwargs)
+    ref.append(session)
+    return session
+
+
+def _chunks(call_id, text, size=10, total=True):
+    pieces = [text[i:i + size] for i in range(0, len(text), size)]
+    for seq, piece in enumerate(pieces):
+        chunk = {"type": "tool_result_chunk", "id": call_id, "seq": seq, "data": piece}
+        if total:
+            chunk["total"] = len(text)
+        yield chunk
+
+
+async def test_json_chunks_are_reassembled_with_progress():
+    page = {"nodes": [{"ref": f"e{i}", "name": f"Item {i}"} for i in range(20)]}
+    text = json.dumps(page)
+    budget = ResultBudget(1 << 20)
+
+    def reply(call_id):
+        yield from _chunks(call_id, text)
+        yield {"type": "tool_result", "id": call_id, "success": True, "chunked": True}
+
+    session = _session(reply, budget=budget)
+    progress = []
+
+    async def on_progress(received, total):
+        progress.append((received, total))
+
+    result = await session.call_tool("read_page", {"tabId": 1}, progress=on_progress)
+    assert json.loads(result.content[0].text) == page
+    assert progress and progress[-1][1] == len(text)
+    assert all(a[0] < b[0] for a, b in zip(progress, progress[1:]))
+    assert session.buffered_bytes == 0 and budget.buffered == 0 and budget.peak == len(text)
+
+
+async def test_binary_chunks_fill_the_placeholder():
+    image = bytes(range(256)) * 40
+
+    def reply(call_id):
+        for seq in range(4):
+            yield decode_frame(encode_frame(
+                {"type": "tool_result_chunk", "id": call_id, "seq": seq, "data": {"$bin": 0}},
+                [image[seq * 2560:(seq + 1) * 2560]],
+            ))
+        yield {"type": "tool_result", "id": call_id, "success": True, "chunked": True,
+               "result": {"data": {"$chunks": True}, "format": "png"}}
+
+    session = _session(reply, protocol=PROTOCOL_BINARY)
+    result = await session.call_tool("screenshot", {"tabId": 1})
+    assert base64.b64decode(result.content[0].data) == image
+
+
+async def test_text_chunks_fill_the_placeholder_as_is():
+    image = bytes(range(256)) * 40
+    encoded = base64.b64encode(image).decode("ascii")
+
+    def reply(call_id):
+        yield from _chunks(call_id, encoded, size=4096)
+        yield {"type": "tool_result", "id": call_id, "success": True, "chunked": True,
+               "result": {"data": {"$chunks": True}, "format": "png"}}
+
+    session = _session(reply)
+    result = await session.call_tool("screenshot", {"tabId": 1})
+    assert result.content[0].data == encoded
+
+
+async def test_limits_fail_the_call_and_drop_the_rest_of_the_stream():
+    text = json.dumps({"requests": "x" * 90})  # 105 bytes
+
+    def reply(call_id):
+        yield from _chunks(call_id, text)
+        yield {"type": "tool_result", "id": call_id, "success": True, "chunked": True}
+
+    session = _session(reply, max_buffer_bytes=50)
+    with pytest.raises(McpError, match="at most 50 bytes of results per connection"):
+        await session.call_tool("read_network_requests")
+    await asyncio.sleep(0.05)  # remaining chunks arrive and are ignored
+    assert session.buffered_bytes == 0 and not session._pending
+
+    budget = ResultBudget(150)
+    first, second = _session(reply, budget=budget), _session(reply, budget=budget)
+    outcomes = await asyncio.gather(
+        first.call_tool("read_page"), second.call_tool("read_page"), return_exceptions=True,
+    )
+    errors = [o for o in outcomes if isinstance(o, McpError)]
+    assert len(errors) == 1 and "server-wide relay buffer (150 bytes)" in errors[0].error.message
+    assert budget.buffered == 0
+
+
+async def test_out_of_order_chunk_is_rejected():
+    def reply(call_id):
+        yield {"type": "tool_result_chunk", "id": call_id, "seq": 1, "data": "{}"}
+
+    session = _session(reply)
+    with pytest.raises(McpError, match="expected seq 0"):
+        await session.call_tool("read_page")
+
+
+async def test_progress_notifications_reach_the_mcp_client():
+    text = json.dumps({"html": "<p>" * 200})
+
+    def reply(call_id):
+        yield from _chunks(call_id, text, size=100)
+        yield {"type": "tool_result", "id": call_id, "success": True, "chunked": True}
+
+    mcp = McpServer("relay")
+    router = RelaySessionRouter(mcp)
+    router.attach("testkey12345", _session(reply))
+    progress = []
+
+    async def on_progress(received, total, message):
+        progress.append((received, total))
+
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        result = await client.call_tool("get_page_text", {"tabId": 1},
+                                        progress_callback=on_progress)
+    assert json.loads(result.content[0].text) == json.loads(text)
+    assert progress and progress[0][1] == len(text)
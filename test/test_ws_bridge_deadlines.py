@@ -0,0 +1,128 @@
+"""Tests for relay call deadlines (timing wheel) and tool_cancel."""
+
+import asyncio
+
+import mcp.types as types
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from viyv_mcp.app.relay_ipc import RelayIpc
+from viyv_mcp.app.relay_mcp_handler import RelaySessionRouter
+from viyv_mcp.app.ws_bridge_session import (
+    DeadlineWheel,
+    WebSocketBridgeSession,
+    timeouts_from_json,
+)
+from viyv_mcp.server import McpServer
+
+
+class SilentWebSocket:
+    """Records what the session sends; the extension never answers."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, msg):
+        self.sent.append(msg)
+
+    def of_type(self, kind):
+        return [m for m in self.sent if m["type"] == kind]
+
+
+def _session(**kwargs):
+    ws = SilentWebSocket()
+    kwargs.setdefault("deadline_tick", 0.01)
+    return WebSocketBridgeSession(ws, "testkey12345", **kwargs), ws
+
+
+async def test_wheel_fires_after_the_deadline_and_stops_when_idle():
+    loop = asyncio.get_running_loop()
+    fired = {}
+    wheel = DeadlineWheel(lambda cid: fired.setdefault(cid, loop.time()), tick=0.01, slots=4)
+    start = loop.time()
+    wheel.add("short", 0.03)
+    wheel.add("long", 0.1)  # wraps the 4-slot wheel twice
+    wheel.add("gone", 0.02)
+    wheel.cancel("gone")
+    await asyncio.sleep(0.3)
+
+    # never early; late by about one tick (plus scheduling slack)
+    assert set(fired) == {"short", "long"}
+    assert 0.03 <= fired["short"] - start < 0.1
+    assert 0.1 <= fired["long"] - start < 0.2
+    assert len(wheel) == 0 and wheel._timer is None
+
+
+async def test_deadline_fails_the_call_and_cancels_it_in_the_browser():
+    session, ws = _session(timeouts={"navigate": 0.05})
+    with pytest.raises(TimeoutError, match="'navigate' timed out after 0.05s"):
+        await session.call_tool("navigate", {"url": "https://example.com", "tabId": 1})
+    call = ws.of_type("tool_call")[0]
+    assert call["timeoutMs"] == 50
+    await asyncio.sleep(0)
+    assert ws.of_type("tool_cancel") == [
+        {"type": "tool_cancel", "id": call["id"], "reason": "deadline"},
+    ]
+    # a late result is dropped quietly
+    assert session.handle_message({"type": "tool_result", "id": call["id"], "success": True})
+
+
+async def test_cancelled_caller_sends_tool_cancel():
+    session, ws = _session(default_timeout=0)
+    task = asyncio.create_task(session.call_tool("read_page", {"tabId": 1}))
+    await asyncio.sleep(0.01)
+    assert ws.of_type("tool_call")[0]["timeoutMs"] is None
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+    assert [m["reason"] for m in ws.of_type("tool_cancel")] == ["cancelled"]
+    assert not session._pending and len(session._deadlines) == 0
+
+
+async def test_mcp_cancel_notification_reaches_the_extension():
+    session, ws = _session()
+    mcp = McpServer("relay")
+    RelaySessionRouter(mcp).attach("testkey12345", session)
+
+    async with create_connected_server_and_client_session(mcp.low_level_server) as client:
+        call = asyncio.create_task(client.call_tool("read_page", {"tabId": 1}))
+        await asyncio.sleep(0.05)
+        assert ws.of_type("tool_call")
+        # initialize was request 0, so the tool call is request 1
+        await client.send_notification(types.ClientNotification(types.CancelledNotification(
+            params=types.CancelledNotificationParams(requestId=1, reason="user abort"),
+        )))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+    assert [m["reason"] for m in ws.of_type("tool_cancel")] == ["cancelled"]
+
+
+async def test_forwarded_call_is_cancelled_on_the_owner(tmp_path):
+    session, ws = _session()
+    owner, other = McpServer("owner"), McpServer("other")
+    router_owner = RelaySessionRouter(owner, ipc=RelayIpc(str(tmp_path), name="owner"))
+    router_other = RelaySessionRouter(other, ipc=RelayIpc(str(tmp_path), name="other"))
+    await router_owner.start()
+    await router_other.start()
+    try:
+        router_owner.attach("testkey12345", session)
+        call = asyncio.create_task(router_other.call_tool("read_page", {"tabId": 1}))
+        await asyncio.sleep(0.05)
+        assert ws.of_type("tool_call")
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        await asyncio.sleep(0.05)
+        assert [m["reason"] for m in ws.of_type("tool_cancel")] == ["cancelled"]
+    finally:
+        await router_owner.close()
+        await router_other.close()
+
+
+def test_timeouts_from_json():
+    assert timeouts_from_json('{"navigate": 60, "screenshot": "30"}') == {
+        "navigate": 60.0, "screenshot": 30.0,
+    }
+    assert timeouts_from_json("[1]") == {}
+    assert timeouts_from_json("") == {}
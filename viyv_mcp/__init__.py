@@ -5,4 +5,5 @@ __version__ = "2.0.1"
 
 # ここで core.py のクラスを読み込み
 from .core import ViyvMCP
-from .decorators import tool, resource, prompt, entry
\ No newline at end of file
+from .decorators import tool, resource, prompt, entry
+from .server.blob import FileResource
\ No newline at end of file
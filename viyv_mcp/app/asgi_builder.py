@@ -12,14 +12,19 @@ import pathlib
 from typing import Any, Callable, NamedTuple
 
 from viyv_mcp.server import McpServer
-from starlette.routing import Mount
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
 from starlette.types import ASGIApp
 from fastapi.staticfiles import StaticFiles
 
 from viyv_mcp.app.config import Config
 from viyv_mcp.app.entry_registry import list_entries
 from viyv_mcp.app.ws_bridge import WebSocketBridgeHub, create_ws_bridge_app
+from viyv_mcp.app.ws_bridge_session import timeouts_from_json
 from viyv_mcp.app.relay_key_manager import RelayKeyManager, create_key_api
+from viyv_mcp.app.relay_ipc import RelayIpc
+from viyv_mcp.app.relay_mcp_handler import RelaySessionRouter
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,7 @@ class WSBridgeComponents(NamedTuple):
     ws_bridge_hub: WebSocketBridgeHub | None
     ws_routes: list
     key_manager: RelayKeyManager | None
+    relay_router: RelaySessionRouter | None = None
 
 
 # --------------------------------------------------------------------------- #
@@ -67,11 +73,23 @@ def setup_ws_bridge(
 
     relay_mcp = McpServer(f"{server_name} (Relay)")
     relay_mcp_app = relay_mcp.http_app(path="/", stateless_http=stateless_http)
+    # ブラウザツールは 1 度だけ登録し、呼び出しごとにリレーキーでセッションを引く
+    # RELAY_IPC_DIR があれば、他ワーカーが持つキーへの呼び出しを転送する
+    relay_router = RelaySessionRouter(
+        relay_mcp, tags={'browser', 'relay'}, fallback=Config.RELAY_KEY_FALLBACK,
+        ipc=RelayIpc(
+            Config.RELAY_IPC_DIR, max_frame_bytes=Config.RELAY_RESULT_SESSION_MAX_BYTES,
+        ) if Config.RELAY_IPC_DIR else None,
+    )
 
     hub = WebSocketBridgeHub(
         key_manager,
         on_connect=on_connect,
         on_disconnect=on_disconnect,
+        session_buffer_bytes=Config.RELAY_RESULT_SESSION_MAX_BYTES,
+        total_buffer_bytes=Config.RELAY_RESULT_TOTAL_MAX_BYTES,
+        default_timeout=Config.RELAY_TOOL_TIMEOUT,
+        tool_timeouts=timeouts_from_json(Config.RELAY_TOOL_TIMEOUTS),
     )
     ws_app = create_ws_bridge_app(hub)
 
@@ -81,7 +99,9 @@ def setup_ws_bridge(
     ]
 
     logger.info("ViyvMCP: WebSocket bridge enabled (relay MCP at /relay/mcp)")
-    return WSBridgeComponents(relay_mcp, relay_mcp_app, hub, ws_routes, key_manager)
+    return WSBridgeComponents(
+        relay_mcp, relay_mcp_app, hub, ws_routes, key_manager, relay_router,
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -127,15 +147,28 @@ def apply_security(
 # --------------------------------------------------------------------------- #
 # ルート組み立て                                                                #
 # --------------------------------------------------------------------------- #
+def readiness_route(status: Callable[[], dict]) -> Route:
+    """``GET /ready``: ブリッジの接続状況を返す (未完了なら 503)。"""
+
+    async def ready(request: Request) -> JSONResponse:
+        body = status()
+        return JSONResponse(body, status_code=200 if body.get("ready") else 503)
+
+    return Route("/ready", ready, methods=["GET"])
+
+
 def build_routes(
     ws_routes: list,
     static_dir: str,
+    extra_routes: list | None = None,
 ) -> list:
     routes = [
         Mount(path, app=factory() if callable(factory) else factory)
         for path, factory in list_entries()
     ]
 
+    routes.extend(extra_routes or [])
+
     routes.extend(ws_routes)
 
     routes.append(
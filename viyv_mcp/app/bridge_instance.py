@@ -0,0 +1,193 @@
+# File: app/bridge_instance.py
+"""外部 MCP サーバーへの 1 接続 (トランスポート + ClientSession)。
+
+トランスポート (stdio サブプロセス / HTTP / 同一プロセス) は
+:mod:`~viyv_mcp.app.bridge_transport` を参照。
+
+stdio_client / ClientSession は anyio のキャンセルスコープを持つため、
+enter と exit を同じタスクで行う必要がある。そのため接続ごとに専用の
+runner タスクを立て、そのタスクが AsyncExitStack を所有する。
+
+:class:`~viyv_mcp.app.bridge_manager.BridgeHandle` は 1 つ以上の
+:class:`BridgeInstance` をプールとして束ね、呼び出しを振り分ける。
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable
+
+import anyio
+from mcp import ClientSession
+
+from viyv_mcp.app.bridge_transport import HttpTransport, InProcessTransport, StdioTransport
+
+logger = logging.getLogger(__name__)
+
+# セッションのストリームが閉じている = サブプロセス (接続) が終了している
+# (リクエストは送信されていないので、別インスタンスで再試行してよい)
+TRANSPORT_CLOSED_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+# 連続でこの回数失敗したインスタンスは unhealthy とみなし、振り分けの優先度を下げる
+UNHEALTHY_AFTER_FAILURES = 3
+
+
+class BridgeInstance:
+    """外部 MCP サーバー 1 接続分のセッションと、その負荷・健全性の記録。"""
+
+    def __init__(
+        self,
+        label: str,
+        transport: StdioTransport | HttpTransport | InProcessTransport,
+        *,
+        on_exit: Callable[["BridgeInstance"], None] | None = None,
+        message_handler: Callable[[Any], Awaitable[None]] | None = None,
+    ):
+        self.label = label
+        self._transport = transport
+        self._on_exit = on_exit
+        # サーバーからの通知 (list_changed 等) を受け取るコールバック
+        self._message_handler = message_handler
+        self.session: ClientSession | None = None
+        self.state = "pending"  # pending / starting / ready / failed / closed / dead
+        self.error: str | None = None
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0            # 連続失敗数 (成功でリセット)
+        self.total_failures = 0
+        self.last_used = time.monotonic()
+        self.started_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    def __repr__(self) -> str:
+        return f"<BridgeInstance {self.label!r} state={self.state} in_flight={self.in_flight}>"
+
+    @property
+    def healthy(self) -> bool:
+        return self.state == "ready" and self.failures < UNHEALTHY_AFTER_FAILURES
+
+    # --- ライフサイクル -------------------------------------------------------
+    async def start(self, timeout: float) -> bool:
+        """接続 (サブプロセス起動 / HTTP 接続) + initialize。成功したら True。"""
+        self.state = "starting"
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready), name=f"viyv-bridge-{self.label}")
+        try:
+            self.session = await asyncio.wait_for(asyncio.shield(ready), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._fail(f"startup timed out after {timeout}s")
+            await self._cancel_runner()
+            return False
+        except Exception as e:
+            self._fail(f"startup failed: {e}")
+            await self._cancel_runner()
+            return False
+        except asyncio.CancelledError:
+            self._fail("startup cancelled")
+            await self._cancel_runner()
+            raise
+        self.state = "ready"
+        self.started_at = time.monotonic()
+        self.last_used = self.started_at
+        return True
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                read_stream, write_stream = await self._transport.open(stack)
+                session = await stack.enter_async_context(
+                    ClientSession(
+                        read_stream, write_stream, message_handler=self._message_handler,
+                    )
+                )
+                await session.initialize()
+                ready.set_result(session)
+                await self._stop.wait()
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                if not ready.done():
+                    ready.cancel()
+                raise
+            if not ready.done():
+                ready.set_exception(e)
+            elif self.state == "ready" and not self._stop.is_set():
+                logger.error(f"[{self.label}] Connection lost: {e}")
+                self.error = str(e)
+        finally:
+            self.session = None
+            if self.state == "ready" and not self._stop.is_set():
+                # initialize 後にセッションが終了した
+                self.state = "dead"
+                if self._on_exit is not None:
+                    self._on_exit(self)
+
+    def _fail(self, reason: str) -> None:
+        self.state = "failed"
+        self.error = reason
+
+    def mark_dead(self, reason: str) -> None:
+        """呼び出し時に接続断を検知した。runner を畳み、プールから外してもらう。"""
+        if self.state != "ready":
+            return
+        logger.error(f"[{self.label}] Connection lost: {reason}")
+        self.error = reason
+        self.state = "dead"
+        self._stop.set()
+        if self._on_exit is not None:
+            self._on_exit(self)
+
+    async def _cancel_runner(self, timeout: float = 10) -> None:
+        task = self._task
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await asyncio.wait_for(task, timeout=timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError, Exception):
+            pass
+
+    async def close(self, timeout: float) -> None:
+        """runner タスクに終了を指示し、session → stdio の順にクリーンアップさせる。"""
+        task = self._task
+        self._stop.set()
+        if task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"[{self.label}] Shutdown timed out after {timeout}s")
+                await self._cancel_runner()
+            except Exception as e:
+                logger.error(f"[{self.label}] Shutdown error: {e}")
+        self.state = "closed"
+
+    # --- 呼び出し記録 ---------------------------------------------------------
+    def begin(self) -> ClientSession | None:
+        session = self.session
+        if session is not None:
+            self.in_flight += 1
+            self.calls += 1
+        return session
+
+    def end(self, ok: bool) -> None:
+        self.in_flight -= 1
+        self.last_used = time.monotonic()
+        if ok:
+            self.failures = 0
+        else:
+            self.failures += 1
+            self.total_failures += 1
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.total_failures,
+        }
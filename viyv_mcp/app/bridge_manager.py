@@ -5,23 +5,46 @@ import os
 import json
 import glob
 import logging
-import pathlib
-from contextlib import AsyncExitStack
-from typing import List, Tuple, Set
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Set
 
 from mcp import ClientSession, types
-from mcp.client.stdio import stdio_client, StdioServerParameters
-
+from mcp.client.stdio import StdioServerParameters
+from mcp.shared.exceptions import McpError
+
+from viyv_mcp.app.bridge_instance import BridgeInstance, TRANSPORT_CLOSED_ERRORS
+from viyv_mcp.app.bridge_manifest import load_manifest, save_manifest
+from viyv_mcp.app.bridge_transport import (
+    TRANSPORTS,
+    HttpConnectionPool,
+    HttpTransport,
+    InProcessTransport,
+    StdioTransport,
+)
+from viyv_mcp.app.config import Config
 from viyv_mcp.server import McpServer
 from viyv_mcp.server.registry import ResourceEntry, PromptEntry
+from viyv_mcp.server.concurrency import ConcurrencyLimit
+from viyv_mcp.server.result_cache import CachePolicy
+from viyv_mcp.server.uri_template import UriTemplate, is_template
+
+# 再同期のきっかけになる外部サーバーからの通知
+_LIST_CHANGED_NOTIFICATIONS = (
+    types.ToolListChangedNotification,
+    types.ResourceListChangedNotification,
+    types.PromptListChangedNotification,
+)
+
+# 一覧取得で辿るページ数の上限 (壊れたサーバーのカーソルループ対策)
+_MAX_LIST_PAGES = 1000
+# _safe_list_* の on_error 既定値 (空リスト) を表す番兵
+_EMPTY = object()
 
 # タイムアウト定数
 BRIDGE_STARTUP_TIMEOUT = 30   # seconds: 外部 MCP サーバー起動 + initialize の上限
 BRIDGE_SHUTDOWN_TIMEOUT = 10  # seconds: シャットダウンの上限
 
-# 内部型
-BridgeHandle = Tuple[str, AsyncExitStack, ClientSession]
-
 logger = logging.getLogger(__name__)
 
 
@@ -63,181 +86,1031 @@ def _get_resource_uri(resource: types.Resource) -> str:
     新仕様では 'uri'、旧仕様では 'uriTemplate' を使用
     """
     if hasattr(resource, 'uri'):
-        return resource.uri
+        return str(resource.uri)
     elif hasattr(resource, 'uriTemplate'):
-        return resource.uriTemplate
+        return str(resource.uriTemplate)
     else:
         # フォールバック: 属性が見つからない場合
         return "unknown://resource"
 
-async def init_bridges(
-    mcp: McpServer,
-    config: str,
-) -> List[BridgeHandle]:
-    """
-    外部 MCP サーバー(stdio)を起動して tools/resources/prompts を動的登録。
-
-    Parameters
-    ----------
-    config : str
-        ディレクトリパス (*.json をスキャン) または単一 JSON ファイルパス。
-    """
-    bridges: List[BridgeHandle] = []
-
-    if os.path.isfile(config):
-        cfg_files = [config]
-    else:
-        cfg_files = glob.glob(os.path.join(config, "*.json"))
+# ----------------------------------------------------------------------------
+# ブリッジ設定 (mcp_server_configs/*.json)
+# ----------------------------------------------------------------------------
+@dataclass
+class BridgeConfig:
+    """外部 MCP サーバー 1 件分の設定 (JSON を解釈したもの)"""
+
+    name: str
+    command: str = ""
+    args: List[str] = field(default_factory=list)
+    env: Dict[str, str] = field(default_factory=dict)
+    cwd: str | None = None
+    tags: Set[str] = field(default_factory=set)
+    group: str | None = None
+    group_map: Dict[str, str] = field(default_factory=dict)
+    # Security metadata
+    namespace: str | None = None
+    security_level: int | None = None
+    namespace_map: Dict[str, str] = field(default_factory=dict)
+    security_level_map: Dict[str, int] = field(default_factory=dict)
+    # インスタンスプール ("instances": N または {"min": a, "max": b})
+    min_instances: int = 1
+    max_instances: int = 1
+    # 最も空いているインスタンスの in-flight がこの値以上ならスケールアウト
+    scale_up_in_flight: int = 1
+    # min を超えたインスタンスはこの秒数アイドルなら停止
+    scale_down_idle: float = 60.0
+    # False ならマニフェストキャッシュを使わない (常に起動時に一覧取得)
+    manifest_cache: bool = True
+    # "eager": 起動時から常駐 / "lazy": 最初の呼び出しで起動し、
+    # idle_timeout 秒アイドルで停止 (ツールは登録されたまま)
+    lifecycle: str = "eager"
+    idle_timeout: float = 600.0
+    # "stdio" (サブプロセス) / "http" (Streamable HTTP) / "sse" (HTTP+SSE) /
+    # "module" (同一プロセスの Python MCP サーバー)
+    transport: str = "stdio"
+    url: str | None = None
+    # "module": "pkg.server:app" (transport 省略時は "module" とみなす)
+    module: str | None = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    # HTTP: 接続・書き込みのタイムアウト / SSE ストリーム読み取りのタイムアウト (秒)
+    timeout: float = 30.0
+    sse_read_timeout: float = 300.0
+    # HTTP: 接続確立に失敗したときのリトライ回数
+    retries: int = 2
+    # 結果キャッシュ ("cache": {"ttl": 秒, "size": 件数, "scope": ..., "tools": [...]})
+    # "tools" 省略時は readOnlyHint を公開しているツールだけをキャッシュする
+    cache: CachePolicy | None = None
+    cache_tools: Set[str] | None = None
+    # 同じ引数の同時呼び出しを 1 回にまとめる ("single_flight": true または [ツール名, ...])
+    # true のときは readOnlyHint / idempotentHint を公開しているツールが対象
+    single_flight: bool | Set[str] = False
+    # ツールごとの同時実行数の上限 ("concurrency": N または {"max", "queue", "timeout"})
+    # "concurrency_map" でツール単位に上書き
+    concurrency: ConcurrencyLimit | None = None
+    concurrency_map: Dict[str, ConcurrencyLimit] = field(default_factory=dict)
+    source: str = ""
+
+    @classmethod
+    def from_dict(cls, cfg: dict, source: str = "") -> "BridgeConfig":
+        name = cfg.get("name", "external")
 
-    for cfg_file in cfg_files:
-        try:
-            with open(cfg_file, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load {cfg_file}: {e}")
-            continue
-
-        name         = cfg.get("name", "external")
-        cmd          = cfg["command"]
-        args         = cfg.get("args", [])
-        cfg_tags: Set[str] = set(cfg.get("tags", []))
-        cfg_group: str | None = cfg.get("group", None)
-        cfg_group_map: dict[str, str] = cfg.get("group_map", {})
-        json_env     = cfg.get("env", {})
-        cwd          = cfg.get("cwd", None)
-        # Security metadata
-        cfg_namespace: str | None = cfg.get("namespace", None)
         raw_sl = cfg.get("security_level")
+        security_level: int | None = None
         if raw_sl is not None:
             try:
-                cfg_security_level: int | None = int(raw_sl)
+                security_level = int(raw_sl)
             except (TypeError, ValueError):
                 logger.warning(
                     f"Invalid security_level '{raw_sl}' in bridge config '{name}', "
                     "treating as unrestricted"
                 )
-                cfg_security_level = None
-        else:
-            cfg_security_level = None
-        cfg_namespace_map: dict[str, str] = cfg.get("namespace_map", {})
-        raw_sl_map = cfg.get("security_level_map", {})
-        cfg_security_level_map: dict[str, int] = {}
-        for sl_key, sl_val in raw_sl_map.items():
+        security_level_map: Dict[str, int] = {}
+        for sl_key, sl_val in cfg.get("security_level_map", {}).items():
             try:
-                cfg_security_level_map[sl_key] = int(sl_val)
+                security_level_map[sl_key] = int(sl_val)
             except (TypeError, ValueError):
                 logger.warning(
                     f"Invalid security_level_map value '{sl_val}' for tool '{sl_key}', skipping"
                 )
 
+        raw_instances = cfg.get("instances", 1)
+        if isinstance(raw_instances, dict):
+            min_instances = int(raw_instances.get("min", 1))
+            max_instances = int(raw_instances.get("max", min_instances))
+        else:
+            min_instances = max_instances = int(raw_instances)
+        min_instances = max(1, min_instances)
+        max_instances = max(min_instances, max_instances)
+
+        lifecycle = str(cfg.get("lifecycle", "eager")).lower()
+        if lifecycle not in ("eager", "lazy"):
+            logger.warning(
+                f"Invalid lifecycle '{lifecycle}' in bridge config '{name}', using 'eager'"
+            )
+            lifecycle = "eager"
+
+        transport = str(cfg.get("transport", "module" if "module" in cfg else "stdio")).lower()
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{transport}' in bridge config '{name}'")
+        if transport == "stdio":
+            command = cfg["command"]
+        elif transport == "module":
+            if not cfg.get("module"):
+                raise ValueError(f"Bridge config '{name}' uses transport 'module' without a module")
+            command = cfg.get("command", "")
+        elif not cfg.get("url"):
+            raise ValueError(f"Bridge config '{name}' uses transport '{transport}' without a url")
+        else:
+            command = cfg.get("command", "")
+
+        raw_cache = cfg.get("cache")
+        cache: CachePolicy | None = None
+        cache_tools: Set[str] | None = None
+        if isinstance(raw_cache, dict):
+            cache = CachePolicy.from_dict(raw_cache)
+            if "tools" in raw_cache:
+                cache_tools = set(raw_cache["tools"])
+
+        queue_defaults = {"max_queue": Config.TOOL_QUEUE_MAX, "max_wait": Config.TOOL_QUEUE_TIMEOUT}
+        concurrency = (
+            ConcurrencyLimit.parse(cfg["concurrency"], **queue_defaults)
+            if cfg.get("concurrency") else None
+        )
+        concurrency_map = {
+            tool_name: ConcurrencyLimit.parse(value, **queue_defaults)
+            for tool_name, value in cfg.get("concurrency_map", {}).items()
+        }
+
+        raw_sf = cfg.get("single_flight", False)
+        single_flight = set(raw_sf) if isinstance(raw_sf, list) else bool(raw_sf)
+
+        return cls(
+            name=name,
+            command=command,
+            args=cfg.get("args", []),
+            env=cfg.get("env", {}),
+            cwd=cfg.get("cwd", None),
+            tags=set(cfg.get("tags", [])),
+            group=cfg.get("group", None),
+            group_map=cfg.get("group_map", {}),
+            namespace=cfg.get("namespace", None),
+            security_level=security_level,
+            namespace_map=cfg.get("namespace_map", {}),
+            security_level_map=security_level_map,
+            min_instances=min_instances,
+            max_instances=max_instances,
+            scale_up_in_flight=max(1, int(cfg.get("scale_up_in_flight", 1))),
+            scale_down_idle=float(cfg.get("scale_down_idle", 60.0)),
+            manifest_cache=bool(cfg.get("manifest_cache", True)),
+            lifecycle=lifecycle,
+            idle_timeout=float(cfg.get("idle_timeout", Config.BRIDGE_IDLE_TIMEOUT)),
+            transport=transport,
+            url=cfg.get("url", None),
+            module=cfg.get("module", None),
+            headers=cfg.get("headers", {}),
+            timeout=float(cfg.get("timeout", 30.0)),
+            sse_read_timeout=float(cfg.get("sse_read_timeout", 300.0)),
+            retries=int(cfg.get("retries", Config.BRIDGE_HTTP_RETRIES)),
+            cache=cache,
+            cache_tools=cache_tools,
+            single_flight=single_flight,
+            concurrency=concurrency,
+            concurrency_map=concurrency_map,
+            source=source,
+        )
+
+    def cache_policy(self, tool_info: types.Tool) -> CachePolicy | None:
+        """ツールに適用する結果キャッシュの設定 (対象外なら None)。"""
+        if self.cache is None:
+            return None
+        if self.cache_tools is not None:
+            return self.cache if tool_info.name in self.cache_tools else None
+        annotations = tool_info.annotations
+        return self.cache if annotations is not None and annotations.readOnlyHint else None
+
+    def coalesces(self, tool_info: types.Tool) -> bool:
+        """同じ引数の同時呼び出しをまとめてよいツールか。"""
+        if isinstance(self.single_flight, set):
+            return tool_info.name in self.single_flight
+        annotations = tool_info.annotations
+        return bool(
+            self.single_flight and annotations is not None
+            and (annotations.readOnlyHint or annotations.idempotentHint)
+        )
+
+    def server_params(self) -> StdioServerParameters:
         # 環境変数マージ（OS が優先）
-        env_merged = {k: os.environ.get(k, v) for k, v in json_env.items()}
+        env_merged = {k: os.environ.get(k, v) for k, v in self.env.items()}
+        return StdioServerParameters(
+            command=self.command, args=self.args, env=env_merged or None, cwd=self.cwd,
+        )
 
-        # cwdが指定されていて存在しない場合は作成
-        if cwd:
-            cwd_path = pathlib.Path(cwd)
-            if not cwd_path.exists():
-                logger.info(f"Creating working directory: {cwd}")
-                cwd_path.mkdir(parents=True, exist_ok=True)
+    def make_transport(
+        self, http_pool: HttpConnectionPool | None = None,
+    ) -> StdioTransport | HttpTransport | InProcessTransport:
+        """1 接続分のトランスポートを作る。HTTP 系は ``http_pool`` を共有する。"""
+        if self.transport == "stdio":
+            return StdioTransport(self.server_params())
+        if self.transport == "module":
+            return InProcessTransport(self.module)
+        if http_pool is None:
+            raise ValueError(f"Bridge '{self.name}' needs an HTTP connection pool")
+        return HttpTransport(
+            self.url,
+            http_pool,
+            kind=self.transport,
+            headers=self.headers,
+            timeout=self.timeout,
+            sse_read_timeout=self.sse_read_timeout,
+            retries=self.retries,
+        )
 
-        logger.info(f"=== Starting external MCP server '{name}' ===")
 
-        server_params = StdioServerParameters(command=cmd, args=args, env=env_merged or None, cwd=cwd)
+def load_bridge_configs(config: str) -> List[BridgeConfig]:
+    """ディレクトリ (*.json) または単一 JSON ファイルからブリッジ設定を読み込む。
 
-        # --- プロセス / セッション確立 (AsyncExitStack + タイムアウト) -------
-        exit_stack = AsyncExitStack()
+    読み込めないファイルはログに残してスキップする。
+    """
+    if os.path.isfile(config):
+        cfg_files = [config]
+    else:
+        cfg_files = sorted(glob.glob(os.path.join(config, "*.json")))
+
+    configs: List[BridgeConfig] = []
+    for cfg_file in cfg_files:
         try:
-            async def _start_bridge():
-                read_stream, write_stream = await exit_stack.enter_async_context(
-                    stdio_client(server_params)
-                )
-                session = await exit_stack.enter_async_context(
-                    ClientSession(read_stream, write_stream)
-                )
-                await session.initialize()
-                return session
+            with open(cfg_file, "r", encoding="utf-8") as f:
+                configs.append(BridgeConfig.from_dict(json.load(f), source=cfg_file))
+        except Exception as e:
+            logger.error(f"Failed to load {cfg_file}: {e}")
+    return configs
+
+
+# ----------------------------------------------------------------------------
+# ブリッジ接続 (インスタンスプール)
+# ----------------------------------------------------------------------------
+class BridgeHandle:
+    """外部 MCP サーバー 1 設定分のハンドル (接続プール)。
+
+    ``instances`` に応じて 1 つ以上の :class:`BridgeInstance` (サブプロセス +
+    ClientSession) を持ち、呼び出しは in-flight 数が最小の健全な
+    インスタンスへ振り分ける。全インスタンスが混んでいて ``max_instances``
+    未満ならバックグラウンドでインスタンスを追加し、``scale_down_idle``
+    秒アイドルな余剰インスタンスは停止する。
+
+    ``lifecycle="lazy"`` のブリッジは idle 状態 (ツール登録済み・プロセスなし)
+    から最初の呼び出しで起動し、``idle_timeout`` 秒呼ばれなければ全
+    インスタンスを停止して idle に戻る。
 
-            session = await asyncio.wait_for(
-                _start_bridge(), timeout=BRIDGE_STARTUP_TIMEOUT,
+    登録済みのツール/リソース/プロンプトは ``call_tool`` 等をこのハンドル
+    経由で呼ぶ (ClientSession と同じシグネチャ)。
+    """
+
+    def __init__(self, config: BridgeConfig, *, http_pool: HttpConnectionPool | None = None):
+        self.config = config
+        self.name = config.name
+        # HTTP 系ブリッジの共有コネクションプール (渡されなければ専用のものを持つ)
+        self._own_pool = http_pool is None and config.transport in ("http", "sse")
+        self.http_pool = HttpConnectionPool() if self._own_pool else http_pool
+        # pending / starting / ready / idle (登録済み・プロセス未起動) / failed / closed
+        self.state = "pending"
+        self.error: str | None = None
+        # マニフェストキャッシュの保存先 (None = キャッシュしない)
+        self.manifest_dir: str | None = None
+        # 遅延起動が完了した直後に呼ばれるフック (一覧の突き合わせ用)
+        self.on_start: Callable[["BridgeHandle"], Awaitable[None]] | None = None
+        # 外部サーバーが */list_changed を通知したときに呼ばれるフック (再同期用)
+        self.on_list_changed: Callable[["BridgeHandle"], Awaitable[None]] | None = None
+        self._resync: asyncio.Task | None = None
+        self._resync_again = False
+        self._starting: asyncio.Task | None = None
+        # 起動時間の内訳 (秒): connect = spawn + initialize, list = 一覧取得
+        self.timings: Dict[str, float] = {}
+        self.tool_names: List[str] = []
+        # 登録済みの定義 (再同期時の差分計算用)
+        self.tool_defs: Dict[str, types.Tool] = {}
+        self.resource_defs: Dict[str, types.Resource] = {}
+        self.prompt_defs: Dict[str, types.Prompt] = {}
+        self.instances: List[BridgeInstance] = []
+        self._seq = 0
+        self._scaling = False
+        self._reaper: asyncio.Task | None = None
+        self._idle_watcher: asyncio.Task | None = None
+        # スーパーバイザーが次に再起動を試みる時刻 (monotonic)
+        self.retry_at: float | None = None
+        self.restarts = 0
+
+    def __repr__(self) -> str:
+        return f"<BridgeHandle {self.name!r} state={self.state} instances={len(self.instances)}>"
+
+    @property
+    def lazy(self) -> bool:
+        return self.config.lifecycle == "lazy"
+
+    @property
+    def session(self) -> ClientSession | None:
+        """先頭の稼働中インスタンスのセッション (一覧取得などに使用)。"""
+        for inst in self.instances:
+            if inst.session is not None:
+                return inst.session
+        return None
+
+    # --- ライフサイクル -------------------------------------------------------
+    def _new_instance(self) -> BridgeInstance:
+        self._seq += 1
+        label = self.name if self.config.max_instances == 1 else f"{self.name}#{self._seq}"
+        return BridgeInstance(
+            label,
+            self.config.make_transport(self.http_pool),
+            on_exit=self._on_instance_exit,
+            message_handler=self._on_message,
+        )
+
+    async def start(self, timeout: float = BRIDGE_STARTUP_TIMEOUT) -> bool:
+        """``min_instances`` 個のインスタンスを並行に起動する。1 つでも成功すれば True。"""
+        self.state = "starting"
+        t0 = time.perf_counter()
+        candidates = [self._new_instance() for _ in range(self.config.min_instances)]
+        try:
+            results = await asyncio.gather(*(inst.start(timeout) for inst in candidates))
+        finally:
+            self.timings["connect"] = time.perf_counter() - t0
+        self.instances = [inst for inst, ok in zip(candidates, results) if ok]
+        if not self.instances:
+            self._fail(candidates[0].error or "startup failed")
+            return False
+        if len(self.instances) < len(candidates):
+            logger.warning(
+                f"[{self.name}] {len(self.instances)}/{len(candidates)} instances started"
             )
-        except asyncio.TimeoutError:
-            logger.error(
-                f"[{name}] Startup timed out after {BRIDGE_STARTUP_TIMEOUT}s, skipping"
+        self.state = "ready"
+        return True
+
+    def _fail(self, reason: str) -> None:
+        self.state = "failed"
+        self.error = reason
+
+    async def replenish(self, timeout: float = BRIDGE_STARTUP_TIMEOUT) -> int:
+        """``min_instances`` に満たない分のインスタンスを起動し、起動数を返す。"""
+        missing = self.config.min_instances - len(self.instances)
+        if missing <= 0:
+            return 0
+        candidates = [self._new_instance() for _ in range(missing)]
+        results = await asyncio.gather(*(inst.start(timeout) for inst in candidates))
+        started = [inst for inst, ok in zip(candidates, results) if ok]
+        if self.state == "closed":
+            await asyncio.gather(*(inst.close(BRIDGE_SHUTDOWN_TIMEOUT) for inst in started))
+            return 0
+        self.instances.extend(started)
+        if not started:
+            self.error = candidates[0].error
+        return len(started)
+
+    async def ping(self, timeout: float) -> None:
+        """アイドルなインスタンスに ping し、応答しないものを dead にする。
+
+        呼び出し中のインスタンスは (単一スレッドのサーバーだと ping に応答
+        できないため) 対象外。
+        """
+
+        async def _ping(inst: BridgeInstance) -> None:
+            session = inst.session
+            if session is None or inst.in_flight:
+                return
+            try:
+                await asyncio.wait_for(session.send_ping(), timeout=timeout)
+            except asyncio.TimeoutError:
+                inst.mark_dead(f"ping timed out after {timeout}s")
+            except Exception as e:
+                inst.mark_dead(f"ping failed: {type(e).__name__}: {e}")
+
+        await asyncio.gather(*(_ping(inst) for inst in list(self.instances)))
+
+    def _on_instance_exit(self, inst: BridgeInstance) -> None:
+        if inst in self.instances:
+            self.instances.remove(inst)
+        if self.state == "ready" and not self.instances:
+            if self.lazy:
+                # 次の呼び出しで起動し直す
+                self.state = "idle"
+                self.error = inst.error
+                logger.warning(f"[{self.name}] Process ended; will restart on next call")
+                return
+            self._fail(f"all instances exited ({inst.error or 'process ended'})")
+            logger.error(f"[{self.name}] {self.error}")
+
+    # --- list_changed による再同期 -------------------------------------------
+    async def _on_message(self, message: Any) -> None:
+        """ClientSession の message_handler。受信ループ上で呼ばれるのでブロックしない。"""
+        if not isinstance(message, types.ServerNotification):
+            return
+        if isinstance(message.root, _LIST_CHANGED_NOTIFICATIONS):
+            self.schedule_resync()
+
+    def schedule_resync(self) -> None:
+        """再同期を予約する。実行中に来た通知は 1 回の追加実行にまとめる。"""
+        if self.on_list_changed is None or self.state == "closed":
+            return
+        if self._resync is not None:
+            self._resync_again = True
+            return
+        self._resync = asyncio.get_running_loop().create_task(self._run_resync())
+
+    async def _run_resync(self) -> None:
+        try:
+            while True:
+                self._resync_again = False
+                if self.session is not None:
+                    try:
+                        await self.on_list_changed(self)
+                    except Exception as e:
+                        logger.error(f"[{self.name}] Re-sync failed: {e}")
+                if not self._resync_again:
+                    return
+        finally:
+            self._resync = None
+
+    def _cancel_background(self) -> None:
+        for attr in ("_reaper", "_idle_watcher", "_resync"):
+            task = getattr(self, attr)
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+            setattr(self, attr, None)
+
+    async def close(self, timeout: float = BRIDGE_SHUTDOWN_TIMEOUT) -> None:
+        """全インスタンスを終了する。"""
+        self._cancel_background()
+        instances, self.instances = self.instances, []
+        await asyncio.gather(*(inst.close(timeout) for inst in instances))
+        if self._own_pool:
+            await self.http_pool.aclose()
+        self.state = "closed"
+
+    # --- アイドル停止 (lifecycle="lazy") -------------------------------------
+    def watch_idle(self) -> None:
+        """``idle_timeout`` 秒呼ばれなければ停止する監視タスクを開始する。"""
+        if self.lazy and self.config.idle_timeout > 0 and self._idle_watcher is None:
+            self._idle_watcher = asyncio.get_running_loop().create_task(self._watch_idle())
+
+    async def _watch_idle(self) -> None:
+        timeout = self.config.idle_timeout
+        try:
+            while self.state == "ready" and self.instances:
+                if any(inst.in_flight for inst in self.instances):
+                    idle_for = 0.0
+                else:
+                    idle_for = time.monotonic() - max(i.last_used for i in self.instances)
+                    if idle_for >= timeout:
+                        await self.stop_idle()
+                        return
+                await asyncio.sleep(max(timeout - idle_for, 0.05))
+        finally:
+            if self._idle_watcher is asyncio.current_task():
+                self._idle_watcher = None
+
+    async def stop_idle(self, timeout: float = BRIDGE_SHUTDOWN_TIMEOUT) -> None:
+        """全インスタンスを停止して idle に戻す。ツールは登録されたまま。"""
+        self._cancel_background()
+        # 先に切り離すので、停止中に来た呼び出しは新しいインスタンスを起動する
+        instances, self.instances = self.instances, []
+        self.state = "idle"
+        logger.info(
+            f"[{self.name}] Stopping {len(instances)} idle instance(s) "
+            f"after {self.config.idle_timeout:.0f}s without calls"
+        )
+        await asyncio.gather(*(inst.close(timeout) for inst in instances))
+
+    # --- オートスケール -------------------------------------------------------
+    def _maybe_scale_up(self, least_loaded: BridgeInstance) -> None:
+        if (
+            self._scaling
+            or len(self.instances) >= self.config.max_instances
+            or least_loaded.in_flight < self.config.scale_up_in_flight
+        ):
+            return
+        self._scaling = True
+        asyncio.get_running_loop().create_task(self._scale_up())
+
+    async def _scale_up(self) -> None:
+        inst = self._new_instance()
+        try:
+            if await inst.start(BRIDGE_STARTUP_TIMEOUT) and self.state == "ready":
+                self.instances.append(inst)
+                logger.info(f"[{self.name}] Scaled up to {len(self.instances)} instances")
+                if self._reaper is None:
+                    self._reaper = asyncio.get_running_loop().create_task(self._reap_idle())
+            elif inst.state == "ready":
+                await inst.close(BRIDGE_SHUTDOWN_TIMEOUT)
+            else:
+                logger.warning(f"[{self.name}] Scale-up failed: {inst.error}")
+        finally:
+            self._scaling = False
+
+    async def _reap_idle(self) -> None:
+        idle = self.config.scale_down_idle
+        while len(self.instances) > self.config.min_instances:
+            await asyncio.sleep(max(idle / 2, 0.05))
+            now = time.monotonic()
+            surplus = len(self.instances) - self.config.min_instances
+            for inst in list(reversed(self.instances)):
+                if surplus <= 0:
+                    break
+                if inst.in_flight == 0 and now - inst.last_used >= idle:
+                    self.instances.remove(inst)
+                    surplus -= 1
+                    await inst.close(BRIDGE_SHUTDOWN_TIMEOUT)
+                    logger.info(f"[{self.name}] Scaled down to {len(self.instances)} instances")
+        self._reaper = None
+
+    # --- 振り分け -------------------------------------------------------------
+    def _unavailable(self) -> McpError:
+        """サーキットオープン中 (全インスタンス停止) の即時エラー。"""
+        message = f"Bridge '{self.name}' is unavailable"
+        if self.error:
+            message += f": {self.error}"
+        if self.retry_at is not None:
+            wait = max(0.0, self.retry_at - time.monotonic())
+            message += f" (restart in {wait:.0f}s)"
+        return McpError(types.ErrorData(code=-32000, message=message))
+
+    @property
+    def circuit_open(self) -> bool:
+        return not any(i.session is not None for i in self.instances)
+
+    def _pick(self) -> BridgeInstance:
+        live = [i for i in self.instances if i.session is not None]
+        if not live:
+            raise self._unavailable()
+        pool = [i for i in live if i.healthy] or live
+        inst = min(pool, key=lambda i: i.in_flight)
+        self._maybe_scale_up(inst)
+        return inst
+
+    async def ensure_started(self) -> None:
+        """idle (未起動) なら起動する。同時に来た呼び出しは 1 回の起動を共有する。"""
+        if self.instances:
+            return
+        if self._starting is None:
+            if self.state != "idle":
+                return
+            self._starting = asyncio.get_running_loop().create_task(self._lazy_start())
+        # 呼び出し元がキャンセルされても起動処理自体は続ける
+        await asyncio.shield(self._starting)
+
+    async def _lazy_start(self) -> None:
+        try:
+            logger.info(f"=== Starting external MCP server '{self.name}' on first use ===")
+            if not await self.start():
+                logger.error(f"[{self.name}] {self.error}")
+                error = self._unavailable()
+                if self.lazy:
+                    # 次の呼び出しで再試行する
+                    self.state = "idle"
+                raise error
+            logger.info(f"[{self.name}] Started in {self.timings['connect']:.2f}s")
+            if self.on_start is not None:
+                try:
+                    await self.on_start(self)
+                except Exception as e:
+                    logger.error(f"[{self.name}] on_start hook failed: {e}")
+            self.watch_idle()
+        finally:
+            self._starting = None
+
+    async def _call(self, method: str, *args, **kwargs):
+        await self.ensure_started()
+        while True:
+            inst = self._pick()
+            session = inst.begin()
+            if session is None:
+                continue
+            ok = False
+            try:
+                result = await getattr(session, method)(*args, **kwargs)
+                ok = True
+                return result
+            except McpError:
+                # プロトコルレベルのエラーは接続の健全性とは無関係
+                ok = True
+                raise
+            except TRANSPORT_CLOSED_ERRORS as e:
+                # 送信前に接続断を検知 → インスタンスを外して別インスタンスで再試行
+                inst.mark_dead(f"{type(e).__name__}: {e}")
+                if self.circuit_open:
+                    raise self._unavailable() from e
+            finally:
+                inst.end(ok)
+
+    def _require_session(self) -> ClientSession:
+        return self._pick().session
+
+    async def call_tool(self, name: str, arguments: dict | None = None):
+        return await self._call("call_tool", name, arguments=arguments)
+
+    async def read_resource(self, uri):
+        return await self._call("read_resource", uri)
+
+    async def get_prompt(self, name: str, arguments: dict | None = None):
+        return await self._call("get_prompt", name, arguments=arguments)
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "instances": [inst.stats() for inst in self.instances],
+            "in_flight": sum(inst.in_flight for inst in self.instances),
+        }
+
+
+async def _attach_bridge(mcp: McpServer, handle: BridgeHandle) -> Set[str]:
+    """一覧を取得して tools / resources / prompts の差分を登録する。
+
+    初回登録のほか、再接続時・list_changed 受信時の再同期や、マニフェスト
+    キャッシュとの突き合わせにも使う。変化した種類 ("tools" / "resources" /
+    "prompts") の集合を返す。``handle.manifest_dir`` が設定されていれば
+    登録後の一覧をキャッシュに保存する。
+    """
+    name = handle.name
+    session = handle._require_session()
+
+    # 取得に失敗した種類は None (= 登録済みのものを維持する)
+    t0 = time.perf_counter()
+    tools, resources, templates, prompts = await asyncio.gather(
+        _safe_list_tools(session, server_name=name, on_error=None),
+        _safe_list_resources(session, server_name=name, on_error=None),
+        _safe_list_resource_templates(session, server_name=name, on_error=None),
+        _safe_list_prompts(session, server_name=name, on_error=None),
+    )
+    handle.timings["list"] = time.perf_counter() - t0
+    # リソーステンプレートは resources として一緒に差分登録する
+    if resources is not None:
+        if templates is None:
+            templates = [
+                r for r in handle.resource_defs.values()
+                if isinstance(r, types.ResourceTemplate)
+            ]
+        resources = resources + templates
+
+    changed = _register_listing(mcp, handle, tools, resources, prompts)
+    if handle.manifest_dir:
+        save_manifest(
+            handle.manifest_dir,
+            handle.config,
+            list(handle.tool_defs.values()),
+            list(handle.resource_defs.values()),
+            list(handle.prompt_defs.values()),
+        )
+    return changed
+
+
+def _register_listing(
+    mcp: McpServer,
+    handle: BridgeHandle,
+    tools: List[types.Tool] | None,
+    resources: List[types.Resource | types.ResourceTemplate] | None,
+    prompts: List[types.Prompt] | None,
+) -> Set[str]:
+    """一覧と登録済みの定義を比べ、追加・変更分だけ登録し消えた分を登録解除する。
+
+    ``None`` の種類は変更しない。変化した種類の集合を返す。
+    """
+    cfg = handle.config
+    name = handle.name
+    changed: Set[str] = set()
+
+    # ----------------------- Tools ----------------------------------------------
+    if tools is not None:
+        new_defs = {t.name: t for t in tools}
+        added, stale = _diff(handle.tool_defs, new_defs)
+        for t in added:
+            tool_group = cfg.group_map.get(t.name, cfg.group)
+            tool_ns = cfg.namespace_map.get(t.name, cfg.namespace)
+            tool_sl = cfg.security_level_map.get(t.name, cfg.security_level)
+            _register_tool_bridge(
+                mcp, handle, t, cfg.tags, tool_group, tool_ns, tool_sl,
+                cache=cfg.cache_policy(t), single_flight=cfg.coalesces(t),
+                concurrency=cfg.concurrency_map.get(t.name, cfg.concurrency),
             )
-            await exit_stack.aclose()
-            continue
-        except Exception as e:
-            logger.error(f"[{name}] Startup failed: {e}, cleaning up")
-            await exit_stack.aclose()
-            continue
+        if stale:
+            unregister_bridged_tools(mcp, stale)
+            logger.info(f"[{name}] Removed tools => {stale}")
+        handle.tool_defs = new_defs
+        handle.tool_names = list(new_defs)
+        if added or stale:
+            changed.add("tools")
+            logger.info(f"[{name}] Tools => {handle.tool_names}")
+
+    # ----------------------- Resources ------------------------------------------
+    if resources is not None:
+        new_defs = {_get_resource_uri(r): r for r in resources}
+        added, stale = _diff(handle.resource_defs, new_defs)
+        for r in added:
+            _register_resource_bridge(mcp, handle, r)
+        for uri in stale:
+            mcp.registry.unregister_resource(uri)
+        handle.resource_defs = new_defs
+        if added or stale:
+            changed.add("resources")
+            logger.info(f"[{name}] Resources => {list(new_defs)}")
+
+    # ----------------------- Prompts --------------------------------------------
+    if prompts is not None:
+        new_defs = {p.name: p for p in prompts}
+        added, stale = _diff(handle.prompt_defs, new_defs)
+        for p in added:
+            _register_prompt_bridge(mcp, handle, p)
+        for prompt_name in stale:
+            mcp.registry.unregister_prompt(prompt_name)
+        handle.prompt_defs = new_defs
+        if added or stale:
+            changed.add("prompts")
+            logger.info(f"[{name}] Prompts => {list(new_defs)}")
+
+    return changed
+
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any]) -> tuple[list, List[str]]:
+    """(追加・変更された定義, 消えたキー) を返す。"""
+    added = [item for key, item in new.items() if old.get(key) != item]
+    stale = sorted(set(old) - set(new))
+    return added, stale
+
+
+class BridgeSet:
+    """設定済みブリッジ一式の起動・状態・終了をまとめて扱う。
+
+    ``start()`` は全ブリッジの起動を待つ (従来の init_bridges と同じ)。
+    ``start_background()`` は起動をバックグラウンドタスクに任せてすぐ戻り、
+    ブリッジが ready になるたびに ``on_ready`` を呼ぶ。
+    ``status()`` は /ready エンドポイント用の状態を返す。
+
+    ``manifest_dir`` (既定は ``Config.BRIDGE_MANIFEST_DIR``) が設定されていると、
+    キャッシュ済みのブリッジはサブプロセスを起動せずに一覧を登録して idle
+    状態になり、最初の呼び出しで起動して実際の一覧と突き合わせる。
+    """
 
-        logger.info(f"[{name}] MCP initialize() done")
+    def __init__(self, configs: List[BridgeConfig], *, manifest_dir: str | None = None):
+        # HTTP 系ブリッジがあれば keep-alive コネクションプールを 1 つ共有する
+        self.http_pool: HttpConnectionPool | None = None
+        if any(cfg.transport in ("http", "sse") for cfg in configs):
+            self.http_pool = HttpConnectionPool()
+        self.handles: List[BridgeHandle] = [
+            BridgeHandle(cfg, http_pool=self.http_pool) for cfg in configs
+        ]
+        self.manifest_dir = (
+            manifest_dir if manifest_dir is not None else Config.BRIDGE_MANIFEST_DIR
+        ) or None
+        for h in self.handles:
+            if h.config.manifest_cache:
+                h.manifest_dir = self.manifest_dir
+        self._task: asyncio.Task | None = None
+        self.supervisor = None
+        self._settled = not self.handles
+
+    @classmethod
+    def from_config(cls, config: str, *, manifest_dir: str | None = None) -> "BridgeSet":
+        return cls(load_bridge_configs(config), manifest_dir=manifest_dir)
+
+    @property
+    def settled(self) -> bool:
+        """全ブリッジの起動処理が (成功・失敗を問わず) 終わったか。"""
+        return self._settled
+
+    @property
+    def ready_handles(self) -> List[BridgeHandle]:
+        """ツールを提供できるブリッジ (起動済み、またはキャッシュから登録済み)"""
+        return [h for h in self.handles if h.state in ("ready", "idle")]
+
+    async def start(
+        self,
+        mcp: McpServer,
+        *,
+        concurrency: int | None = None,
+        on_ready: Callable[[BridgeHandle], None] | None = None,
+    ) -> List[BridgeHandle]:
+        """全ブリッジを並行に起動し、ready になったものから登録する。"""
+        if not self.handles:
+            self._settled = True
+            return []
+
+        limit = max(1, concurrency or Config.BRIDGE_STARTUP_CONCURRENCY)
+        semaphore = asyncio.Semaphore(limit)
+        t0 = time.perf_counter()
+
+        async def _reconcile(handle: BridgeHandle) -> None:
+            changed = await _attach_bridge(mcp, handle)
+            if changed:
+                logger.info(f"[{handle.name}] Listing changed: {sorted(changed)}")
+                mcp.notify_list_changed(*changed)
+
+        def _notify_ready(handle: BridgeHandle) -> None:
+            if on_ready is not None:
+                try:
+                    on_ready(handle)
+                except Exception as e:
+                    logger.error(f"[{handle.name}] on_ready callback failed: {e}")
+
+        def _from_manifest(handle: BridgeHandle) -> bool:
+            t_load = time.perf_counter()
+            manifest = load_manifest(handle.manifest_dir, handle.config)
+            if manifest is None:
+                return False
+            _register_listing(mcp, handle, manifest.tools, manifest.resources, manifest.prompts)
+            handle.state = "idle"
+            handle.on_start = _reconcile
+            handle.timings["total"] = time.perf_counter() - t_load
+            logger.info(
+                f"[{handle.name}] Advertised {len(manifest.tools)} tools from manifest "
+                f"cache in {handle.timings['total'] * 1000:.1f}ms (starts on first use)"
+            )
+            _notify_ready(handle)
+            return True
+
+        async def _bring_up(handle: BridgeHandle) -> None:
+            handle.on_list_changed = _reconcile
+            if handle.lazy:
+                handle.on_start = _reconcile
+            if handle.manifest_dir and _from_manifest(handle):
+                return
+            async with semaphore:
+                name = handle.name
+                logger.info(f"=== Starting external MCP server '{name}' ===")
+                if not await handle.start():
+                    logger.error(
+                        f"[{name}] {handle.error} "
+                        f"({handle.timings['connect']:.2f}s), skipping"
+                    )
+                    return
+                logger.info(f"[{name}] MCP initialize() done")
+                try:
+                    await _attach_bridge(mcp, handle)
+                except Exception as e:
+                    logger.error(f"[{name}] Registration failed: {e}, cleaning up")
+                    await handle.close()
+                    handle._fail(f"registration failed: {e}")
+                    return
+                handle.timings["total"] = handle.timings["connect"] + handle.timings["list"]
+                logger.info(
+                    f"[{name}] Ready in {handle.timings['total']:.2f}s "
+                    f"(start+initialize {handle.timings['connect']:.2f}s, "
+                    f"list {handle.timings['list']:.2f}s)"
+                )
+                # lazy: 一覧取得に使ったプロセスもアイドルなら停止する
+                handle.watch_idle()
+                _notify_ready(handle)
 
-        # ----------------------- Tools ----------------------------------------------
-        tools = await _safe_list_tools(session, server_name=name)
-        for t in tools:
-            tool_group = cfg_group_map.get(t.name, cfg_group)
-            tool_ns = cfg_namespace_map.get(t.name, cfg_namespace)
-            tool_sl = cfg_security_level_map.get(t.name, cfg_security_level)
-            _register_tool_bridge(mcp, session, t, cfg_tags, tool_group, tool_ns, tool_sl)
-        logger.info(f"[{name}] Tools => {[x.name for x in tools]}")
+        try:
+            await asyncio.gather(*(_bring_up(h) for h in self.handles))
+        finally:
+            self._settled = True
+
+        bridges = self.ready_handles
+        elapsed = time.perf_counter() - t0
+        summary = f"Bridges ready: {len(bridges)}/{len(self.handles)} in {elapsed:.2f}s"
+        if bridges:
+            slowest = max(bridges, key=lambda h: h.timings["total"])
+            summary += f" (slowest: '{slowest.name}' {slowest.timings['total']:.2f}s)"
+        logger.info(summary)
+        return bridges
+
+    def start_background(
+        self,
+        mcp: McpServer,
+        *,
+        concurrency: int | None = None,
+        on_ready: Callable[[BridgeHandle], None] | None = None,
+    ) -> asyncio.Task:
+        """起動をバックグラウンドで行う。ローカルツールは即座に提供できる。"""
+        self._task = asyncio.create_task(
+            self.start(mcp, concurrency=concurrency, on_ready=on_ready),
+            name="viyv-bridge-startup",
+        )
+        return self._task
+
+    def supervise(self, mcp: McpServer, **kwargs) -> None:
+        """死活監視・自動再起動を開始する (BRIDGE_PING_INTERVAL=0 なら何もしない)。"""
+        from viyv_mcp.app.bridge_supervisor import BridgeSupervisor
+
+        if self.supervisor is None and self.handles:
+            self.supervisor = BridgeSupervisor(mcp, self.handles, **kwargs)
+            self.supervisor.start()
+
+    def status(self) -> dict:
+        bridges = {}
+        for h in self.handles:
+            info: dict[str, Any] = {
+                "state": h.state,
+                "tools": len(h.tool_names),
+                "instances": len(h.instances),
+            }
+            if h.restarts:
+                info["restarts"] = h.restarts
+            if "total" in h.timings:
+                info["startup_seconds"] = round(h.timings["total"], 3)
+            if h.error:
+                info["error"] = h.error
+            bridges[h.name] = info
+        return {"ready": self._settled, "bridges": bridges}
+
+    async def close(self) -> None:
+        if self.supervisor is not None:
+            await self.supervisor.stop()
+        task = self._task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await close_bridges([h for h in self.handles if h.state != "closed"])
+        if self.http_pool is not None:
+            await self.http_pool.aclose()
 
-        # ----------------------- Resources ------------------------------------------
-        resources = await _safe_list_resources(session, server_name=name)
-        for r in resources:
-            _register_resource_bridge(mcp, session, r)
-        if resources:
-            logger.info(f"[{name}] Resources => {[_get_resource_uri(r) for r in resources]}")
 
-        # ----------------------- Prompts --------------------------------------------
-        prompts = await _safe_list_prompts(session, server_name=name)
-        for p in prompts:
-            _register_prompt_bridge(mcp, session, p)
-        if prompts:
-            logger.info(f"[{name}] Prompts => {[p.name for p in prompts]}")
+async def init_bridges(
+    mcp: McpServer,
+    config: str,
+    *,
+    concurrency: int | None = None,
+) -> List[BridgeHandle]:
+    """
+    外部 MCP サーバー(stdio)を起動して tools/resources/prompts を動的登録。
 
-        bridges.append((name, exit_stack, session))
+    各サーバーは並行に起動され (同時数は ``concurrency``、既定は
+    ``Config.BRIDGE_STARTUP_CONCURRENCY``)、ready になったものから順に
+    登録される。起動時間は合計ではなく最も遅いブリッジで決まる。
 
-    return bridges
+    Parameters
+    ----------
+    config : str
+        ディレクトリパス (*.json をスキャン) または単一 JSON ファイルパス。
+    """
+    return await BridgeSet.from_config(config).start(mcp, concurrency=concurrency)
 
 
 async def close_bridges(bridges: List[BridgeHandle]):
     """
-    init_bridges() で起動したサブプロセス/セッションを全て終了。
-    AsyncExitStack.aclose() が session → stdio の順にクリーンアップする。
+    init_bridges() で起動したサブプロセス/セッションを全て (並行に) 終了。
+    各 runner タスクが session → stdio の順にクリーンアップする。
     """
-    for (name, exit_stack, session) in bridges:
-        logger.info(f"=== Shutting down external MCP server '{name}' ===")
-        try:
-            await asyncio.wait_for(
-                exit_stack.aclose(), timeout=BRIDGE_SHUTDOWN_TIMEOUT,
-            )
-        except asyncio.TimeoutError:
-            logger.error(
-                f"[{name}] Shutdown timed out after {BRIDGE_SHUTDOWN_TIMEOUT}s"
-            )
-        except Exception as e:
-            logger.error(f"[{name}] Shutdown error: {e}")
+
+    async def _close(handle: BridgeHandle) -> None:
+        logger.info(f"=== Shutting down external MCP server '{handle.name}' ===")
+        await handle.close()
+
+    await asyncio.gather(*(_close(h) for h in bridges))
 
 
 # ----------------------------------------------------------------------------
 # 安全ラッパ: Tools
 # ----------------------------------------------------------------------------
-async def _safe_list_tools(session: ClientSession, server_name: str) -> List[types.Tool]:
+async def _list_all_pages(
+    list_fn: Callable[..., Awaitable[Any]],
+    attr: str,
+    key: Callable[[Any], str],
+    server_name: str,
+) -> list:
+    """``nextCursor`` を辿って全ページの ``attr`` を連結する。
+
+    同じカーソルが再び返ってきた場合や ``_MAX_LIST_PAGES`` を超えた場合は
+    そこで打ち切る。ページ間で重複した項目 (``key`` が同じもの) は先勝ち。
     """
-    list_tools() を呼び出し、取得データを  types.Tool に変換して返す。
+    items: list = []
+    seen_keys: Set[str] = set()
+    seen_cursors: Set[str] = set()
+    cursor: str | None = None
+    for _ in range(_MAX_LIST_PAGES):
+        if cursor is None:
+            result = await list_fn()
+        else:
+            result = await list_fn(params=types.PaginatedRequestParams(cursor=cursor))
+        for item in getattr(result, attr, None) or []:
+            try:
+                k = key(item)
+            except Exception:
+                k = None
+            if k is not None and k in seen_keys:
+                continue
+            if k is not None:
+                seen_keys.add(k)
+            items.append(item)
+        cursor = getattr(result, "nextCursor", None)
+        if not cursor:
+            return items
+        if cursor in seen_cursors:
+            logger.warning(f"[{server_name}] {attr}: cursor repeated, stopping pagination")
+            return items
+        seen_cursors.add(cursor)
+    logger.warning(f"[{server_name}] {attr}: more than {_MAX_LIST_PAGES} pages, truncated")
+    return items
+
+
+def _item_key(item: Any, *fields: str) -> str:
+    for f in fields:
+        value = item.get(f) if isinstance(item, dict) else getattr(item, f, None)
+        if value is not None:
+            return str(value)
+    return repr(item)
+
+
+async def _safe_list_tools(
+    session: ClientSession, server_name: str, *, on_error: Any = _EMPTY,
+) -> List[types.Tool]:
+    """
+    list_tools() を (全ページ) 呼び出し、取得データを  types.Tool に変換して返す。
     外部サーバーがタプル等を返す場合、inputSchema/outputSchemaなどを補完。
-    未実装(メソッドが無い)の場合は空リストを返す。
+    未実装(メソッドが無い)などで失敗した場合は ``on_error`` (既定は空リスト) を返す。
     """
     try:
-        raw_tools = await session.list_tools()  # 失敗するとException
+        raw_items = await _list_all_pages(  # 失敗するとException
+            session.list_tools, "tools", lambda i: _item_key(i, "name"), server_name,
+        )
     except Exception as e:
         logger.warning(f"[{server_name}] list_tools error => {e}")
-        return []
+        return [] if on_error is _EMPTY else on_error
 
     tools_converted = []
-    # raw_tools が ListToolsResultの場合、.tools でツール配列を取得
-    for item in raw_tools.tools:
+    for item in raw_items:
         if isinstance(item, types.Tool):
             # すでに正しい型。バリデーション対策で空のinputSchema/outputSchema埋めるのも可
             tools_converted.append(item)
@@ -271,24 +1144,29 @@ async def _safe_list_tools(session: ClientSession, server_name: str) -> List[typ
 # ----------------------------------------------------------------------------
 # 安全ラッパ: Resources
 # ----------------------------------------------------------------------------
-async def _safe_list_resources(session: ClientSession, server_name: str) -> List[types.Resource]:
+async def _safe_list_resources(
+    session: ClientSession, server_name: str, *, on_error: Any = _EMPTY,
+) -> List[types.Resource]:
     """
-    list_resources() を呼び出し、types.Resource に変換して返す。
+    list_resources() を (全ページ) 呼び出し、types.Resource に変換して返す。
     SDK のバージョン差異を透過的に処理する。
 
     MCP Protocol 仕様:
     - list_resources() は ListResourcesResult を返す
     - ListResourcesResult: {resources: [...], meta: {...}, nextCursor: "..."}
-    - 実際のリソース配列は .resources 属性にある
+    - 実際のリソース配列は .resources 属性にあり、nextCursor があれば続きを取得する
     """
     try:
-        raw_resources = await session.list_resources()
+        # MCP Protocol: ListResourcesResult.resources を取得
+        resources_list = await _list_all_pages(
+            session.list_resources,
+            "resources",
+            lambda i: _item_key(i, "uri", "uriTemplate"),
+            server_name,
+        )
     except Exception as e:
         logger.warning(f"[{server_name}] list_resources error => {e}")
-        return []
-
-    # MCP Protocol: ListResourcesResult.resources を取得
-    resources_list = getattr(raw_resources, 'resources', [])
+        return [] if on_error is _EMPTY else on_error
 
     resources_converted: List[types.Resource] = []
     for item in resources_list:
@@ -314,34 +1192,61 @@ async def _safe_list_resources(session: ClientSession, server_name: str) -> List
         except Exception as e:
             logger.warning(f"[{server_name}] Resource convert error => {e} (raw={item})")
 
-    # ページネーション情報のログ出力
-    next_cursor = getattr(raw_resources, 'nextCursor', None)
-    if next_cursor:
-        logger.info(f"[{server_name}] Resources have more pages (nextCursor: {next_cursor[:50]}...)")
-
     return resources_converted
 
+async def _safe_list_resource_templates(
+    session: ClientSession, server_name: str, *, on_error: Any = _EMPTY,
+) -> List[types.ResourceTemplate]:
+    """
+    list_resource_templates() を (全ページ) 呼び出し、types.ResourceTemplate を返す。
+    未対応のサーバーでは ``on_error`` (既定は空リスト)。
+    """
+    try:
+        raw_items = await _list_all_pages(
+            session.list_resource_templates,
+            "resourceTemplates",
+            lambda i: _item_key(i, "uriTemplate"),
+            server_name,
+        )
+    except Exception as e:
+        logger.warning(f"[{server_name}] list_resource_templates error => {e}")
+        return [] if on_error is _EMPTY else on_error
+
+    templates: List[types.ResourceTemplate] = []
+    for item in raw_items:
+        try:
+            templates.append(
+                item if isinstance(item, types.ResourceTemplate)
+                else types.ResourceTemplate.model_validate(item)
+            )
+        except Exception as e:
+            logger.warning(f"[{server_name}] Resource template convert error => {e} (raw={item})")
+    return templates
+
+
 # ----------------------------------------------------------------------------
 # 安全ラッパ: Prompts
 # ----------------------------------------------------------------------------
-async def _safe_list_prompts(session: ClientSession, server_name: str) -> List[types.Prompt]:
+async def _safe_list_prompts(
+    session: ClientSession, server_name: str, *, on_error: Any = _EMPTY,
+) -> List[types.Prompt]:
     """
-    list_prompts() を呼び出し、types.Prompt に変換して返す。
-    Method not found等で失敗したら空リスト。
+    list_prompts() を (全ページ) 呼び出し、types.Prompt に変換して返す。
+    Method not found等で失敗したら ``on_error`` (既定は空リスト)。
 
     MCP Protocol 仕様:
     - list_prompts() は ListPromptsResult を返す
     - ListPromptsResult: {prompts: [...], meta: {...}, nextCursor: "..."}
-    - 実際のプロンプト配列は .prompts 属性にある
+    - 実際のプロンプト配列は .prompts 属性にあり、nextCursor があれば続きを取得する
     """
     try:
-        raw_prompts = await session.list_prompts()
+        # MCP Protocol: ListPromptsResult.prompts を取得
+        prompts_list = await _list_all_pages(
+            session.list_prompts, "prompts", lambda i: _item_key(i, "name"), server_name,
+        )
     except Exception as e:
         logger.warning(f"[{server_name}] list_prompts error => {e}")
-        return []
-
-    # MCP Protocol: ListPromptsResult.prompts を取得
-    prompts_list = getattr(raw_prompts, 'prompts', [])
+        return [] if on_error is _EMPTY else on_error
 
     prompts_converted = []
     for item in prompts_list:
@@ -376,11 +1281,6 @@ async def _safe_list_prompts(session: ClientSession, server_name: str) -> List[t
             )
             prompts_converted.append(p)
 
-    # ページネーション情報のログ出力
-    next_cursor = getattr(raw_prompts, 'nextCursor', None)
-    if next_cursor:
-        logger.info(f"[{server_name}] Prompts have more pages (nextCursor: {next_cursor[:50]}...)")
-
     return prompts_converted
 
 
@@ -389,17 +1289,22 @@ async def _safe_list_prompts(session: ClientSession, server_name: str) -> List[t
 # ----------------------------------------------------------------------------
 def _register_tool_bridge(
     mcp: McpServer,
-    session: ClientSession,
+    session: Any,
     tool_info: types.Tool,
     cfg_tags: Set[str] | None = None,
     cfg_group: str | None = None,
     cfg_namespace: str | None = None,
     cfg_security_level: int | None = None,
+    *,
+    cache: CachePolicy | None = None,
+    single_flight: bool = False,
+    concurrency: ConcurrencyLimit | None = None,
 ):
     """Register a bridged tool by passing the external JSON Schema directly."""
     tool_name = tool_info.name
     desc = tool_info.description or f"Bridged external tool '{tool_name}'"
     input_schema = tool_info.inputSchema or {"type": "object", "properties": {}}
+    annotations = tool_info.annotations
 
     async def _bridged_call(**kwargs):
         args = {k: v for k, v in kwargs.items() if v is not None}
@@ -414,31 +1319,40 @@ def _register_tool_bridge(
         group=cfg_group,
         namespace=cfg_namespace,
         security_level=cfg_security_level,
+        # 上流のアノテーションをそのまま公開する (destructive なツールはキャッシュされない)
+        title=annotations.title if annotations else None,
+        destructive=annotations.destructiveHint if annotations else None,
+        read_only=annotations.readOnlyHint if annotations else None,
+        cache=cache,
+        single_flight=single_flight,
+        concurrency=concurrency,
     )
 
 
-def _register_resource_bridge(mcp: McpServer, session: ClientSession, rinfo: types.Resource):
+def _register_resource_bridge(
+    mcp: McpServer, session: Any, rinfo: types.Resource | types.ResourceTemplate,
+):
     uri_template = _get_resource_uri(rinfo)
     desc = rinfo.description or f"Bridged external resource '{uri_template}'"
+    template = UriTemplate(uri_template) if is_template(uri_template) else None
 
     async def bridged_resource(**kwargs):
-        from string import Template
-        t = Template(uri_template.replace("{", "${"))
-        actual_uri = t.substitute(**kwargs)
-        content, mime_type = await session.read_resource(actual_uri)
-        if isinstance(content, bytes):
-            return content.decode("utf-8", errors="replace")
-        return content
+        # テンプレートなら抽出済みの変数から URI を組み立て直す
+        actual_uri = template.expand(kwargs) if template else uri_template
+        # Text / Blob の contents をそのまま返す (バイナリをデコードしない)
+        result = await session.read_resource(actual_uri)
+        return list(result.contents)
 
     mcp.registry.register_resource(ResourceEntry(
         uri=uri_template,
         name=rinfo.name or uri_template,
         description=desc,
         fn=bridged_resource,
+        mime_type=rinfo.mimeType,
     ))
 
 
-def _register_prompt_bridge(mcp: McpServer, session: ClientSession, pinfo: types.Prompt):
+def _register_prompt_bridge(mcp: McpServer, session: Any, pinfo: types.Prompt):
     prompt_name = pinfo.name
     desc = pinfo.description or f"Bridged external prompt '{prompt_name}'"
 
@@ -0,0 +1,124 @@
+# File: app/bridge_manifest.py
+"""ブリッジのマニフェストキャッシュ。
+
+外部 MCP サーバーから取得した tools / resources / prompts の一覧を
+ローカルに保存しておき、次回起動時はサブプロセスを起動せずに即座に
+登録できるようにする。キャッシュキーは command / args / env (OS 環境変数
+マージ後)、HTTP 系なら url / headers のハッシュで、設定が変わればキャッシュは
+使われない。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List
+
+from mcp import types
+
+if TYPE_CHECKING:
+    from viyv_mcp.app.bridge_manager import BridgeConfig
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class BridgeManifest:
+    """キャッシュされた一覧 (1 ブリッジ分)"""
+
+    tools: List[types.Tool] = field(default_factory=list)
+    # リソーステンプレート (types.ResourceTemplate) も含む
+    resources: List[types.Resource | types.ResourceTemplate] = field(default_factory=list)
+    prompts: List[types.Prompt] = field(default_factory=list)
+    saved_at: float = 0.0
+
+
+def manifest_key(config: "BridgeConfig") -> str:
+    """command / args / env (HTTP 系は url / headers、module は module) から決まるキャッシュキー (sha256 hex)"""
+    if config.transport == "stdio":
+        params = config.server_params()
+        identity = {
+            "command": params.command,
+            "args": list(params.args),
+            "env": params.env or {},
+            "cwd": str(params.cwd) if params.cwd else None,
+        }
+    elif config.transport == "module":
+        identity = {"transport": "module", "module": config.module}
+    else:
+        identity = {
+            "transport": config.transport,
+            "url": config.url,
+            "headers": config.headers,
+        }
+    material = json.dumps(identity, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _manifest_path(cache_dir: str, config: "BridgeConfig") -> str:
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in config.name)
+    return os.path.join(cache_dir, f"{safe_name}-{manifest_key(config)[:16]}.json")
+
+
+def load_manifest(cache_dir: str, config: "BridgeConfig") -> BridgeManifest | None:
+    """キャッシュを読み込む。無い・壊れている・キー不一致なら None。"""
+    path = _manifest_path(cache_dir, config)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION or data.get("key") != manifest_key(config):
+            return None
+        return BridgeManifest(
+            tools=[types.Tool.model_validate(t) for t in data.get("tools", [])],
+            resources=[_load_resource(r) for r in data.get("resources", [])],
+            prompts=[types.Prompt.model_validate(p) for p in data.get("prompts", [])],
+            saved_at=float(data.get("saved_at", 0.0)),
+        )
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[{config.name}] Ignoring unreadable manifest {path}: {e}")
+        return None
+
+
+def _load_resource(data: dict) -> types.Resource | types.ResourceTemplate:
+    if "uriTemplate" in data:
+        return types.ResourceTemplate.model_validate(data)
+    return types.Resource.model_validate(data)
+
+
+def save_manifest(
+    cache_dir: str,
+    config: "BridgeConfig",
+    tools: List[types.Tool],
+    resources: List[types.Resource | types.ResourceTemplate],
+    prompts: List[types.Prompt],
+) -> None:
+    """一覧を (アトミックに) 保存する。失敗してもログのみ。"""
+
+    def _dump(items) -> list:
+        return [i.model_dump(mode="json", by_alias=True, exclude_none=True) for i in items]
+
+    data = {
+        "version": MANIFEST_VERSION,
+        "name": config.name,
+        "key": manifest_key(config),
+        "saved_at": time.time(),
+        "tools": _dump(tools),
+        "resources": _dump(resources),
+        "prompts": _dump(prompts),
+    }
+    path = _manifest_path(cache_dir, config)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".manifest-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"[{config.name}] Failed to save manifest {path}: {e}")
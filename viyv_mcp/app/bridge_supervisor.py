@@ -0,0 +1,136 @@
+# File: app/bridge_supervisor.py
+"""外部 MCP ブリッジのスーパーバイザー。
+
+一定間隔でブリッジを見回り、
+
+* アイドルなセッションに ping して応答しないインスタンスを切り離す
+* インスタンスが ``min_instances`` を下回ったブリッジを指数バックオフで再起動
+* 再起動後にツール一覧を再同期し (消えたツールは登録解除)、
+  ``notifications/tools/list_changed`` を送る
+
+全インスタンスが落ちている間は :class:`BridgeHandle` のサーキットが開き、
+呼び出しは待たされずに即座に MCP エラーになる。
+"""
+
+import asyncio
+import logging
+import time
+from typing import List
+
+from viyv_mcp.app.bridge_manager import BridgeHandle, _attach_bridge
+from viyv_mcp.app.config import Config
+from viyv_mcp.server import McpServer
+
+logger = logging.getLogger(__name__)
+
+
+class BridgeSupervisor:
+    """:class:`BridgeHandle` 群の死活監視と自動再起動を行う。
+
+    Parameters
+    ----------
+    interval : float
+        見回り間隔 (秒)。
+    ping_timeout : float
+        ping 応答の上限 (秒)。
+    backoff_base, backoff_max : float
+        再起動の待ち時間は ``backoff_base * 2**(失敗回数)`` を ``backoff_max``
+        で頭打ちにしたもの。
+    """
+
+    def __init__(
+        self,
+        mcp: McpServer,
+        handles: List[BridgeHandle],
+        *,
+        interval: float | None = None,
+        ping_timeout: float | None = None,
+        backoff_base: float = 1.0,
+        backoff_max: float | None = None,
+    ):
+        self._mcp = mcp
+        self.handles = handles
+        self.interval = interval if interval is not None else Config.BRIDGE_PING_INTERVAL
+        self.ping_timeout = (
+            ping_timeout if ping_timeout is not None else Config.BRIDGE_PING_TIMEOUT
+        )
+        self.backoff_base = backoff_base
+        self.backoff_max = (
+            backoff_max if backoff_max is not None else Config.BRIDGE_RESTART_BACKOFF_MAX
+        )
+        self._failures: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._loop(), name="viyv-bridge-supervisor")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check_once()
+            except Exception as e:
+                logger.error(f"Bridge supervisor error: {e}")
+
+    # --- 1 回分の見回り -------------------------------------------------------
+    async def check_once(self) -> None:
+        targets = [h for h in self.handles if h.state in ("ready", "failed")]
+        await asyncio.gather(*(self._check(h) for h in targets))
+
+    async def _check(self, handle: BridgeHandle) -> None:
+        if handle.state == "ready":
+            await handle.ping(self.ping_timeout)
+        if handle.state == "idle":
+            # lazy ブリッジのプロセスが落ちた: 次の呼び出しで起動する
+            return
+        if len(handle.instances) >= handle.config.min_instances:
+            return
+        now = time.monotonic()
+        if handle.retry_at is None:
+            # 初回検知: すぐに再起動を試みる
+            handle.retry_at = now
+        if now < handle.retry_at:
+            return
+        await self._restart(handle)
+
+    async def _restart(self, handle: BridgeHandle) -> None:
+        name = handle.name
+        was_down = handle.circuit_open
+        logger.info(f"[{name}] Restarting ({len(handle.instances)} instances alive)")
+        started = await handle.replenish()
+
+        if not started:
+            failures = self._failures.get(name, 0) + 1
+            self._failures[name] = failures
+            delay = min(self.backoff_base * 2 ** (failures - 1), self.backoff_max)
+            handle.retry_at = time.monotonic() + delay
+            logger.error(
+                f"[{name}] Restart failed ({handle.error}); next attempt in {delay:.1f}s"
+            )
+            return
+
+        if was_down:
+            try:
+                changed = await _attach_bridge(self._mcp, handle)
+            except Exception as e:
+                logger.error(f"[{name}] Re-sync failed: {e}")
+                changed = set()
+            if changed:
+                self._mcp.notify_list_changed(*changed)
+        self._failures.pop(name, None)
+        handle.retry_at = None
+        handle.restarts += 1
+        handle.state = "ready"
+        handle.error = None
+        handle.watch_idle()
+        logger.info(f"[{name}] Restarted ({len(handle.instances)} instances)")
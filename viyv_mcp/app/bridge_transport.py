@@ -0,0 +1,256 @@
+# File: app/bridge_transport.py
+"""ブリッジの接続方式 (トランスポート)。
+
+* ``stdio``: サブプロセスを起動して stdin/stdout で通信する (従来通り)
+* ``http``:  Streamable HTTP でリモートの MCP サーバーに接続する
+* ``sse``:   旧来の HTTP+SSE でリモートの MCP サーバーに接続する
+* ``module``: Python の MCP サーバー (``"pkg.server:app"``) を同じプロセスに
+  読み込み、anyio のメモリストリームで直結する (JSON 変換もパイプも無い)
+
+HTTP 系のブリッジは :class:`HttpConnectionPool` の keep-alive コネクション
+プールを共有する。ブリッジごとのヘッダー・タイムアウト・リトライは、
+プールの上に被せた軽量な httpx クライアントで設定する。
+
+各トランスポートの ``open(stack)`` は :class:`BridgeInstance` の runner
+タスク内で呼ばれ、``(read_stream, write_stream)`` を返す。後始末は
+渡された AsyncExitStack に登録する。
+"""
+
+import asyncio
+import importlib
+import logging
+import pathlib
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Tuple
+
+import anyio
+import httpx
+from mcp.client.sse import sse_client
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamable_http_client
+from mcp.server.lowlevel import Server as LowLevelServer
+from mcp.shared.memory import create_client_server_memory_streams
+
+from viyv_mcp.app.config import Config
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("stdio", "http", "sse", "module")
+
+# 接続確立前に失敗した (= リクエストは届いていない) のでリトライしてよいエラー
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+class StdioTransport:
+    """外部 MCP サーバーをサブプロセスとして起動する。"""
+
+    kind = "stdio"
+
+    def __init__(self, params: StdioServerParameters):
+        self.params = params
+
+    async def open(self, stack: AsyncExitStack) -> Tuple[Any, Any]:
+        cwd = self.params.cwd
+        # cwdが指定されていて存在しない場合は作成
+        if cwd and not pathlib.Path(cwd).exists():
+            logger.info(f"Creating working directory: {cwd}")
+            pathlib.Path(cwd).mkdir(parents=True, exist_ok=True)
+        read_stream, write_stream = await stack.enter_async_context(stdio_client(self.params))
+        return read_stream, write_stream
+
+
+class HttpConnectionPool:
+    """HTTP ブリッジ全体で共有する keep-alive コネクションプール。
+
+    上限は ``Config.BRIDGE_HTTP_MAX_CONNECTIONS`` /
+    ``BRIDGE_HTTP_MAX_KEEPALIVE`` / ``BRIDGE_HTTP_KEEPALIVE_EXPIRY``。
+    実体 (httpx.AsyncHTTPTransport) は最初の接続時に作る。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int | None = None,
+        max_keepalive: int | None = None,
+        keepalive_expiry: float | None = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=(
+                max_connections if max_connections is not None
+                else Config.BRIDGE_HTTP_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=(
+                max_keepalive if max_keepalive is not None
+                else Config.BRIDGE_HTTP_MAX_KEEPALIVE
+            ),
+            keepalive_expiry=(
+                keepalive_expiry if keepalive_expiry is not None
+                else Config.BRIDGE_HTTP_KEEPALIVE_EXPIRY
+            ),
+        )
+        self._transport: httpx.AsyncHTTPTransport | None = None
+
+    @property
+    def transport(self) -> httpx.AsyncHTTPTransport:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(limits=self.limits)
+        return self._transport
+
+    def client(
+        self,
+        *,
+        headers: Dict[str, str] | None = None,
+        timeout: float = 30.0,
+        sse_read_timeout: float = 300.0,
+        retries: int = 0,
+    ) -> httpx.AsyncClient:
+        """プールを共有するブリッジ用クライアント。閉じてもプールは閉じない。"""
+        return httpx.AsyncClient(
+            transport=_RetryingTransport(self.transport, retries),
+            headers=headers,
+            timeout=httpx.Timeout(timeout, read=sse_read_timeout),
+        )
+
+    async def aclose(self) -> None:
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            await transport.aclose()
+
+
+class _RetryingTransport(httpx.AsyncBaseTransport):
+    """共有プールへ委譲し、接続確立の失敗だけを指数バックオフでリトライする。"""
+
+    def __init__(self, pool: httpx.AsyncBaseTransport, retries: int, backoff: float = 0.1):
+        self._pool = pool
+        self._retries = max(0, retries)
+        self._backoff = backoff
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                return await self._pool.handle_async_request(request)
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= self._retries:
+                    raise
+                delay = self._backoff * 2 ** attempt
+                attempt += 1
+                logger.debug(
+                    f"{request.method} {request.url} failed ({e!r}); "
+                    f"retry {attempt}/{self._retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        # プールは HttpConnectionPool の持ち主が閉じる
+        pass
+
+
+class HttpTransport:
+    """リモート MCP サーバーに Streamable HTTP (または SSE) で接続する。"""
+
+    def __init__(
+        self,
+        url: str,
+        pool: HttpConnectionPool,
+        *,
+        kind: str = "http",
+        headers: Dict[str, str] | None = None,
+        timeout: float = 30.0,
+        sse_read_timeout: float = 300.0,
+        retries: int = 0,
+    ):
+        self.kind = kind
+        self.url = url
+        self._pool = pool
+        self._headers = headers or {}
+        self._timeout = timeout
+        self._sse_read_timeout = sse_read_timeout
+        self._retries = retries
+
+    async def open(self, stack: AsyncExitStack) -> Tuple[Any, Any]:
+        client = self._pool.client(
+            headers=self._headers,
+            timeout=self._timeout,
+            sse_read_timeout=self._sse_read_timeout,
+            retries=self._retries,
+        )
+        if self.kind == "sse":
+            read_stream, write_stream = await stack.enter_async_context(
+                sse_client(
+                    self.url,
+                    headers=self._headers,
+                    timeout=self._timeout,
+                    sse_read_timeout=self._sse_read_timeout,
+                    httpx_client_factory=lambda **_: client,
+                )
+            )
+            return read_stream, write_stream
+        await stack.enter_async_context(client)
+        read_stream, write_stream, _ = await stack.enter_async_context(
+            streamable_http_client(self.url, http_client=client)
+        )
+        return read_stream, write_stream
+
+
+def load_server_object(spec: str) -> LowLevelServer:
+    """``"pkg.module:attr"`` から低レベル ``Server`` を取り出す。
+
+    ``attr`` は ``mcp.server.lowlevel.Server``、それを ``low_level_server``
+    (viyv_mcp の McpServer) / ``_mcp_server`` (FastMCP) として持つオブジェクト、
+    またはそれらを返す引数なしのファクトリのいずれか。
+    """
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"Invalid module spec '{spec}' (expected 'pkg.module:attr')")
+    obj: Any = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    if not isinstance(obj, LowLevelServer) and callable(obj) and not _wraps_server(obj):
+        obj = obj()
+    for wrapper_attr in ("low_level_server", "_mcp_server"):
+        if not isinstance(obj, LowLevelServer) and hasattr(obj, wrapper_attr):
+            obj = getattr(obj, wrapper_attr)
+    if not isinstance(obj, LowLevelServer):
+        raise TypeError(f"'{spec}' is not an MCP server (got {type(obj).__name__})")
+    return obj
+
+
+def _wraps_server(obj: Any) -> bool:
+    return hasattr(obj, "low_level_server") or hasattr(obj, "_mcp_server")
+
+
+class InProcessTransport:
+    """同じプロセス内の MCP サーバーにメモリストリームで接続する。
+
+    サーバーは ``open`` のたびに新しいセッションとして ``Server.run`` を
+    起動する (1 つの Server オブジェクトを複数インスタンスで共有してよい)。
+    サーバー側の処理はこのイベントループ上で動くので、ブロッキングな
+    ツールはスレッドに逃がしておく必要がある。
+    """
+
+    kind = "module"
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self._server: LowLevelServer | None = None
+
+    async def open(self, stack: AsyncExitStack) -> Tuple[Any, Any]:
+        if self._server is None:
+            self._server = load_server_object(self.spec)
+        server = self._server
+        client_streams, server_streams = await stack.enter_async_context(
+            create_client_server_memory_streams()
+        )
+        tg = await stack.enter_async_context(anyio.create_task_group())
+        tg.start_soon(
+            lambda: server.run(
+                server_streams[0],
+                server_streams[1],
+                server.create_initialization_options(),
+                raise_exceptions=False,
+            )
+        )
+        # 終了時はサーバー側のタスクを先に止める (LIFO)
+        stack.callback(tg.cancel_scope.cancel)
+        return client_streams
@@ -8,11 +8,63 @@ class Config:
     # 外部MCPサーバーの設定ファイルを格納するディレクトリ
     # プロジェクト構成にあわせて好きなパスを指定
     BRIDGE_CONFIG_DIR = os.getenv("BRIDGE_CONFIG_DIR", "app/mcp_server_configs")
+    # 同時に起動する外部MCPサーバーの上限 (1 = 従来通り逐次起動)
+    BRIDGE_STARTUP_CONCURRENCY = int(os.getenv("BRIDGE_STARTUP_CONCURRENCY", "8"))
+    # "blocking": 全ブリッジの起動を待ってからリクエスト受付
+    # "background": ローカルツールを即座に提供し、ブリッジは裏で接続
+    #               (接続完了ごとに notifications/tools/list_changed を送信)
+    BRIDGE_ATTACH_MODE = os.getenv("BRIDGE_ATTACH_MODE", "blocking").lower()
+    # ブリッジの tools/resources/prompts 一覧のキャッシュ先 (空 = 無効)
+    # キャッシュがあるブリッジは起動時に即座に登録され、最初の呼び出しで起動する
+    BRIDGE_MANIFEST_DIR = os.getenv("BRIDGE_MANIFEST_DIR", "")
+    # "lifecycle": "lazy" のブリッジをこの秒数アイドルで停止する既定値 (0 = 停止しない)
+    BRIDGE_IDLE_TIMEOUT = float(os.getenv("BRIDGE_IDLE_TIMEOUT", "600"))
+    # "transport": "http" / "sse" のブリッジが共有する HTTP コネクションプール
+    BRIDGE_HTTP_MAX_CONNECTIONS = int(os.getenv("BRIDGE_HTTP_MAX_CONNECTIONS", "100"))
+    BRIDGE_HTTP_MAX_KEEPALIVE = int(os.getenv("BRIDGE_HTTP_MAX_KEEPALIVE", "20"))
+    BRIDGE_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("BRIDGE_HTTP_KEEPALIVE_EXPIRY", "30"))
+    # 接続確立に失敗したときのリトライ回数 (ブリッジごとに "retries" で上書き可)
+    BRIDGE_HTTP_RETRIES = int(os.getenv("BRIDGE_HTTP_RETRIES", "2"))
+    # ブリッジの死活監視 (ping 間隔 0 = 監視・自動再起動しない)
+    BRIDGE_PING_INTERVAL = float(os.getenv("BRIDGE_PING_INTERVAL", "30"))
+    BRIDGE_PING_TIMEOUT = float(os.getenv("BRIDGE_PING_TIMEOUT", "5"))
+    BRIDGE_RESTART_BACKOFF_MAX = float(os.getenv("BRIDGE_RESTART_BACKOFF_MAX", "300"))
 
     # WebSocket Bridge settings
     WS_BRIDGE_ENABLED = os.getenv("WS_BRIDGE_ENABLED", "true").lower() in ("true", "1", "yes")
     RELAY_KEY_TTL_HOURS = float(os.getenv("RELAY_KEY_TTL_HOURS", "24"))
     RELAY_KEY_STORAGE = os.getenv("RELAY_KEY_STORAGE", "data/relay_keys.json")
+    # リレーキーを指定しない呼び出しを、接続中の拡張機能が 1 つだけならそこへ送る
+    RELAY_KEY_FALLBACK = os.getenv("RELAY_KEY_FALLBACK", "true").lower() in ("true", "1", "yes")
+    # 分割 (chunked) で届くツール結果のバッファ上限: 接続ごと / サーバー全体 (バイト)
+    RELAY_RESULT_SESSION_MAX_BYTES = int(os.getenv("RELAY_RESULT_SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+    RELAY_RESULT_TOTAL_MAX_BYTES = int(os.getenv("RELAY_RESULT_TOTAL_MAX_BYTES", str(256 * 1024 * 1024)))
+    # ブラウザツール呼び出しの期限 (秒, 0 = 無期限) とツールごとの上書き (JSON: {"navigate": 60})
+    RELAY_TOOL_TIMEOUT = float(os.getenv("RELAY_TOOL_TIMEOUT", "300"))
+    RELAY_TOOL_TIMEOUTS = os.getenv("RELAY_TOOL_TIMEOUTS", "")
+    # マルチワーカー時にリレー呼び出しを転送し合う共有ディレクトリ (空 = 無効)
+    RELAY_IPC_DIR = os.getenv("RELAY_IPC_DIR", "")
+
+    # 同期 (def) ツールの実行先: "thread" (ワーカースレッド) / "inline" (イベントループ上)
+    TOOL_DEFAULT_EXECUTOR = os.getenv("TOOL_DEFAULT_EXECUTOR", "thread").lower()
+    TOOL_THREAD_POOL_SIZE = int(
+        os.getenv("TOOL_THREAD_POOL_SIZE", str(min(32, (os.cpu_count() or 1) + 4)))
+    )
+    # executor="process" ツール用のワーカープロセス設定
+    TOOL_PROCESS_POOL_SIZE = int(os.getenv("TOOL_PROCESS_POOL_SIZE", str(os.cpu_count() or 1)))
+    TOOL_PROCESS_MAX_CALLS = int(os.getenv("TOOL_PROCESS_MAX_CALLS", "1000"))  # 0 = 再生成しない
+    TOOL_SHM_THRESHOLD_BYTES = int(os.getenv("TOOL_SHM_THRESHOLD_BYTES", str(64 * 1024)))
+    # 同時実行数の上限 (JSON: {"グループ名 / namespace": N または {"max": N, "queue": Q, "timeout": 秒}})
+    TOOL_GROUP_CONCURRENCY = os.getenv("TOOL_GROUP_CONCURRENCY", "")
+    TOOL_NAMESPACE_CONCURRENCY = os.getenv("TOOL_NAMESPACE_CONCURRENCY", "")
+    # 上限に達したときの待ち行列の長さ (0 = 即座に拒否) と最大待ち時間 (秒, 0 = 無制限) の既定値
+    TOOL_QUEUE_MAX = int(os.getenv("TOOL_QUEUE_MAX", "64"))
+    TOOL_QUEUE_TIMEOUT = float(os.getenv("TOOL_QUEUE_TIMEOUT", "30"))
+
+    # resources/read 1 回で返せるバイナリの上限 (超える場合は ?bytes=START-END で分割取得, 0 = 無制限)
+    RESOURCE_MAX_INLINE_BYTES = int(os.getenv("RESOURCE_MAX_INLINE_BYTES", str(16 * 1024 * 1024)))
+    # 変更のないファイルリソースのエンコード結果を保持するキャッシュの上限 (バイト)
+    RESOURCE_BLOB_CACHE_BYTES = int(os.getenv("RESOURCE_BLOB_CACHE_BYTES", str(64 * 1024 * 1024)))
 
     # stateless_http オプション (環境変数から読み込み)
     # "true", "1", "yes" などは True として扱う
@@ -6,7 +6,7 @@ MCP / Relay MCP / 外部ブリッジ / WebSocket セッションの
 """
 import logging
 from contextlib import asynccontextmanager
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +22,7 @@ def compose_lifespan(
     bridges_startup: Callable[[], Awaitable[None]],
     bridges_shutdown: Callable[[], Awaitable[None]],
     ws_bridge_hub: Any | None,
+    shutdown_hooks: Sequence[Callable[[], Awaitable[None]]] = (),
 ) -> Callable:
     """MCP → Relay → Bridge → WS cleanup のネストされた lifespan を構築する。
 
@@ -32,6 +33,9 @@ def compose_lifespan(
         ``mcp_http_app.router.lifespan_context`` から取得したものを渡す。
     relay_lifespan : same, or None
         Relay MCP 用。WS ブリッジ無効時は None。
+    shutdown_hooks : sequence of async callables
+        ブリッジ終了後に順に実行される (監査ログの drain など)。
+        例外はログに残して後続のフックを継続する。
     """
     _mcp_ls = mcp_lifespan or _noop_lifespan
     _relay_ls = relay_lifespan
@@ -54,6 +58,14 @@ def compose_lifespan(
                             await session.close()
                         logger.info("ViyvMCP: WebSocket bridge sessions closed")
                     # ⑤ 外部ブリッジ終了
-                    await bridges_shutdown()
+                    try:
+                        await bridges_shutdown()
+                    finally:
+                        # ⑥ 追加のシャットダウンフック
+                        for hook in shutdown_hooks:
+                            try:
+                                await hook()
+                            except Exception as exc:
+                                logger.error(f"Shutdown hook failed: {exc}")
 
     return lifespan
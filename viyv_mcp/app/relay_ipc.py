@@ -0,0 +1,309 @@
+"""Cross-worker relay IPC -- forwards relay tool calls to the worker owning the key.
+
+With several workers (``gunicorn -w N``), a Chrome extension's WebSocket is
+held by one worker while ``/relay/mcp`` requests land on any of them.  Every
+worker sharing ``RELAY_IPC_DIR`` listens on its own Unix socket
+(``worker-<pid>.sock``) and publishes each relay key it holds as
+``keys/<sha256(key)>``, a file containing the owner's socket path.  A worker
+without the session looks the key up there and forwards the call.
+
+Frames are a 4-byte big-endian length followed by a JSON object:
+
+* request:  ``{"key_id": ..., "tool": ..., "arguments": {...}}``
+* response: ``{"result": <CallToolResult>}`` or ``{"error": {"code", "message"}}``
+
+Keys are only stored as digests, and the directory (sockets included) is
+kept at mode 0700.  Frames are capped at ``max_frame_bytes``; a result over
+the cap comes back as an error instead.  An ownership file left behind by a
+crashed worker is removed once its socket refuses connections, either when
+a call is forwarded there or when the keys are listed.  A forwarded call is
+cancelled on the owner when the forwarding worker closes the connection
+early.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+from typing import Awaitable, Callable
+
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, ErrorData
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>I')
+
+# key_id, tool name, arguments -> result of the local session
+LocalCall = Callable[[str, str, dict], Awaitable[CallToolResult]]
+
+
+def key_id(key: str) -> str:
+    """Digest under which a relay key is published."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _encode_frame(payload: dict, limit: int) -> bytes:
+    data = json.dumps(payload, separators=(',', ':')).encode()
+    if len(data) > limit:
+        raise ValueError(f"{len(data)} bytes exceeds the relay IPC frame limit ({limit} bytes)")
+    return _HEADER.pack(len(data)) + data
+
+
+async def _send_frame(writer: asyncio.StreamWriter, frame: bytes) -> None:
+    writer.write(frame)
+    await writer.drain()
+
+
+async def _read_frame(reader: asyncio.StreamReader, limit: int) -> dict:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > limit:
+        raise ValueError(f"{size} bytes exceeds the relay IPC frame limit ({limit} bytes)")
+    return json.loads(await reader.readexactly(size))
+
+
+class RelayIpc:
+    """One worker's endpoint in the shared relay IPC directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        name: str | None = None,
+        connect_timeout: float = 5.0,
+        max_frame_bytes: int = 64 * 1024 * 1024,
+        owner_check_interval: float = 30.0,
+    ) -> None:
+        self._dir = os.path.abspath(directory)
+        self._keys_dir = os.path.join(self._dir, 'keys')
+        self._socket_path = os.path.join(self._dir, f'{name or f"worker-{os.getpid()}"}.sock')
+        self._connect_timeout = connect_timeout
+        self._max_frame_bytes = max_frame_bytes
+        self._owner_check_interval = owner_check_interval
+        self._server: asyncio.AbstractServer | None = None
+        self._published: set[str] = set()
+        # owner socket path -> monotonic time it last accepted a connection
+        self._live_owners: dict[str, float] = {}
+
+    @property
+    def socket_path(self) -> str:
+        return self._socket_path
+
+    @property
+    def started(self) -> bool:
+        return self._server is not None
+
+    async def start(self, local_call: LocalCall) -> None:
+        """Listen for calls forwarded by other workers."""
+        # makedirs' mode is filtered by the umask and ignored for an existing
+        # directory, so enforce 0700 on the shared directory explicitly
+        os.makedirs(self._dir, mode=0o700, exist_ok=True)
+        os.chmod(self._dir, 0o700)
+        os.makedirs(self._keys_dir, mode=0o700, exist_ok=True)
+        os.chmod(self._keys_dir, 0o700)
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)  # left over from a previous process
+
+        limit = self._max_frame_bytes
+
+        async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                request = await _read_frame(reader, limit)
+                call = asyncio.ensure_future(local_call(
+                    request['key_id'], request['tool'], request.get('arguments') or {},
+                ))
+                # The forwarding worker closes the connection when its caller
+                # is cancelled; stop the call (and the browser work) then too
+                hangup = asyncio.ensure_future(reader.read(1))
+                await asyncio.wait({call, hangup}, return_when=asyncio.FIRST_COMPLETED)
+                if not call.done():
+                    call.cancel()
+                    await asyncio.gather(call, return_exceptions=True)
+                    return
+                hangup.cancel()
+                try:
+                    result = call.result()
+                    response = {'result': result.model_dump(mode='json', by_alias=True)}
+                except McpError as e:
+                    response = {'error': {'code': e.error.code, 'message': e.error.message}}
+                except asyncio.CancelledError:  # the extension disconnected
+                    response = {'error': {'code': -32000, 'message': 'Tool call cancelled'}}
+                except Exception as e:
+                    response = {'error': {'code': -32000, 'message': str(e)}}
+                try:
+                    frame = _encode_frame(response, limit)
+                except ValueError as e:
+                    frame = _encode_frame({'error': {
+                        'code': -32000,
+                        'message': f"Tool result of '{request['tool']}' is too large to forward: {e}",
+                    }}, limit)
+                await _send_frame(writer, frame)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass  # the forwarding worker went away
+            except Exception as e:
+                logger.error(f"[relay-ipc] Failed to serve forwarded call: {e}")
+            finally:
+                writer.close()
+
+        self._server = await asyncio.start_unix_server(serve, path=self._socket_path)
+        os.chmod(self._socket_path, 0o600)
+        logger.info(f"[relay-ipc] Listening on {self._socket_path}")
+
+    async def close(self) -> None:
+        for kid in list(self._published):
+            self._withdraw_id(kid)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            os.unlink(self._socket_path)
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------ #
+    #  Ownership                                                          #
+    # ------------------------------------------------------------------ #
+    def publish(self, key: str) -> None:
+        """Announce that this worker holds *key*."""
+        kid = key_id(key)
+        path = os.path.join(self._keys_dir, kid)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self._socket_path)
+        os.replace(tmp, path)
+        self._published.add(kid)
+
+    def withdraw(self, key: str) -> None:
+        self._withdraw_id(key_id(key))
+
+    def _withdraw_id(self, kid: str) -> None:
+        self._published.discard(kid)
+        # Only remove the file if it still names us (the key may have
+        # reconnected to another worker meanwhile)
+        if self._owner(kid) == self._socket_path:
+            self._remove(kid)
+
+    def _owner(self, kid: str) -> str | None:
+        try:
+            with open(os.path.join(self._keys_dir, kid)) as f:
+                return f.read().strip() or None
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def _remove(self, kid: str) -> None:
+        try:
+            os.unlink(os.path.join(self._keys_dir, kid))
+        except FileNotFoundError:
+            pass
+
+    def _scan(self) -> dict[str, str]:
+        """key digest -> owner socket path for every published key."""
+        try:
+            names = os.listdir(self._keys_dir)
+        except FileNotFoundError:
+            return {}
+        owners = {}
+        for name in names:
+            if name.endswith('.tmp'):
+                continue
+            owner = self._owner(name)
+            if owner is not None:
+                owners[name] = owner
+        return owners
+
+    def _prune(self, stale: dict[str, str]) -> None:
+        for kid, owner in stale.items():
+            if self._owner(kid) == owner:
+                self._remove(kid)
+
+    async def _owner_alive(self, owner: str) -> bool:
+        """Whether *owner* still accepts connections (checked at most every
+        ``owner_check_interval`` seconds while it does)."""
+        if owner == self._socket_path:
+            return True
+        now = time.monotonic()
+        if now - self._live_owners.get(owner, float('-inf')) < self._owner_check_interval:
+            return True
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(owner), timeout=self._connect_timeout,
+            )
+        except (FileNotFoundError, ConnectionRefusedError):
+            self._live_owners.pop(owner, None)
+            return False
+        except (OSError, asyncio.TimeoutError):
+            return True  # busy or unreachable for now; not proof that it died
+        writer.close()
+        self._live_owners[owner] = now
+        return True
+
+    async def published_ids(self) -> list[str]:
+        """Digests of every key held by a live worker.
+
+        The directory is read off the event loop.  Keys whose owner socket
+        refuses connections are left by crashed workers and are removed.
+        """
+        owners = await asyncio.to_thread(self._scan)
+        distinct = list(set(owners.values()))
+        alive = dict(zip(distinct, await asyncio.gather(*map(self._owner_alive, distinct))))
+        stale = {kid: owner for kid, owner in owners.items() if not alive[owner]}
+        if stale:
+            logger.warning(f"[relay-ipc] Dropping {len(stale)} key(s) of workers that are gone")
+            await asyncio.to_thread(self._prune, stale)
+        return [kid for kid in owners if kid not in stale]
+
+    # ------------------------------------------------------------------ #
+    #  Forwarding                                                         #
+    # ------------------------------------------------------------------ #
+    async def forward(self, kid: str, tool_name: str, arguments: dict | None) -> CallToolResult | None:
+        """Run the call on the worker owning *kid*.
+
+        Returns ``None`` when no other worker holds the key.
+        """
+        owner = self._owner(kid)
+        if owner is None or owner == self._socket_path:
+            return None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(owner), timeout=self._connect_timeout,
+            )
+        except (FileNotFoundError, ConnectionRefusedError):
+            logger.warning(f"[relay-ipc] Owner {owner} is gone, dropping key {kid[:8]}")
+            self._live_owners.pop(owner, None)
+            if self._owner(kid) == owner:
+                self._remove(kid)
+            return None
+        except asyncio.TimeoutError:
+            # A slow accept is not proof that the owner died; keep its key
+            raise McpError(ErrorData(
+                code=-32000,
+                message=f"Relay worker did not accept the call within {self._connect_timeout}s",
+            ))
+        self._live_owners[owner] = time.monotonic()
+        try:
+            await _send_frame(writer, _encode_frame(
+                {'key_id': kid, 'tool': tool_name, 'arguments': arguments or {}},
+                self._max_frame_bytes,
+            ))
+            response = await _read_frame(reader, self._max_frame_bytes)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            raise McpError(ErrorData(
+                code=-32000, message=f"Relay worker connection lost: {e}",
+            ))
+        except ValueError as e:
+            raise McpError(ErrorData(
+                code=-32000, message=f"Cannot forward '{tool_name}': {e}",
+            ))
+        finally:
+            writer.close()
+        if 'error' in response:
+            raise McpError(ErrorData(
+                code=response['error'].get('code', -32000),
+                message=response['error'].get('message', 'Unknown error'),
+            ))
+        return CallToolResult.model_validate(response['result'])
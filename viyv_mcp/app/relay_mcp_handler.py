@@ -2,15 +2,24 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from viyv_mcp.server import McpServer
 from mcp import types
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
 
-from viyv_mcp.app.bridge_manager import _register_tool_bridge
+from viyv_mcp.app.bridge_manager import _register_tool_bridge, unregister_bridged_tools
+from viyv_mcp.app.relay_ipc import RelayIpc, key_id
+from viyv_mcp.app.security.context import get_agent_identity
 from viyv_mcp.app.ws_bridge_session import WebSocketBridgeSession
 
 logger = logging.getLogger(__name__)
 
+# ASGI scope key set by ViyvMCP for /relay/mcp/{key} requests
+RELAY_KEY_SCOPE = 'viyv.relay_key'
+RELAY_KEY_HEADER = 'X-Relay-Key'
+
 # Browser tools provided by viyv-browser Chrome extension
 # These match the tool names registered in the extension's tool-handlers.ts
 BROWSER_TOOLS = [
@@ -602,12 +611,12 @@ BROWSER_TOOLS = [
 ]
 
 
-def register_browser_tools_for_session(
+def register_browser_tools(
     mcp: McpServer,
-    session: WebSocketBridgeSession,
+    backend: Any,
     tags: set[str] | None = None,
 ) -> list[str]:
-    """Register all browser tools backed by the given WS session.
+    """Register all browser tools, forwarding calls to ``backend.call_tool``.
 
     Returns list of registered tool names.
     """
@@ -621,10 +630,213 @@ def register_browser_tools_for_session(
             inputSchema=tool_def.get('inputSchema', {}),
         )
         _register_tool_bridge(
-            mcp, session, tool_info, tag_set, 'Browser',
+            mcp, backend, tool_info, tag_set, 'Browser',
             cfg_namespace='browser', cfg_security_level=1,
         )
         registered.append(tool_def['name'])
+    return registered
+
+
+def register_browser_tools_for_session(
+    mcp: McpServer,
+    session: WebSocketBridgeSession,
+    tags: set[str] | None = None,
+) -> list[str]:
+    """Register all browser tools backed by the given WS session.
 
+    Returns list of registered tool names.
+    """
+    registered = register_browser_tools(mcp, session, tags)
     logger.info(f"[relay:{session.key_prefix}] Registered {len(registered)} browser tools")
     return registered
+
+
+# --------------------------------------------------------------------------- #
+# Per-key routing                                                             #
+# --------------------------------------------------------------------------- #
+def split_relay_path(path: str) -> tuple[str | None, str]:
+    """Split the path below ``/relay/mcp`` into ``(relay_key, mcp_path)``.
+
+    ``/<key>`` selects the tenant; ``/`` (or an empty path) carries no key.
+    """
+    segment = path.strip('/')
+    if not segment:
+        return None, '/'
+    key, _, rest = segment.partition('/')
+    return key, '/' + rest
+
+
+class RelaySessionRouter:
+    """Routes relay tool calls to the WS session that owns the caller's key.
+
+    The browser tools are registered once on the relay ``McpServer`` (while
+    at least one extension is connected) with the router itself as their
+    backend; each call is dispatched to ``sessions[key]``.  The key comes
+    from, in order:
+
+    * the request path ``/relay/mcp/{key}``
+    * the ``X-Relay-Key`` header
+    * the ``relay_key`` claim of the caller's JWT
+
+    With ``fallback`` set, a call without a key goes to the only connected
+    session, as a single-tenant relay always did.
+
+    With an :class:`~viyv_mcp.app.relay_ipc.RelayIpc`, keys held by other
+    worker processes are forwarded to their owner, and the tools stay
+    registered from :meth:`start` on so that every worker lists the same
+    tools whichever of them holds the extensions.
+    """
+
+    def __init__(
+        self,
+        mcp: McpServer,
+        tags: set[str] | None = None,
+        *,
+        fallback: bool = True,
+        ipc: RelayIpc | None = None,
+    ) -> None:
+        self._mcp = mcp
+        self._tags = tags or {'browser', 'relay'}
+        self._fallback = fallback
+        self._ipc = ipc
+        # key -> session
+        self._sessions: dict[str, WebSocketBridgeSession] = {}
+        # key_id(key) -> key, for calls forwarded by other workers
+        self._ids: dict[str, str] = {}
+        self._tool_names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def tool_names(self) -> list[str]:
+        return list(self._tool_names)
+
+    async def start(self) -> None:
+        """Join the IPC directory (no-op without IPC)."""
+        if self._ipc is None:
+            return
+        await self._ipc.start(self._call_local)
+        self._register_tools()
+        for key in self._sessions:
+            self._ipc.publish(key)
+
+    async def close(self) -> None:
+        if self._ipc is not None:
+            await self._ipc.close()
+
+    def _register_tools(self) -> None:
+        if not self._tool_names:
+            self._tool_names = register_browser_tools(self._mcp, self, self._tags)
+            logger.info(
+                f"[relay] Registered {len(self._tool_names)} shared browser tools"
+            )
+
+    def attach(self, key: str, session: WebSocketBridgeSession) -> None:
+        """Route calls carrying *key* to *session* (registers the tools once)."""
+        self._sessions[key] = session
+        self._ids[key_id(key)] = key
+        if self._ipc is not None and self._ipc.started:
+            self._ipc.publish(key)
+        self._register_tools()
+        logger.info(
+            f"[relay:{session.key_prefix}] Routed ({len(self._sessions)} connected)"
+        )
+
+    def detach(self, key: str, session: WebSocketBridgeSession) -> None:
+        """Stop routing *key*; the tools go away with the last session."""
+        if self._sessions.get(key) is not session:
+            return  # already replaced by a newer connection for the key
+        del self._sessions[key]
+        self._ids.pop(key_id(key), None)
+        if self._ipc is not None:
+            self._ipc.withdraw(key)
+            return  # the tools stay listed while other workers may hold keys
+        if not self._sessions and self._tool_names:
+            unregister_bridged_tools(self._mcp, self._tool_names)
+            logger.info(
+                f"[relay] Unregistered {len(self._tool_names)} browser tools "
+                f"(no extension connected)"
+            )
+            self._tool_names = []
+
+    def session_for(self, key: str) -> WebSocketBridgeSession | None:
+        return self._sessions.get(key)
+
+    def current_key(self) -> str | None:
+        """Relay key of the request being handled, or ``None``."""
+        try:
+            request = self._mcp.low_level_server.request_context.request
+        except LookupError:
+            request = None
+        if request is not None:
+            key = request.scope.get(RELAY_KEY_SCOPE) or request.headers.get(RELAY_KEY_HEADER)
+            if key:
+                return key
+        agent = get_agent_identity()
+        if agent is not None and agent.relay_key:
+            return agent.relay_key
+        return None
+
+    def _progress_reporter(self):
+        """Send MCP progress for the current call, if the client asked for it."""
+        try:
+            ctx = self._mcp.low_level_server.request_context
+        except LookupError:
+            return None
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is None:
+            return None
+
+        async def report(received: float, total: float | None) -> None:
+            await ctx.session.send_progress_notification(
+                token, received, total,
+                message=f"Received {int(received)} bytes from the browser",
+                related_request_id=str(ctx.request_id),
+            )
+
+        return report
+
+    async def _call_local(self, kid: str, tool_name: str, arguments: dict):
+        """Serve a call forwarded by another worker."""
+        session = self._sessions.get(self._ids.get(kid, ''))
+        if session is None:
+            raise McpError(ErrorData(
+                code=-32000, message='No browser extension connected for this relay key',
+            ))
+        return await session.call_tool(tool_name, arguments=arguments)
+
+    async def _only_key_id(self) -> str | None:
+        """Digest of the only connected key (across workers), if exactly one."""
+        if self._ipc is not None:
+            published = await self._ipc.published_ids()
+            return published[0] if len(published) == 1 else None
+        if len(self._sessions) == 1:
+            return key_id(next(iter(self._sessions)))
+        return None
+
+    async def call_tool(self, tool_name: str, arguments: dict | None = None):
+        key = self.current_key()
+        kid = key_id(key) if key else (await self._only_key_id() if self._fallback else None)
+        if kid is None:
+            raise McpError(ErrorData(
+                code=-32602,
+                message=(
+                    'Relay key required: use /relay/mcp/{key}, the '
+                    f'{RELAY_KEY_HEADER} header or a relay_key JWT claim'
+                ),
+            ))
+        local_key = self._ids.get(kid)
+        if local_key is not None:
+            return await self._sessions[local_key].call_tool(
+                tool_name, arguments=arguments, progress=self._progress_reporter(),
+            )
+        if self._ipc is not None:
+            result = await self._ipc.forward(kid, tool_name, arguments)
+            if result is not None:
+                return result
+        prefix = (key[:8] if len(key) >= 8 else key) if key else kid[:8]
+        raise McpError(ErrorData(
+            code=-32000,
+            message=f"No browser extension connected for relay key {prefix}...",
+        ))
@@ -13,7 +13,11 @@ from typing import TYPE_CHECKING, Any
 
 from viyv_mcp.app.security.context import set_agent_identity
 from viyv_mcp.app.security.domain.models import AuthMode, ToolMetadataProvider
-from viyv_mcp.app.security.infrastructure.audit_writer import setup_audit_logger
+from viyv_mcp.app.security.infrastructure.audit_writer import (
+    AuditSink,
+    get_audit_logger,
+    setup_audit_logger,
+)
 from viyv_mcp.app.security.infrastructure.config_loader import (
     SecurityConfig,
     load_security_config,
@@ -33,6 +37,10 @@ class SecurityLayer:
     def __init__(self, service: SecurityService) -> None:
         self.service = service
 
+    def close(self) -> None:
+        """Drain pending audit records (call from the lifespan shutdown)."""
+        self.service.close()
+
     def wrap_asgi(self, app: ASGIApp) -> ASGIApp:
         """Wrap *app* with the JWT-extracting ASGI layer (HTTP only)."""
         from viyv_mcp.app.security.asgi_jwt_extractor import JWTExtractorMiddleware
@@ -71,8 +79,22 @@ def create_security_layer(
 
         tool_registry = McpRegistry()
 
-    audit_logger = setup_audit_logger(config.audit_log_path)
-    service = SecurityService(config, tool_registry, audit_logger)
+    audit_sink = AuditSink(
+        config.audit_log_path,
+        batch_size=config.audit_batch_size,
+        flush_interval=config.audit_flush_interval,
+        max_bytes=config.audit_max_bytes,
+        rotate_interval=config.audit_rotate_interval,
+        backup_count=config.audit_backup_count,
+        fsync=config.audit_fsync,
+        sample_allowed=config.audit_sample_allowed,
+        # Without a file, records go to the (stderr) audit logger; with one,
+        # handlers attached to the audit logger still receive every record
+        logger=(
+            get_audit_logger() if config.audit_log_path else setup_audit_logger(None)
+        ),
+    )
+    service = SecurityService(config, tool_registry, audit_sink)
 
     # 4. stdio JWT (process-scoped identity)
     stdio_jwt = os.environ.get("VIYV_MCP_JWT")
@@ -2,6 +2,8 @@
 and stores the resulting :class:`AgentIdentity` in a :class:`ContextVar`.
 
 This layer does **not** perform authorization — it only establishes identity.
+Verified tokens are memoized in :attr:`SecurityService.token_cache`, so a
+client re-sending the same bearer token costs a hash lookup.
 The MCP protocol handlers in :class:`~viyv_mcp.server.mcp_server.McpServer`
 handle all authorization decisions.
 """
@@ -34,7 +36,7 @@ class JWTExtractorMiddleware:
             token = self._extract_bearer(scope.get("headers", []))
             if token:
                 try:
-                    identity = self._service.authenticate_token(token)
+                    identity = self._service.resolve_identity(token)
                     cv_token = set_agent_identity(identity)
                     try:
                         return await self.app(scope, receive, send)
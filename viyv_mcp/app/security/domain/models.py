@@ -30,12 +30,16 @@ class AgentIdentity:
     depends on configuration (``implicit_trust_common``).  Use
     :func:`~viyv_mcp.app.security.domain.policy.compute_trusted_namespaces`
     instead.
+
+    ``relay_key`` (optional ``relay_key`` claim) selects the browser relay
+    that the agent's relay tool calls are routed to.
     """
 
     sub: str
     clearance: int | None
     namespace: str
     trust: Tuple[str, ...] = ()
+    relay_key: str | None = None
 
 
 @dataclass(frozen=True)
@@ -2,28 +2,44 @@
 
 The logger name ``viyv_mcp.security.audit`` allows users to attach custom
 handlers without touching viyv_mcp internals.
+
+:class:`AuditSink` moves serialization and file I/O off the event loop: the
+request path only enqueues a dict, and a writer thread appends batches.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import os
+import random
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timezone
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
 AUDIT_LOGGER_NAME = "viyv_mcp.security.audit"
 
 
+def get_audit_logger() -> logging.Logger:
+    """Return the audit logger configured for INFO, without adding handlers."""
+    audit_logger = logging.getLogger(AUDIT_LOGGER_NAME)
+    audit_logger.setLevel(logging.INFO)
+    audit_logger.propagate = False  # avoid duplicate output via root logger
+    return audit_logger
+
+
 def setup_audit_logger(log_path: str | None = None) -> logging.Logger:
     """Configure and return the audit logger.
 
     * *log_path* provided  → append JSONL to that file.
     * *log_path* ``None``  → write to stderr (development default).
     """
-    audit_logger = logging.getLogger(AUDIT_LOGGER_NAME)
-    audit_logger.setLevel(logging.INFO)
-    audit_logger.propagate = False  # avoid duplicate output via root logger
+    audit_logger = get_audit_logger()
 
     # Avoid adding duplicate handlers on repeated calls
     if audit_logger.handlers:
@@ -40,8 +56,268 @@ def setup_audit_logger(log_path: str | None = None) -> logging.Logger:
     return audit_logger
 
 
-def emit_audit_record(audit_logger: logging.Logger, record: dict[str, Any]) -> None:
-    """Serialize *record* as a single JSON line and emit via the audit logger."""
+def emit_audit_record(
+    audit_logger: logging.Logger | AuditSink, record: dict[str, Any]
+) -> None:
+    """Serialize *record* as a single JSON line and emit via the audit logger.
+
+    When given an :class:`AuditSink` the record is only queued.
+    """
+    if isinstance(audit_logger, AuditSink):
+        audit_logger.emit(record)
+        return
     record.setdefault("ts", datetime.now(timezone.utc).isoformat())
     record.setdefault("type", "audit")
     audit_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+# --------------------------------------------------------------------------- #
+# Background sink                                                              #
+# --------------------------------------------------------------------------- #
+FSYNC_NEVER = "never"
+FSYNC_BATCH = "batch"
+FSYNC_INTERVAL = "interval"
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_BATCH, FSYNC_INTERVAL)
+
+
+class AuditSink:
+    """Non-blocking audit writer.
+
+    :meth:`emit` only stamps and enqueues the record; a daemon thread
+    serializes queued records and appends them in batches.  With a *path*
+    records are appended to a JSONL file (with optional size/time rotation
+    and fsync) and, when a *logger* is given, also passed to that logger's
+    handlers.  Without a *path* they go to *logger* (default: the
+    ``viyv_mcp.security.audit`` logger).  Either way the logging happens on
+    the writer thread, so custom handlers keep working.
+
+    Parameters
+    ----------
+    path : str or None
+        JSONL file to append to.
+    batch_size : int
+        Maximum records per write.
+    flush_interval : float
+        Seconds the writer waits for a batch to fill up.
+    max_bytes : int
+        Rotate once the file reaches this size (``0`` disables).
+    rotate_interval : float
+        Rotate after this many seconds (``0`` disables).
+    backup_count : int
+        Rotated files to keep (``audit.jsonl.1`` … ``.N``).  ``0`` disables
+        rotation, as with :class:`logging.handlers.RotatingFileHandler`;
+        audit records are never deleted to make room.
+    fsync : str
+        ``"never"``, ``"batch"`` (after every write) or ``"interval"``
+        (at most every *fsync_interval* seconds).
+    sample_allowed : float
+        Fraction of ``allowed`` records to keep; denials are always kept.
+    max_queue : int
+        Queued ``allowed`` records beyond this are dropped (and counted);
+        denials are never dropped.  Records emitted after :meth:`close` are
+        dropped and counted as well.
+    logger : logging.Logger or None
+        Logger records are emitted through.  With a *path* it is skipped
+        while it has no handlers.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_bytes: int = 0,
+        rotate_interval: float = 0.0,
+        backup_count: int = 5,
+        fsync: str = FSYNC_NEVER,
+        fsync_interval: float = 1.0,
+        sample_allowed: float = 1.0,
+        max_queue: int = 100_000,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self._path = path
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        if backup_count <= 0 and (max_bytes or rotate_interval):
+            # (the *logger* parameter shadows the module logger here)
+            logging.getLogger(__name__).warning(
+                "Audit log rotation disabled: backup_count is 0"
+            )
+            max_bytes, rotate_interval = 0, 0.0
+        self._max_bytes = max_bytes
+        self._rotate_interval = rotate_interval
+        self._backup_count = backup_count
+        self._fsync = fsync
+        self._fsync_interval = fsync_interval
+        self._sample_allowed = sample_allowed
+        self._max_queue = max_queue
+        self._logger = logger
+
+        self._queue: deque[dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._file: Any = None
+        self._opened_at = 0.0
+        self._last_fsync = 0.0
+        self._written = 0
+        self._sampled_out = 0
+        self._dropped = 0
+        self._dropped_after_close = 0
+        self._batches = 0
+        self._failed = 0
+        self._busy = False
+        self._thread = threading.Thread(
+            target=self._run, name="viyv-audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    # -- producer side ---------------------------------------------------
+
+    def emit(self, record: dict[str, Any]) -> None:
+        """Queue *record* for writing.  Never blocks on I/O."""
+        denied = record.get("result") == "denied"
+        if not denied and self._sample_allowed < 1.0:
+            if random.random() >= self._sample_allowed:
+                with self._cond:
+                    self._sampled_out += 1
+                return
+        record.setdefault("ts", datetime.now(timezone.utc).isoformat())
+        record.setdefault("type", "audit")
+        with self._cond:
+            if self._closed:
+                self._dropped += 1
+                if self._dropped_after_close == 0:
+                    logger.warning("Audit record emitted after the sink was closed; dropped")
+                self._dropped_after_close += 1
+                return
+            if not denied and len(self._queue) >= self._max_queue:
+                self._dropped += 1
+                return
+            self._queue.append(record)
+            if len(self._queue) >= self._batch_size:
+                self._cond.notify()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until everything queued so far is written."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify()
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Drain the queue, stop the writer thread and close the file."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(
+                f"Audit writer did not drain within {timeout}s "
+                f"({len(self._queue)} records pending)"
+            )
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "written": self._written,
+                "batches": self._batches,
+                "sampled_out": self._sampled_out,
+                "dropped": self._dropped,
+                "failed": self._failed,
+            }
+
+    # -- writer thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue and not self._closed:
+                    self._cond.wait(self._flush_interval)
+                if not self._queue:
+                    if self._closed:
+                        break
+                    continue
+                batch = [
+                    self._queue.popleft()
+                    for _ in range(min(self._batch_size, len(self._queue)))
+                ]
+                self._busy = True
+            ok = True
+            try:
+                self._write_batch(batch)
+            except Exception as exc:
+                ok = False
+                logger.error(f"Audit writer failed: {type(exc).__name__}: {exc}")
+            with self._cond:
+                self._busy = False
+                self._batches += 1
+                if ok:
+                    self._written += len(batch)
+                else:
+                    self._failed += len(batch)
+                self._cond.notify_all()
+        self._close_file()
+
+    def _write_batch(self, batch: list[dict[str, Any]]) -> None:
+        lines = [json.dumps(r, ensure_ascii=False, default=str) for r in batch]
+        if self._path is None:
+            target = self._logger or logging.getLogger(AUDIT_LOGGER_NAME)
+            for line in lines:
+                target.info(line)
+            return
+        if self._logger is not None and self._logger.hasHandlers():
+            for line in lines:
+                self._logger.info(line)
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        f = self._open_file(len(data))
+        f.write(data)
+        f.flush()
+        now = time.monotonic()
+        if self._fsync == FSYNC_BATCH or (
+            self._fsync == FSYNC_INTERVAL
+            and now - self._last_fsync >= self._fsync_interval
+        ):
+            os.fsync(f.fileno())
+            self._last_fsync = now
+
+    def _open_file(self, incoming: int) -> Any:
+        now = time.monotonic()
+        if self._file is not None and (
+            (self._max_bytes and self._file.tell() + incoming > self._max_bytes
+             and self._file.tell() > 0)
+            or (self._rotate_interval and now - self._opened_at >= self._rotate_interval)
+        ):
+            self._close_file()
+            self._rotate()
+        if self._file is None:
+            self._file = open(self._path, "ab")
+            self._opened_at = now
+        return self._file
+
+    def _rotate(self) -> None:
+        for i in range(self._backup_count - 1, 0, -1):
+            src = f"{self._path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self._path}.{i + 1}")
+        if os.path.exists(self._path):
+            os.replace(self._path, f"{self._path}.1")
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                if self._fsync != FSYNC_NEVER:
+                    os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
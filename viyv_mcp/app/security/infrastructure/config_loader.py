@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from viyv_mcp.app.security.domain.models import AuthMode
 
@@ -28,10 +28,33 @@ class SecurityConfig(BaseModel):
     implicit_trust_common: bool = True
     audit_log_path: str | None = None
     env_name: str | None = None
+    # Audit sink (background writer)
+    audit_batch_size: int = 256
+    audit_flush_interval: float = 0.5
+    audit_max_bytes: int = 0
+    audit_rotate_interval: float = 0.0
+    audit_backup_count: int = 5
+    audit_fsync: Literal["never", "batch", "interval"] = "never"
+    audit_sample_allowed: float = Field(default=1.0, ge=0.0, le=1.0)
+    # Verified-JWT cache (0 disables)
+    jwt_cache_size: int = 1024
+    jwt_cache_ttl: float = 300.0
 
     model_config = {"frozen": True, "extra": "ignore"}
 
 
+# YAML-only audit sink settings, passed through to SecurityConfig as-is
+_AUDIT_KEYS = (
+    "audit_batch_size",
+    "audit_flush_interval",
+    "audit_max_bytes",
+    "audit_rotate_interval",
+    "audit_backup_count",
+    "audit_fsync",
+    "audit_sample_allowed",
+)
+
+
 def load_security_config(yaml_path: str | None = None) -> SecurityConfig:
     """Build a :class:`SecurityConfig` from environment variables and an
     optional YAML file.
@@ -61,6 +84,7 @@ def load_security_config(yaml_path: str | None = None) -> SecurityConfig:
     env_secret = os.environ.get("VIYV_MCP_JWT_SECRET", "")
     env_audit = os.environ.get("VIYV_MCP_AUDIT_LOG")
     env_name = os.environ.get("VIYV_MCP_ENV")
+    env_cache_size = os.environ.get("VIYV_MCP_JWT_CACHE_SIZE")
 
     # Determine auth_mode
     valid_modes = {m.value for m in AuthMode}
@@ -94,6 +118,13 @@ def load_security_config(yaml_path: str | None = None) -> SecurityConfig:
         "implicit_trust_common": yaml_data.get("implicit_trust_common", True),
         "audit_log_path": env_audit or yaml_data.get("audit_log_path"),
         "env_name": env_name,
+        **{
+            key: yaml_data[key]
+            for key in _AUDIT_KEYS
+            if key in yaml_data
+        },
+        "jwt_cache_size": env_cache_size or yaml_data.get("jwt_cache_size", 1024),
+        "jwt_cache_ttl": yaml_data.get("jwt_cache_ttl", 300.0),
     }
 
     return SecurityConfig(**config_kwargs)
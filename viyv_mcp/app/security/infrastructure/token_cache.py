@@ -0,0 +1,115 @@
+"""Bounded LRU cache of verified JWTs.
+
+Streamable-HTTP clients send the same bearer token on every request, so
+identity resolution is memoized by token digest.  Entries never outlive the
+token's ``exp`` claim (nor ``max_ttl`` seconds), and tokens whose ``nbf`` is
+still in the future are never served from the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+from viyv_mcp.app.security.domain.models import AgentIdentity
+
+
+class _CachedIdentity(NamedTuple):
+    identity: AgentIdentity
+    expires_at: float
+    not_before: float
+
+
+class TokenCache:
+    """LRU map from ``sha256(token)`` to a verified :class:`AgentIdentity`.
+
+    ``max_size <= 0`` or ``max_ttl <= 0`` disables caching.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        max_ttl: float = 300.0,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_size = max_size
+        self._max_ttl = max_ttl
+        self._clock = clock
+        self._entries: OrderedDict[bytes, _CachedIdentity] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0 and self._max_ttl > 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> AgentIdentity | None:
+        """Return the cached identity for *token*, or ``None`` on a miss."""
+        if not self.enabled:
+            return None
+        key = self._digest(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if now >= entry.expires_at:
+                del self._entries[key]
+                self._misses += 1
+                return None
+            if now < entry.not_before:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.identity
+
+    def put(
+        self,
+        token: str,
+        identity: AgentIdentity,
+        *,
+        exp: Any = None,
+        nbf: Any = None,
+    ) -> None:
+        """Cache *identity* for *token*, bounded by the ``exp``/``nbf`` claims."""
+        if not self.enabled:
+            return
+        now = self._clock()
+        expires_at = now + self._max_ttl
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        not_before = float(nbf) if isinstance(nbf, (int, float)) else 0.0
+        if expires_at <= now:
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = _CachedIdentity(identity, expires_at, not_before)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / total if total else 0.0,
+            }
@@ -15,17 +15,23 @@ from viyv_mcp.app.security.domain.policy import (
     authorize_tool_access,
     compute_trusted_namespaces,
 )
-from viyv_mcp.app.security.infrastructure.audit_writer import emit_audit_record
+from viyv_mcp.app.security.infrastructure.audit_writer import (
+    AuditSink,
+    emit_audit_record,
+)
 from viyv_mcp.app.security.infrastructure.config_loader import SecurityConfig
 from viyv_mcp.app.security.infrastructure.jwt_codec import (
     JWTDecodeError,
     JWTExpiredError,
     decode_jwt,
 )
-from viyv_mcp.app.security.domain.models import ToolMetadataProvider
+from viyv_mcp.app.security.infrastructure.token_cache import TokenCache
+from viyv_mcp.app.security.domain.models import ToolMetadataProvider, ToolSecurityMeta
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_META = ToolSecurityMeta()
+
 
 class SecurityService:
     """Single entry-point consumed by the MCP handlers and ASGI layer."""
@@ -34,12 +40,13 @@ class SecurityService:
         self,
         config: SecurityConfig,
         tool_registry: ToolMetadataProvider,
-        audit_logger: logging.Logger,
+        audit_logger: logging.Logger | AuditSink,
     ) -> None:
         self._config = config
         self._tool_registry = tool_registry
         self._audit_logger = audit_logger
         self.stdio_identity: AgentIdentity | None = None
+        self.token_cache = TokenCache(config.jwt_cache_size, config.jwt_cache_ttl)
 
     # -- properties ------------------------------------------------------
 
@@ -51,6 +58,11 @@ class SecurityService:
     def is_bypass(self) -> bool:
         return self._config.auth_mode == AuthMode.BYPASS
 
+    @property
+    def tool_registry(self) -> ToolMetadataProvider:
+        """Metadata provider both visibility and authorization are based on."""
+        return self._tool_registry
+
     # -- authentication --------------------------------------------------
 
     def authenticate_token(self, token: str) -> AgentIdentity:
@@ -58,7 +70,26 @@ class SecurityService:
 
         Raises :class:`JWTDecodeError` / :class:`JWTExpiredError` on failure.
         """
-        payload = decode_jwt(
+        return self._identity_from_payload(self._decode(token))
+
+    def resolve_identity(self, token: str) -> AgentIdentity:
+        """Like :meth:`authenticate_token`, but served from :attr:`token_cache`.
+
+        Used on the HTTP hot path where the same bearer token arrives with
+        every request.  Failures are never cached.
+        """
+        identity = self.token_cache.get(token)
+        if identity is not None:
+            return identity
+        payload = self._decode(token)
+        identity = self._identity_from_payload(payload)
+        self.token_cache.put(
+            token, identity, exp=payload.get("exp"), nbf=payload.get("nbf"),
+        )
+        return identity
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        return decode_jwt(
             token,
             self._config.jwt_secret,
             algorithm=self._config.jwt_algorithm,
@@ -66,6 +97,8 @@ class SecurityService:
             audience=self._config.jwt_audience,
         )
 
+    @staticmethod
+    def _identity_from_payload(payload: dict[str, Any]) -> AgentIdentity:
         # Required claims
         for claim in ("sub", "namespace"):
             if claim not in payload:
@@ -90,23 +123,42 @@ class SecurityService:
         else:
             clearance = None
 
+        relay_key = payload.get("relay_key")
         return AgentIdentity(
             sub=str(payload["sub"]),
             clearance=clearance,
             namespace=str(payload["namespace"]),
             trust=trust,
+            relay_key=str(relay_key) if relay_key else None,
         )
 
     # -- authorization ---------------------------------------------------
 
-    def authorize_tool_call(
-        self, agent: AgentIdentity, tool_name: str
-    ) -> AuthResult:
-        meta = self._tool_registry.get(tool_name)
-        trusted_ns = compute_trusted_namespaces(
+    def trusted_namespaces(self, agent: AgentIdentity) -> frozenset[str]:
+        """Namespaces visible to *agent* under the current configuration."""
+        return compute_trusted_namespaces(
             agent,
             implicit_trust_common=self._config.implicit_trust_common,
         )
+
+    def tool_meta(self, tool_name: str) -> ToolSecurityMeta:
+        """Security metadata for *tool_name* (defaults when unregistered).
+
+        Callers that both authorize and audit a call look it up once and
+        pass it to :meth:`authorize_tool_call` and :meth:`log_access`.
+        """
+        return self._tool_registry.get(tool_name)
+
+    def authorize_tool_call(
+        self,
+        agent: AgentIdentity,
+        tool_name: str,
+        *,
+        meta: ToolSecurityMeta | None = None,
+    ) -> AuthResult:
+        if meta is None:
+            meta = self._tool_registry.get(tool_name)
+        trusted_ns = self.trusted_namespaces(agent)
         return authorize_tool_access(
             agent,
             meta.namespace,
@@ -124,18 +176,30 @@ class SecurityService:
         executability (clearance → tools/call).  An agent can *see* a tool
         it cannot *call*, which lets the LLM know the tool exists and
         request elevated access if needed.
+
+        :class:`~viyv_mcp.server.mcp_server.McpServer` caches the result per
+        trusted-namespace set, using the registry's namespace index when this
+        service's provider is its own registry.
         """
-        trusted_ns = compute_trusted_namespaces(
-            agent,
-            implicit_trust_common=self._config.implicit_trust_common,
-        )
+        return self.filter_tools_by_namespaces(self.trusted_namespaces(agent), tools)
+
+    def filter_tools_by_namespaces(
+        self, trusted_ns: frozenset[str], tools: Sequence[Any]
+    ) -> list[Any]:
+        """Return the *tools* whose namespace (per this service) is in *trusted_ns*."""
+        # One snapshot instead of one (locked) registry lookup per tool
+        get_all = getattr(self._tool_registry, "get_all", None)
+        all_meta = get_all() if get_all is not None else None
         result: list[Any] = []
         for tool in tools:
             name = getattr(tool, "name", None)
             if name is None:
                 logger.warning(f"Security: tool object without 'name' attribute skipped: {tool!r}")
                 continue
-            meta = self._tool_registry.get(name)
+            if all_meta is not None:
+                meta = all_meta.get(name, _DEFAULT_META)
+            else:
+                meta = self._tool_registry.get(name)
             if meta.namespace in trusted_ns:
                 result.append(tool)
         return result
@@ -149,8 +213,10 @@ class SecurityService:
         result: AuthResult,
         *,
         mode: str = "",
+        meta: ToolSecurityMeta | None = None,
     ) -> None:
-        meta = self._tool_registry.get(tool_name)
+        if meta is None:
+            meta = self._tool_registry.get(tool_name)
         record: dict[str, Any] = {
             "agent": agent.sub if agent else None,
             "agent_ns": agent.namespace if agent else None,
@@ -171,3 +237,8 @@ class SecurityService:
             self._audit_logger,
             {"agent": "bypass", "tool": tool_name, "result": "allowed", "mode": "bypass"},
         )
+
+    def close(self) -> None:
+        """Flush and stop the audit sink, if one is in use."""
+        if isinstance(self._audit_logger, AuditSink):
+            self._audit_logger.close()
@@ -12,8 +12,13 @@ from starlette.responses import JSONResponse
 from starlette.routing import Route, WebSocketRoute
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from viyv_mcp.app.ws_bridge_protocol import AuthResult, PongMessage
-from viyv_mcp.app.ws_bridge_session import WebSocketBridgeSession
+from viyv_mcp.app.ws_bridge_protocol import (
+    AuthResult,
+    PongMessage,
+    decode_frame,
+    negotiate_protocol,
+)
+from viyv_mcp.app.ws_bridge_session import ResultBudget, WebSocketBridgeSession
 from viyv_mcp.app.relay_key_manager import RelayKeyManager
 
 logger = logging.getLogger(__name__)
@@ -27,8 +32,19 @@ class WebSocketBridgeHub:
         key_manager: RelayKeyManager,
         on_connect: Callable[[str, WebSocketBridgeSession], None] | None = None,
         on_disconnect: Callable[[str, WebSocketBridgeSession], None] | None = None,
+        *,
+        session_buffer_bytes: int = 64 * 1024 * 1024,
+        total_buffer_bytes: int = 256 * 1024 * 1024,
+        default_timeout: float = 300.0,
+        tool_timeouts: dict[str, float] | None = None,
     ) -> None:
         self._key_manager = key_manager
+        # Chunked tool results: per-connection and server-wide buffer limits
+        self._session_buffer_bytes = session_buffer_bytes
+        self._budget = ResultBudget(total_buffer_bytes)
+        # Call deadlines: default and per-tool overrides (seconds, 0 = none)
+        self._default_timeout = default_timeout
+        self._tool_timeouts = tool_timeouts or {}
         # key -> session
         self._sessions: dict[str, WebSocketBridgeSession] = {}
         self._lock = asyncio.Lock()
@@ -42,6 +58,10 @@ class WebSocketBridgeHub:
     def sessions(self) -> dict[str, WebSocketBridgeSession]:
         return self._sessions
 
+    @property
+    def budget(self) -> ResultBudget:
+        return self._budget
+
     async def handle_websocket(self, websocket: WebSocket) -> None:
         """Handle a new WebSocket connection from a Chrome extension."""
         await websocket.accept()
@@ -100,11 +120,20 @@ class WebSocketBridgeHub:
                     await websocket.close(1008, 'Key in use')
                     return
 
-                session = WebSocketBridgeSession(websocket, key)
+                protocol = negotiate_protocol(data.get('protocol'))
+                session = WebSocketBridgeSession(
+                    websocket, key, protocol=protocol,
+                    max_buffer_bytes=self._session_buffer_bytes, budget=self._budget,
+                    default_timeout=self._default_timeout, timeouts=self._tool_timeouts,
+                )
                 self._sessions[key] = session
 
-            logger.info(f"[ws-bridge:{key_prefix}] Chrome extension connected")
-            await websocket.send_json(AuthResult(success=True).model_dump())
+            logger.info(
+                f"[ws-bridge:{key_prefix}] Chrome extension connected (protocol {protocol})"
+            )
+            await websocket.send_json(
+                AuthResult(success=True, protocol=protocol).model_dump()
+            )
 
             # Notify connection callback
             if self._on_connect and session:
@@ -115,11 +144,16 @@ class WebSocketBridgeHub:
 
             # Message loop
             while True:
-                raw = await websocket.receive_text()
+                message = await websocket.receive()
+                if message['type'] == 'websocket.disconnect':
+                    raise WebSocketDisconnect(message.get('code', 1000))
                 try:
-                    data = json.loads(raw)
-                except json.JSONDecodeError:
-                    logger.warning(f"[ws-bridge:{key_prefix}] Invalid JSON, ignoring")
+                    if message.get('bytes') is not None:
+                        data = decode_frame(message['bytes'])
+                    else:
+                        data = json.loads(message['text'])
+                except ValueError as e:  # includes json.JSONDecodeError
+                    logger.warning(f"[ws-bridge:{key_prefix}] Invalid frame, ignoring: {e}")
                     continue
                 msg_type = data.get('type')
 
@@ -127,7 +161,7 @@ class WebSocketBridgeHub:
                     continue
                 elif msg_type == 'ping':
                     await websocket.send_json(PongMessage().model_dump())
-                elif msg_type == 'tool_result':
+                elif msg_type in ('tool_result', 'tool_result_chunk'):
                     session.handle_message(data)
                 else:
                     logger.debug(
@@ -175,6 +209,8 @@ def create_ws_bridge_app(
         return JSONResponse({
             'connected': len(keys),
             'keys': keys,
+            'buffered_bytes': hub.budget.buffered,
+            'buffered_peak': hub.budget.peak,
         })
 
     routes = [
@@ -1,15 +1,115 @@
-"""WebSocket bridge protocol models."""
+"""WebSocket bridge protocol models.
+
+Two wire protocols are negotiated in the auth handshake (``protocol`` in
+:class:`AuthMessage` / :class:`AuthResult`):
+
+* ``1`` -- every message is a JSON text frame (original protocol)
+* ``2`` -- ``tool_call`` / ``tool_result`` travel as binary frames:
+
+  ``[4-byte big-endian header length][header: JSON envelope][attachments]``
+
+  The header carries ``"att": [len, ...]``, the byte lengths of the raw
+  attachments that follow it.  A value ``{"$bin": i}`` anywhere in the
+  envelope stands for attachment ``i``, so screenshots are sent as raw
+  image bytes instead of base64 strings inside JSON.  Decoding yields
+  zero-copy :class:`memoryview` slices of the frame.
+
+Text frames (``ping`` / ``pong``, or an extension replying in JSON) are
+accepted under both protocols.
+
+Large results may be streamed as ``tool_result_chunk`` messages (``data``
+is a string, or an attachment under protocol 2) numbered by ``seq`` from
+0, followed by a ``tool_result`` with ``"chunked": true``.  The
+reassembled bytes are either the JSON of ``result`` (when the final
+message has no ``result``) or replace a ``{"$chunks": true}`` value in it,
+e.g. the ``data`` of a screenshot.
+"""
 from __future__ import annotations
 
+import json
+import struct
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+PROTOCOL_JSON = 1
+PROTOCOL_BINARY = 2
+SUPPORTED_PROTOCOL = PROTOCOL_BINARY
+
+_HEADER = struct.Struct('>I')
+
+
+def negotiate_protocol(requested: Any) -> int:
+    """Highest protocol both sides speak (``1`` for old extensions)."""
+    try:
+        return max(PROTOCOL_JSON, min(int(requested), SUPPORTED_PROTOCOL))
+    except (TypeError, ValueError):
+        return PROTOCOL_JSON
+
+
+def encode_frame(envelope: dict[str, Any], attachments: list[bytes] = ()) -> bytes:
+    """Encode a protocol-2 binary frame.
+
+    *envelope* must already reference the attachments as ``{"$bin": i}``.
+    """
+    header = dict(envelope)
+    if attachments:
+        header['att'] = [len(a) for a in attachments]
+    raw = json.dumps(header, separators=(',', ':')).encode()
+    return b''.join([_HEADER.pack(len(raw)), raw, *attachments])
+
+
+def decode_frame(frame: bytes) -> dict[str, Any]:
+    """Decode a protocol-2 binary frame into its envelope.
+
+    ``{"$bin": i}`` references are replaced by memoryviews of the frame.
+    """
+    if len(frame) < _HEADER.size:
+        raise ValueError('Truncated frame')
+    (size,) = _HEADER.unpack_from(frame)
+    end = _HEADER.size + size
+    if end > len(frame):
+        raise ValueError('Truncated frame header')
+    envelope = json.loads(frame[_HEADER.size:end])
+    if not isinstance(envelope, dict):
+        raise ValueError('Frame header must be an object')
+    lengths = envelope.pop('att', None)
+    if lengths is None:
+        lengths = []
+    if not isinstance(lengths, list) or not all(_is_index(n) for n in lengths):
+        raise ValueError("Frame 'att' must be a list of non-negative integers")
+    view = memoryview(frame)
+    attachments = []
+    for length in lengths:
+        if end + length > len(frame):
+            raise ValueError('Truncated frame attachment')
+        attachments.append(view[end:end + length])
+        end += length
+    return _resolve(envelope, attachments)
+
+
+def _is_index(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _resolve(value: Any, attachments: list[memoryview]) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and '$bin' in value:
+            index = value['$bin']
+            if not _is_index(index) or index >= len(attachments):
+                raise ValueError(f"Invalid attachment reference: {index!r}")
+            return attachments[index]
+        return {k: _resolve(v, attachments) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, attachments) for v in value]
+    return value
+
 
 class AuthMessage(BaseModel):
     """Chrome extension -> server: authenticate with key."""
     type: Literal['auth'] = 'auth'
     key: str
+    protocol: int = PROTOCOL_JSON
 
 
 class AuthResult(BaseModel):
@@ -17,6 +117,7 @@ class AuthResult(BaseModel):
     type: Literal['auth_result'] = 'auth_result'
     success: bool
     error: str | None = None
+    protocol: int = PROTOCOL_JSON
 
 
 class ToolCallMessage(BaseModel):
@@ -27,6 +128,19 @@ class ToolCallMessage(BaseModel):
     tool: str
     input: dict[str, Any] = Field(default_factory=dict)
     timestamp: int = 0
+    timeoutMs: int | None = None  # the server gives up (and sends tool_cancel) after this
+
+
+class ToolCancelMessage(BaseModel):
+    """Server -> Chrome extension: stop working on a tool call.
+
+    ``reason`` is ``cancelled`` (the MCP client went away or cancelled),
+    ``deadline`` (``timeoutMs`` passed) or ``too_large`` (result over the
+    buffer limits).  No ``tool_result`` is expected afterwards.
+    """
+    type: Literal['tool_cancel'] = 'tool_cancel'
+    id: str
+    reason: str = 'cancelled'
 
 
 class ToolResultMessage(BaseModel):
@@ -39,6 +153,38 @@ class ToolResultMessage(BaseModel):
     error: dict[str, Any] | None = None
     timestamp: int = 0
 
+    @classmethod
+    def from_envelope(cls, data: dict[str, Any]) -> 'ToolResultMessage':
+        """Build from a decoded message, checking only the envelope fields.
+
+        The ``result`` payload (possibly megabytes of page text or image
+        data) is passed through without being validated or copied.
+        """
+        if not isinstance(data.get('id'), str) or not isinstance(data.get('success'), bool):
+            raise ValueError('tool_result requires a string id and a boolean success')
+        result, error = data.get('result'), data.get('error')
+        if result is not None and not isinstance(result, dict):
+            raise ValueError('tool_result result must be an object')
+        if error is not None and not isinstance(error, dict):
+            raise ValueError('tool_result error must be an object')
+        return cls.model_construct(
+            id=data['id'],
+            agentId=data.get('agentId', 'cloud'),
+            success=data['success'],
+            result=result,
+            error=error,
+            timestamp=data.get('timestamp', 0),
+        )
+
+
+class ToolResultChunkMessage(BaseModel):
+    """Chrome extension -> server: one piece of a large tool result."""
+    type: Literal['tool_result_chunk'] = 'tool_result_chunk'
+    id: str
+    seq: int
+    data: str
+    total: int | None = None  # expected size in bytes, if known
+
 
 class PingMessage(BaseModel):
     type: Literal['ping'] = 'ping'
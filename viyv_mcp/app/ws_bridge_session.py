@@ -2,60 +2,323 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import json
 import logging
+import math
 import time
 import uuid
+from typing import Any, Awaitable, Callable
 
 from mcp.shared.exceptions import McpError
 from mcp.types import CallToolResult, ErrorData, ImageContent, TextContent
 from starlette.websockets import WebSocket
 
-from viyv_mcp.app.ws_bridge_protocol import ToolCallMessage, ToolResultMessage
+from viyv_mcp.app.ws_bridge_protocol import (
+    PROTOCOL_BINARY,
+    PROTOCOL_JSON,
+    ToolCallMessage,
+    ToolCancelMessage,
+    ToolResultMessage,
+    encode_frame,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# ---- binary attachments (protocol 2) ---- #
+def _b64(value) -> str:
+    """Image data as base64: raw attachments are encoded once, here."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode('ascii')
+    return value
+
+
+def _text(value) -> str:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode('utf-8', errors='replace')
+    return value
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_b64_default)
+
+
+def _b64_default(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _replace_chunks(value: Any, payload: str | memoryview) -> Any:
+    if isinstance(value, dict):
+        if value == {'$chunks': True}:
+            return payload
+        return {k: _replace_chunks(v, payload) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_chunks(v, payload) for v in value]
+    return value
+
+
+# ---- call deadlines ---- #
+def timeouts_from_json(raw: str) -> dict[str, float]:
+    """Parse ``{"tool": seconds}`` (``0`` = no deadline)."""
+    if not raw:
+        return {}
+    try:
+        return {name: float(value) for name, value in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError) as exc:
+        logger.warning(f"Ignoring invalid relay tool timeouts {raw!r}: {exc}")
+        return {}
+
+
+class DeadlineWheel:
+    """Hashed timing wheel holding the deadlines of one session's calls.
+
+    Adding or cancelling a deadline is O(1) and the whole session needs a
+    single loop timer, which only runs while some deadline is pending.  A
+    deadline fires between ``timeout`` and ``timeout + tick`` seconds after
+    it was added.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[str], None],
+        *,
+        tick: float = 1.0,
+        slots: int = 512,
+    ) -> None:
+        self._on_expire = on_expire
+        self._tick = tick
+        # slot -> {call_id: remaining full turns of the wheel}
+        self._slots: list[dict[str, int]] = [{} for _ in range(slots)]
+        self._where: dict[str, int] = {}
+        self._pos = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._next_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def add(self, call_id: str, timeout: float) -> None:
+        self.cancel(call_id)
+        loop = asyncio.get_running_loop()
+        if self._timer is None:
+            self._next_at = loop.time() + self._tick
+            self._timer = loop.call_at(self._next_at, self._advance)
+        # The next tick is less than a full tick away
+        remaining = max(0.0, timeout - (self._next_at - loop.time()))
+        ticks = 1 + math.ceil(remaining / self._tick)
+        n = len(self._slots)
+        slot = (self._pos + ticks) % n
+        self._slots[slot][call_id] = (ticks - 1) // n
+        self._where[call_id] = slot
+
+    def cancel(self, call_id: str) -> None:
+        slot = self._where.pop(call_id, None)
+        if slot is not None:
+            del self._slots[slot][call_id]
+            if not self._where:
+                self.stop()
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _advance(self) -> None:
+        self._timer = None
+        self._pos = (self._pos + 1) % len(self._slots)
+        bucket = self._slots[self._pos]
+        expired = [cid for cid, turns in bucket.items() if turns == 0]
+        for cid in list(bucket):
+            if bucket[cid]:
+                bucket[cid] -= 1
+        for cid in expired:
+            del bucket[cid]
+            del self._where[cid]
+        if self._where:
+            # Fixed steps from the previous tick, so the wheel does not drift
+            self._next_at += self._tick
+            self._timer = asyncio.get_running_loop().call_at(self._next_at, self._advance)
+        for cid in expired:
+            try:
+                self._on_expire(cid)
+            except Exception as e:
+                logger.error(f"[ws-bridge] Deadline handler failed for {cid}: {e}")
+
+
+# ---- chunked results ---- #
+# (bytes received, expected total or None) -> MCP progress notification
+ProgressCallback = Callable[[float, 'float | None'], Awaitable[None]]
+
+
+class ResultBudget:
+    """Bytes of chunked tool results buffered across every session."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.buffered = 0
+        self.peak = 0
+
+    def reserve(self, n: int) -> bool:
+        if self.buffered + n > self.max_bytes:
+            return False
+        self.buffered += n
+        self.peak = max(self.peak, self.buffered)
+        return True
+
+    def release(self, n: int) -> None:
+        self.buffered -= n
+
+
+class _PendingCall:
+    """A tool call awaiting its result, plus its chunk buffer if streamed."""
+
+    __slots__ = (
+        'tool', 'fut', 'progress', 'timeout', 'buffer', 'text', 'seq', 'total', '_reporter',
+    )
+
+    def __init__(
+        self,
+        tool: str,
+        fut: asyncio.Future,
+        progress: ProgressCallback | None,
+        timeout: float | None = None,
+    ) -> None:
+        self.tool = tool
+        self.fut = fut
+        self.progress = progress
+        self.timeout = timeout
+        self.buffer: bytearray | None = None
+        # True when the chunks arrived as JSON strings, False for binary
+        # attachments; fixed by the first chunk
+        self.text: bool | None = None
+        self.seq = 0
+        self.total: int | None = None
+        self._reporter: asyncio.Task | None = None
+
+    @property
+    def buffered(self) -> int:
+        return len(self.buffer) if self.buffer is not None else 0
+
+    def notify_progress(self) -> None:
+        # At most one notification in flight; the task catches up with the
+        # latest byte count, so a burst of chunks does not queue up sends
+        if self.progress is not None and (self._reporter is None or self._reporter.done()):
+            self._reporter = asyncio.get_running_loop().create_task(self._report())
+
+    async def _report(self) -> None:
+        sent = -1
+        while sent != self.buffered and not self.fut.done():
+            sent = self.buffered
+            try:
+                await self.progress(sent, self.total)
+            except Exception as e:
+                logger.debug(f"[ws-bridge] Progress notification failed: {e}")
+                return
+
+
 class WebSocketBridgeSession:
     """Duck-type session compatible with bridge_manager._register_tool_bridge.
 
     Implements call_tool() by sending a tool_call message over WebSocket
     and waiting for the corresponding tool_result.
+
+    Results streamed as ``tool_result_chunk`` messages are reassembled in a
+    buffer bounded by ``max_buffer_bytes`` per session and by the shared
+    ``budget`` across sessions; a call exceeding either fails with a clear
+    error instead of growing memory.
+
+    Each call has a deadline (``timeouts[tool]``, else ``default_timeout``;
+    ``0`` disables it) kept in the session's :class:`DeadlineWheel`.  When
+    a call passes its deadline or its caller is cancelled (including by an
+    MCP ``notifications/cancelled``), the extension receives a
+    ``tool_cancel`` so that it can stop the browser work.
     """
 
-    def __init__(self, ws: WebSocket, key: str) -> None:
+    def __init__(
+        self,
+        ws: WebSocket,
+        key: str,
+        protocol: int = PROTOCOL_JSON,
+        *,
+        max_buffer_bytes: int = 64 * 1024 * 1024,
+        budget: ResultBudget | None = None,
+        default_timeout: float = 300.0,
+        timeouts: dict[str, float] | None = None,
+        deadline_tick: float = 1.0,
+    ) -> None:
         self._ws = ws
         self._key = key
-        self._pending: dict[str, asyncio.Future[ToolResultMessage]] = {}
+        self._protocol = protocol
+        self._pending: dict[str, _PendingCall] = {}
+        # calls failed mid-stream: their remaining chunks are dropped
+        self._aborted: set[str] = set()
+        self._max_buffer_bytes = max_buffer_bytes
+        self._buffered = 0
+        self._budget = budget
+        self._default_timeout = default_timeout
+        self._timeouts = timeouts or {}
+        self._deadlines = DeadlineWheel(self._expire, tick=deadline_tick)
+        # tool_cancel sends in flight (kept referenced until done)
+        self._background: set[asyncio.Task] = set()
         self._key_prefix = key[:8] if len(key) >= 8 else key
 
     @property
     def key_prefix(self) -> str:
         return self._key_prefix
 
-    async def call_tool(self, tool_name: str, arguments: dict | None = None):
-        """Send tool_call to the Chrome extension and wait for tool_result."""
+    @property
+    def protocol(self) -> int:
+        return self._protocol
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self._buffered
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict | None = None,
+        *,
+        progress: ProgressCallback | None = None,
+        timeout: float | None = None,
+    ):
+        """Send tool_call to the Chrome extension and wait for tool_result.
+
+        *progress* is awaited with the bytes received so far while a
+        chunked result streams in.  *timeout* overrides the tool's deadline.
+        """
+        if timeout is None:
+            timeout = self._timeouts.get(tool_name, self._default_timeout)
         call_id = uuid.uuid4().hex[:12]
         msg = ToolCallMessage(
             id=call_id,
             tool=tool_name,
             input=arguments or {},
             timestamp=int(time.time() * 1000),
+            timeoutMs=int(timeout * 1000) if timeout else None,
         )
 
         fut: asyncio.Future[ToolResultMessage] = asyncio.get_running_loop().create_future()
-        self._pending[call_id] = fut
+        self._pending[call_id] = _PendingCall(tool_name, fut, progress, timeout)
+        if timeout:
+            self._deadlines.add(call_id, timeout)
 
         try:
-            await self._ws.send_json(msg.model_dump())
-            # Wait for result with timeout
-            result = await asyncio.wait_for(fut, timeout=300)  # 5 min timeout
-        except asyncio.TimeoutError:
-            self._pending.pop(call_id, None)
-            raise TimeoutError(f"Tool call '{tool_name}' timed out after 300s")
-        except Exception:
-            self._pending.pop(call_id, None)
+            await self._send(msg.model_dump())
+            result = await fut
+        except asyncio.CancelledError:
+            if call_id in self._pending:
+                self._cancel_remote(call_id, 'cancelled')
             raise
+        finally:
+            self._deadlines.cancel(call_id)
+            if call_id in self._pending:
+                # abandoned (timeout / cancellation): drop its late messages
+                self._drop(call_id)
+                self._mark_aborted(call_id)
 
         if not result.success:
             error_msg = (
@@ -76,13 +339,13 @@ class WebSocketBridgeSession:
                     if item.get('type') == 'image':
                         content_items.append(ImageContent(
                             type='image',
-                            data=item.get('data', ''),
+                            data=_b64(item.get('data', '')),
                             mimeType=item.get('mimeType', 'image/jpeg'),
                         ))
                     else:
                         content_items.append(TextContent(
                             type='text',
-                            text=item.get('text', json.dumps(item)),
+                            text=_text(item['text']) if 'text' in item else _dumps(item),
                         ))
                 else:
                     content_items.append(TextContent(type='text', text=str(item)))
@@ -92,23 +355,37 @@ class WebSocketBridgeSession:
         if 'data' in result_data and result_data.get('format') in ('jpeg', 'png', 'gif', 'webp'):
             mime = f"image/{result_data['format']}"
             return CallToolResult(content=[
-                ImageContent(type='image', data=result_data['data'], mimeType=mime),
+                ImageContent(type='image', data=_b64(result_data['data']), mimeType=mime),
             ])
 
-        return ToolResult(
-            content=[TextContent(type='text', text=json.dumps(result_data))],
+        return CallToolResult(
+            content=[TextContent(type='text', text=_dumps(result_data))],
         )
 
     def handle_message(self, data: dict) -> bool:
         """Handle an incoming message from the Chrome extension.
 
-        Returns True if the message was handled (tool_result).
+        Returns True if the message was handled (tool_result or chunk).
         """
-        if data.get('type') == 'tool_result':
+        msg_type = data.get('type')
+        if msg_type == 'tool_result_chunk':
+            return self._handle_chunk(data)
+        if msg_type == 'tool_result':
             call_id = data.get('id')
-            fut = self._pending.pop(call_id, None)
-            if fut and not fut.done():
-                fut.set_result(ToolResultMessage(**data))
+            call = self._pending.get(call_id)
+            if call and not call.fut.done():
+                try:
+                    if data.get('chunked'):
+                        data = self._reassemble(call, data)
+                    call.fut.set_result(ToolResultMessage.from_envelope(data))
+                except ValueError as e:
+                    call.fut.set_exception(McpError(ErrorData(
+                        code=-32000, message=f"Malformed tool_result: {e}",
+                    )))
+                self._drop(call_id)
+                return True
+            elif call_id in self._aborted:
+                self._aborted.discard(call_id)
                 return True
             else:
                 logger.warning(
@@ -116,9 +393,143 @@ class WebSocketBridgeSession:
                 )
         return False
 
+    def _handle_chunk(self, data: dict) -> bool:
+        call_id = data.get('id')
+        call = self._pending.get(call_id)
+        if call is None or call.fut.done():
+            if call_id not in self._aborted:
+                logger.warning(
+                    f"[ws-bridge:{self._key_prefix}] Unexpected tool_result_chunk id={call_id}"
+                )
+            return call_id in self._aborted
+
+        piece = data.get('data')
+        text = isinstance(piece, str)
+        if text:
+            piece = piece.encode('utf-8')
+        if (
+            not isinstance(piece, (bytes, memoryview))
+            or data.get('seq') != call.seq
+            or call.text not in (None, text)
+        ):
+            self._abort(call_id, f"Malformed tool_result_chunk for '{call.tool}' "
+                                 f"(expected seq {call.seq})")
+            return True
+
+        size = len(piece)
+        if self._buffered + size > self._max_buffer_bytes:
+            self._abort(call_id, (
+                f"Tool result of '{call.tool}' is too large: the relay buffers at most "
+                f"{self._max_buffer_bytes} bytes of results per connection"
+            ))
+            return True
+        if self._budget is not None and not self._budget.reserve(size):
+            self._abort(call_id, (
+                f"Tool result of '{call.tool}' is too large: the server-wide relay "
+                f"buffer ({self._budget.max_bytes} bytes) is full"
+            ))
+            return True
+
+        if call.buffer is None:
+            call.buffer = bytearray()
+            call.text = text
+        call.buffer += piece
+        self._buffered += size
+        call.seq += 1
+        if isinstance(data.get('total'), int):
+            call.total = data['total']
+        call.notify_progress()
+        return True
+
+    def _reassemble(self, call: _PendingCall, data: dict) -> dict:
+        """Final message of a chunked result -> a plain tool_result message."""
+        # The buffer is handed over without copying; it only stops counting
+        # against the limits
+        buffer = call.buffer if call.buffer is not None else bytearray()
+        self._release(call)
+        data = dict(data)
+        if data.get('result') is None and data.get('success'):
+            try:
+                data['result'] = json.loads(buffer)
+            except ValueError as e:
+                raise ValueError(f"chunked result is not valid JSON: {e}")
+        elif data.get('result') is not None:
+            # Text chunks already hold the field's final string (e.g. the
+            # base64 of a screenshot); only binary attachments stay raw bytes
+            # and get encoded when the result is built
+            if call.text:
+                try:
+                    payload = buffer.decode('utf-8')
+                except UnicodeDecodeError as e:
+                    raise ValueError(f"chunked result is not valid UTF-8: {e}")
+            else:
+                payload = memoryview(buffer)
+            data['result'] = _replace_chunks(data['result'], payload)
+        return data
+
+    def _abort(self, call_id: str, message: str) -> None:
+        logger.warning(f"[ws-bridge:{self._key_prefix}] {message}")
+        call = self._pending.get(call_id)
+        if call is not None and not call.fut.done():
+            call.fut.set_exception(McpError(ErrorData(code=-32000, message=message)))
+        self._drop(call_id)
+        self._mark_aborted(call_id)
+        self._cancel_remote(call_id, 'too_large')
+
+    def _expire(self, call_id: str) -> None:
+        """Deadline passed: fail the call and tell the extension to stop."""
+        call = self._pending.get(call_id)
+        if call is None or call.fut.done():
+            return
+        call.fut.set_exception(
+            TimeoutError(f"Tool call '{call.tool}' timed out after {call.timeout:g}s")
+        )
+        self._cancel_remote(call_id, 'deadline')
+
+    async def _send(self, message: dict) -> None:
+        if self._protocol >= PROTOCOL_BINARY:
+            await self._ws.send_bytes(encode_frame(message))
+        else:
+            await self._ws.send_json(message)
+
+    def _cancel_remote(self, call_id: str, reason: str) -> None:
+        # Sent from a task: the caller may be inside a cancelled scope
+        # where any await would be interrupted at once
+        async def send() -> None:
+            try:
+                await self._send(ToolCancelMessage(id=call_id, reason=reason).model_dump())
+            except Exception as e:
+                logger.debug(f"[ws-bridge:{self._key_prefix}] tool_cancel not sent: {e}")
+
+        logger.info(f"[ws-bridge:{self._key_prefix}] Cancelling call {call_id} ({reason})")
+        task = asyncio.get_running_loop().create_task(send())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _mark_aborted(self, call_id: str) -> None:
+        if len(self._aborted) >= 1024:
+            self._aborted.pop()  # the extension never finished some stream
+        self._aborted.add(call_id)
+
+    def _release(self, call: _PendingCall) -> None:
+        size = call.buffered
+        if size:
+            self._buffered -= size
+            if self._budget is not None:
+                self._budget.release(size)
+        call.buffer = None
+
+    def _drop(self, call_id: str) -> None:
+        call = self._pending.pop(call_id, None)
+        if call is not None:
+            self._release(call)
+
     async def close(self) -> None:
         """Cancel all pending futures."""
-        for fut in self._pending.values():
-            if not fut.done():
-                fut.cancel()
-        self._pending.clear()
+        self._deadlines.stop()
+        for call_id in list(self._pending):
+            call = self._pending[call_id]
+            if not call.fut.done():
+                call.fut.cancel()
+            self._drop(call_id)
+        self._aborted.clear()
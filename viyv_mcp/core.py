@@ -1,21 +1,23 @@
 # core.py
 """ViyvMCP -- Streamable HTTP + 静的配信 + エントリー群を 1 つにまとめる ASGI アプリ"""
+import asyncio
 import logging
 
 from starlette.applications import Starlette
 
 from viyv_mcp.server import McpServer
 from viyv_mcp.app.lifespan import app_lifespan_context
-from viyv_mcp.app.bridge_manager import init_bridges, close_bridges, unregister_bridged_tools
+from viyv_mcp.app.bridge_manager import BridgeSet
 from viyv_mcp.app.config import Config
 from viyv_mcp.app.mcp_initialize_fix import monkey_patch_mcp_validation
-from viyv_mcp.app.relay_mcp_handler import register_browser_tools_for_session
+from viyv_mcp.app.relay_mcp_handler import RELAY_KEY_SCOPE, split_relay_path
 from viyv_mcp.app.mcp_factory import create_mcp_server
 from viyv_mcp.app.asgi_builder import (
     ensure_static_dir,
     setup_ws_bridge,
     apply_security,
     build_routes,
+    readiness_route,
 )
 from viyv_mcp.app.lifespan_composer import compose_lifespan
 
@@ -51,34 +53,23 @@ class ViyvMCP:
         self._relay_mcp: McpServer | None = None
         self._relay_mcp_app = None
         self._ws_bridge_hub = None
-        self._ws_registered_tools: dict[str, list[str]] = {}
-        self._bridges = None
+        self._relay_router = None
+        self._bridge_set: BridgeSet | None = None
         self._asgi_app = self._assemble()
 
     # --------------------------------------------------------------------- #
     #  WebSocket コールバック                                                 #
     # --------------------------------------------------------------------- #
     def _on_ws_connect(self, key: str, session):
-        if not self._relay_mcp:
+        if not self._relay_router:
             logger.warning("[ws-bridge] Relay MCP not available, skipping tool registration")
             return
-        tool_names = register_browser_tools_for_session(
-            self._relay_mcp, session, tags={'browser', 'relay'},
-        )
-        self._ws_registered_tools[key] = tool_names
-        logger.info(
-            f"[ws-bridge:{session.key_prefix}] "
-            f"Registered {len(tool_names)} browser tools on relay MCP"
-        )
+        # ツール定義は全接続で共有し、キーごとのルーティング表にだけ追加する
+        self._relay_router.attach(key, session)
 
     def _on_ws_disconnect(self, key: str, session):
-        tool_names = self._ws_registered_tools.pop(key, [])
-        if tool_names and self._relay_mcp:
-            unregister_bridged_tools(self._relay_mcp, tool_names)
-            logger.info(
-                f"[ws-bridge:{session.key_prefix}] "
-                f"Unregistered {len(tool_names)} browser tools from relay MCP"
-            )
+        if self._relay_router:
+            self._relay_router.detach(key, session)
 
     # --------------------------------------------------------------------- #
     #  ASGI アプリ組み立て                                                     #
@@ -103,6 +94,7 @@ class ViyvMCP:
         self._relay_mcp = ws.relay_mcp
         self._relay_mcp_app = ws.relay_mcp_app
         self._ws_bridge_hub = ws.ws_bridge_hub
+        self._relay_router = ws.relay_router
 
         # 4. lifespan をセキュリティ適用前に取得
         mcp_lifespan = _extract_lifespan(self._mcp_app)
@@ -118,25 +110,31 @@ class ViyvMCP:
         bridge_config = self._bridge_config
 
         async def bridges_startup():
+            if self._relay_router:
+                await self._relay_router.start()  # ワーカー間 IPC (RELAY_IPC_DIR)
             logger.info("=== ViyvMCP startup: bridging external MCP servers ===")
-            self._bridges = await init_bridges(self._mcp, bridge_config)
+            await self._start_bridges()
 
         async def bridges_shutdown():
             logger.info("=== ViyvMCP shutdown: closing external MCP servers ===")
-            if self._bridges:
-                await close_bridges(self._bridges)
+            if self._bridge_set:
+                await self._bridge_set.close()
 
-        # 7. 複合 lifespan
+        # 7. 複合 lifespan (監査ログは最後に drain)
         lifespan = compose_lifespan(
             mcp_lifespan=mcp_lifespan,
             relay_lifespan=relay_lifespan,
             bridges_startup=bridges_startup,
             bridges_shutdown=bridges_shutdown,
             ws_bridge_hub=self._ws_bridge_hub,
+            shutdown_hooks=[self._close_relay, self._close_security],
         )
 
         # 8. ルート + Starlette
-        routes = build_routes(ws.ws_routes, static_dir)
+        routes = build_routes(
+            ws.ws_routes, static_dir,
+            extra_routes=[readiness_route(self.readiness)],
+        )
         self._starlette_app = Starlette(routes=routes, lifespan=lifespan)
 
         return self
@@ -151,8 +149,11 @@ class ViyvMCP:
         path = scope.get("path", "")
 
         if path.startswith("/relay/mcp") and self._relay_mcp_app:
-            new_path = path[10:] if len(path) > 10 else "/"
+            # /relay/mcp/{key} はキーの拡張機能へルーティングする
+            relay_key, new_path = split_relay_path(path[10:])
             scope = dict(scope)
+            if relay_key:
+                scope[RELAY_KEY_SCOPE] = relay_key
             scope["path"] = new_path
             scope["raw_path"] = new_path.encode()
             return await self._relay_mcp_app(scope, receive, send)
@@ -171,9 +172,46 @@ class ViyvMCP:
     # --------------------------------------------------------------------- #
     async def run_stdio_async(self):
         """stdio transport で MCP サーバーを起動する。"""
-        bridges = await init_bridges(self._mcp, self._bridge_config)
+        await self._start_bridges()
         try:
             await self._mcp.run_stdio_async()
         finally:
-            if bridges:
-                await close_bridges(bridges)
+            if self._bridge_set:
+                await self._bridge_set.close()
+            await self._close_security()
+
+    # --------------------------------------------------------------------- #
+    #  外部ブリッジ                                                            #
+    # --------------------------------------------------------------------- #
+    async def _start_bridges(self):
+        """BRIDGE_ATTACH_MODE に応じてブリッジを起動する。
+
+        background モードではすぐに戻り、ブリッジが ready になるたびに
+        (まとめて) notifications/tools/list_changed を送る。
+        """
+        self._bridge_set = BridgeSet.from_config(self._bridge_config)
+        if Config.BRIDGE_ATTACH_MODE == "background":
+            logger.info("ViyvMCP: attaching external MCP servers in the background")
+            self._bridge_set.start_background(
+                self._mcp, on_ready=lambda handle: self._mcp.notify_tools_changed(),
+            )
+        else:
+            await self._bridge_set.start(self._mcp)
+        # 落ちたブリッジの自動再起動 (ping / バックオフ / ツール再同期)
+        self._bridge_set.supervise(self._mcp)
+
+    def readiness(self) -> dict:
+        """/ready 用: ブリッジの接続状況。"""
+        if self._bridge_set is None:
+            return {"ready": False, "bridges": {}}
+        return self._bridge_set.status()
+
+    async def _close_relay(self):
+        if self._relay_router:
+            await self._relay_router.close()
+
+    async def _close_security(self):
+        """監査ログの未書き込みレコードを drain する (書き込みスレッドを待つ)。"""
+        svc = self._mcp.security_service if self._mcp else None
+        if svc is not None and hasattr(svc, "close"):
+            await asyncio.to_thread(svc.close)
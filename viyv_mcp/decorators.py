@@ -9,7 +9,14 @@ from typing import (
 from pydantic import create_model
 
 from viyv_mcp.server import McpServer
+from viyv_mcp.server.executor import (
+    EXECUTOR_INLINE, EXECUTOR_MODES, EXECUTOR_PROCESS, EXECUTOR_THREAD,
+)
+from viyv_mcp.server.process_pool import collect_worker_tool, in_tool_worker
 from viyv_mcp.server.registry import ResourceEntry, PromptEntry
+from viyv_mcp.server.concurrency import ConcurrencyLimit
+from viyv_mcp.server.result_cache import CachePolicy
+from viyv_mcp.app.config import Config
 from viyv_mcp.app.entry_registry import add_entry
 
 logger = logging.getLogger(__name__)
@@ -37,16 +44,58 @@ def _get_mcp_from_stack() -> McpServer:
     raise RuntimeError("McpServer instance not found in call-stack")
 
 
-def _ensure_async(fn: Callable) -> Callable:
-    """Wrap a sync function in an async wrapper if needed."""
+def _ensure_async(fn: Callable, pool: Any = None, target: Any = None) -> Callable:
+    """Wrap a sync function in an async wrapper if needed.
+
+    With *pool* (a ``ToolThreadPool`` or ``ToolProcessPool``) the call is
+    dispatched to a worker; without it the function runs inline on the
+    event loop.  *target* replaces *fn* as what the pool runs (the process
+    pool's reference to a tool defined inside ``register(mcp)``).
+    """
     if inspect.iscoroutinefunction(fn):
         return fn
 
+    if pool is None:
+        @functools.wraps(fn)
+        async def _wrapper(*args, **kwargs):
+            return fn(*args, **kwargs)
+
+        return _wrapper
+
+    run_target = fn if target is None else target
+
     @functools.wraps(fn)
-    async def _wrapper(*args, **kwargs):
-        return fn(*args, **kwargs)
+    async def _threaded(*args, **kwargs):
+        return await pool.run(run_target, *args, **kwargs)
+
+    return _threaded
+
+
+def _resolve_executor(tool_name: str, executor: str | None) -> str:
+    """Validate the ``executor`` option, falling back to the configured default."""
+    mode = (executor or Config.TOOL_DEFAULT_EXECUTOR).lower()
+    if mode not in EXECUTOR_MODES:
+        logger.warning(
+            f"Unknown executor '{mode}' for tool '{tool_name}', "
+            f"expected one of {EXECUTOR_MODES}; using '{EXECUTOR_THREAD}'"
+        )
+        return EXECUTOR_THREAD
+    return mode
+
+
+def _select_pool(
+    mcp: McpServer, tool_name: str, fn: Callable, mode: str
+) -> tuple[Any, Any]:
+    """Return ``(pool, target)`` for *mode*; the pool is ``None`` for inline execution.
 
-    return _wrapper
+    For ``"process"`` the target is what the process pool sends to workers
+    (``TypeError`` if *fn* cannot be sent); otherwise it is ``None``.
+    """
+    if mode == EXECUTOR_INLINE:
+        return None, None
+    if mode == EXECUTOR_PROCESS:
+        return mcp.process_pool, mcp.process_pool.attach(fn, tool_name)
+    return mcp.tool_pool, None
 
 
 def _build_input_schema(fn: Callable) -> dict:
@@ -92,15 +141,59 @@ def tool(
     destructive: bool | None = None,
     namespace: str | None = None,
     security_level: int | None = None,
+    executor: str | None = None,
+    read_only: bool | None = None,
+    cache_ttl: float | None = None,
+    cache_size: int = 128,
+    cache_scope: str = "global",
+    single_flight: bool = False,
+    max_concurrency: int | None = None,
+    max_queue: int | None = None,
+    queue_timeout: float | None = None,
 ):
-    """ツールを McpServer に登録するデコレータ。"""
+    """ツールを McpServer に登録するデコレータ。
+
+    ``executor`` は同期 (def) ツールの実行先を指定する:
+    ``"thread"`` (既定。McpServer のワーカースレッドプール)、
+    ``"inline"`` (イベントループ上で直接実行)、または
+    ``"process"`` (CPU 負荷の高いツール向けのワーカープロセス。関数は
+    モジュールトップレベルか、そのモジュールの ``register(mcp)`` の中で
+    定義されている必要がある。それ以外は TypeError)。
+    async ツールには影響しない。
+
+    ``cache_ttl`` (秒) を指定すると、同じ引数での呼び出し結果を最大
+    ``cache_size`` 件まで LRU でキャッシュする。``cache_scope`` は
+    ``"global"`` (全エージェントで共有) / ``"namespace"`` (エージェントの
+    namespace ごと) / ``"agent"`` (エージェントごと)。エラーは
+    キャッシュされず、``destructive=True`` のツールでは無視される。
+    ``read_only`` は MCP の ``readOnlyHint`` として公開される。
+
+    ``single_flight=True`` にすると、同じ引数で同時に来た呼び出しを 1 回の
+    実行にまとめ、後続は先行の結果 (エラーも含む) を待つ。呼び出し元に
+    依存しない冪等なツールにだけ指定すること (キャッシュ付きのツールは
+    常にまとめられる)。
+
+    ``max_concurrency`` を指定すると同時実行数を制限する。上限に達した
+    呼び出しはエージェントごとに公平な待ち行列 (長さ ``max_queue``、
+    最大 ``queue_timeout`` 秒。既定は ``TOOL_QUEUE_MAX`` /
+    ``TOOL_QUEUE_TIMEOUT``) で待ち、溢れたものは -32004 エラーで拒否される。
+    """
 
     def decorator(fn: Callable[..., Any]):
+        # ワーカープロセス内では登録せず、register(mcp) の再実行時に関数だけ集める
+        if in_tool_worker():
+            collect_worker_tool(name or fn.__name__, fn)
+            return fn
+
         mcp = _get_mcp_from_stack()
         tool_name = name or fn.__name__
         tool_desc = description or (fn.__doc__ or f"Viyv tool '{tool_name}'")
 
-        impl = _ensure_async(fn)
+        if inspect.iscoroutinefunction(fn):
+            impl = fn
+        else:
+            mode = _resolve_executor(tool_name, executor)
+            impl = _ensure_async(fn, *_select_pool(mcp, tool_name, fn, mode))
         input_schema = _build_input_schema(fn)
 
         try:
@@ -115,6 +208,20 @@ def tool(
                 destructive=destructive,
                 namespace=namespace,
                 security_level=security_level,
+                read_only=read_only,
+                cache=(
+                    CachePolicy(ttl=cache_ttl, size=cache_size, scope=cache_scope)
+                    if cache_ttl else None
+                ),
+                single_flight=single_flight,
+                concurrency=(
+                    ConcurrencyLimit(
+                        max_concurrency=max_concurrency,
+                        max_queue=Config.TOOL_QUEUE_MAX if max_queue is None else max_queue,
+                        max_wait=Config.TOOL_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout,
+                    )
+                    if max_concurrency else None
+                ),
             )
         except Exception as e:
             logger.error(f"Failed to register tool '{tool_name}': {e}")
@@ -135,6 +242,8 @@ def resource(
     mime_type: str | None = None,
 ):
     def decorator(fn: Callable):
+        if in_tool_worker():
+            return fn
         mcp = _get_mcp_from_stack()
         mcp.registry.register_resource(ResourceEntry(
             uri=uri,
@@ -152,6 +261,8 @@ def resource(
 # --------------------------------------------------------------------------- #
 def prompt(name: str | None = None, description: str | None = None):
     def decorator(fn: Callable):
+        if in_tool_worker():
+            return fn
         mcp = _get_mcp_from_stack()
         mcp.registry.register_prompt(PromptEntry(
             name=name or fn.__name__,
@@ -1,3 +1,4 @@
+from viyv_mcp.server.blob import FileResource
 from viyv_mcp.server.mcp_server import McpServer
 
-__all__ = ["McpServer"]
+__all__ = ["FileResource", "McpServer"]
@@ -0,0 +1,245 @@
+"""Binary (blob) resource contents for ``resources/read``.
+
+Resource functions may return :class:`FileResource` to serve a file from
+disk.  The file is memory-mapped and the requested byte range is
+base64-encoded straight from the mapping, so the raw bytes are never copied
+into a Python ``bytes`` object.  Plain ``bytes`` results are encoded the same
+way.
+
+* Ranges: ``resources/read`` accepts ``<uri>?bytes=START-END`` (inclusive,
+  ``END`` optional) on any blob resource, so clients can fetch a large
+  file chunk by chunk.
+* Inline limit: a single read may return at most ``max_inline_bytes`` raw
+  bytes; larger reads fail with a hint to use ranges instead.
+* Content-hash cache: encoded contents are kept in a byte-bounded LRU keyed
+  by the file's identity (path, inode, size, mtime) and range, so unchanged
+  files are served without touching the disk.  Every blob carries its
+  SHA-256 and total size in ``_meta``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import mimetypes
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+from mcp.shared.exceptions import McpError
+import mcp.types as types
+
+_RANGE_QUERY = re.compile(r"[?&]bytes=(?P<start>\d+)-(?P<end>\d*)$")
+
+
+@dataclass(frozen=True)
+class FileResource:
+    """Return value of a resource function that serves a file.
+
+    ``offset``/``length`` select a byte range; a ``?bytes=`` range in the
+    requested URI is applied on top of it.
+    """
+
+    path: str | os.PathLike
+    mime_type: str | None = None
+    offset: int = 0
+    length: int | None = None
+
+
+def parse_byte_range(uri: str) -> Tuple[str, int, int | None] | None:
+    """Split ``uri?bytes=START-END`` into ``(uri, start, end_exclusive)``.
+
+    Returns None when *uri* carries no byte range.
+    """
+    m = _RANGE_QUERY.search(uri)
+    if m is None:
+        return None
+    start = int(m.group("start"))
+    end = int(m.group("end")) + 1 if m.group("end") else None
+    if end is not None and end <= start:
+        raise McpError(types.ErrorData(
+            code=-32602, message=f"Invalid byte range in '{uri}'",
+        ))
+    return uri[:m.start()], start, end
+
+
+def _clamp(size: int, start: int, end: int | None) -> Tuple[int, int]:
+    start = min(start, size)
+    end = size if end is None else min(end, size)
+    return start, max(start, end)
+
+
+@dataclass
+class _Encoded:
+    blob: str
+    sha256: str
+    size: int  # total size of the underlying data
+    start: int
+    end: int
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.blob)
+
+
+class BlobReader:
+    """Encodes blob results into :class:`types.BlobResourceContents`.
+
+    Thread-safe; file reads and encoding run in a worker thread.
+    """
+
+    def __init__(self, *, max_inline_bytes: int, cache_bytes: int) -> None:
+        self.max_inline_bytes = max_inline_bytes
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[tuple, _Encoded] = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---- public API --------------------------------------------------- #
+
+    async def read_file(
+        self,
+        uri: str,
+        resource: FileResource,
+        *,
+        mime_type: str | None = None,
+        byte_range: Tuple[int, int | None] | None = None,
+    ) -> types.BlobResourceContents:
+        path = os.fspath(resource.path)
+        try:
+            st = os.stat(path)
+        except OSError as exc:
+            raise McpError(types.ErrorData(
+                code=-32603, message=f"Resource '{uri}' is unreadable: {exc.strerror}",
+            ))
+        # The resource's own window, then the requested range inside it
+        start, end = _clamp(
+            st.st_size,
+            resource.offset,
+            None if resource.length is None else resource.offset + resource.length,
+        )
+        if byte_range is not None:
+            start, end = _clamp(end, start + byte_range[0],
+                                None if byte_range[1] is None else start + byte_range[1])
+        self._check_inline(uri, end - start, st.st_size)
+
+        key = (os.path.realpath(path), st.st_ino, st.st_size, st.st_mtime_ns, start, end)
+        encoded = self._cache_get(key)
+        if encoded is None:
+            encoded = await asyncio.to_thread(_encode_file, path, st.st_size, start, end)
+            self._cache_put(key, encoded)
+        return _contents(
+            uri, encoded,
+            resource.mime_type or mime_type or mimetypes.guess_type(path)[0],
+        )
+
+    def encode_bytes(
+        self,
+        uri: str,
+        data: bytes | bytearray | memoryview,
+        *,
+        mime_type: str | None = None,
+        byte_range: Tuple[int, int | None] | None = None,
+    ) -> types.BlobResourceContents:
+        view = memoryview(data).cast("B")
+        start, end = _clamp(len(view), *(byte_range or (0, None)))
+        self._check_inline(uri, end - start, len(view))
+        return _contents(uri, _encode(view, len(view), start, end), mime_type)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "cached_bytes": self._cached_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    # ---- internals ---------------------------------------------------- #
+
+    def _check_inline(self, uri: str, nbytes: int, total: int) -> None:
+        limit = self.max_inline_bytes
+        if limit and nbytes > limit:
+            raise McpError(types.ErrorData(
+                code=-32602,
+                message=(
+                    f"Resource '{uri}' is {total} bytes; a single read is limited to "
+                    f"{limit} bytes. Read it in ranges, e.g. '{uri}?bytes=0-{limit - 1}'"
+                ),
+            ))
+
+    def _cache_get(self, key: tuple) -> _Encoded | None:
+        with self._lock:
+            encoded = self._cache.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return encoded
+
+    def _cache_put(self, key: tuple, encoded: _Encoded) -> None:
+        if encoded.nbytes > self.cache_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._cached_bytes -= old.nbytes
+            self._cache[key] = encoded
+            self._cached_bytes += encoded.nbytes
+            while self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted.nbytes
+
+
+def _encode(view: memoryview, size: int, start: int, end: int) -> _Encoded:
+    window = view[start:end]
+    try:
+        return _Encoded(
+            blob=base64.b64encode(window).decode("ascii"),
+            sha256=hashlib.sha256(window).hexdigest(),
+            size=size,
+            start=start,
+            end=end,
+        )
+    finally:
+        window.release()
+
+
+def _encode_file(path: str, size: int, start: int, end: int) -> _Encoded:
+    if end <= start:
+        return _encode(memoryview(b""), size, 0, 0)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            # The file may have shrunk since stat(); clamp to the mapping
+            start, end = _clamp(len(mm), start, end)
+            return _encode(view, size, start, end)
+        finally:
+            view.release()
+
+
+def _contents(uri: str, encoded: _Encoded, mime_type: str | None) -> types.BlobResourceContents:
+    meta: dict[str, Any] = {"sha256": encoded.sha256, "size": encoded.size}
+    if (encoded.start, encoded.end) != (0, encoded.size):
+        meta["range"] = [encoded.start, encoded.end]
+    return types.BlobResourceContents(
+        uri=uri,
+        blob=encoded.blob,
+        mimeType=mime_type or "application/octet-stream",
+        _meta=meta,
+    )
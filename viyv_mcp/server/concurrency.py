@@ -0,0 +1,239 @@
+"""Concurrency limits for tool calls, with fair bounded queues.
+
+Limits can be declared at three levels, and a call must hold a slot at
+every level that applies to it (acquired in the order tool → group →
+namespace, so two calls can never deadlock):
+
+* per tool: ``@tool(max_concurrency=...)`` or a bridge's ``"concurrency"``
+* per group: ``TOOL_GROUP_CONCURRENCY`` or :meth:`ConcurrencyLimits.set_limit`
+* per namespace: ``TOOL_NAMESPACE_CONCURRENCY`` or :meth:`ConcurrencyLimits.set_limit`
+
+A call that finds the level saturated waits in a queue.  Each level has one
+FIFO per caller (agent), and freed slots go to the callers round-robin, so
+one agent flooding a tool cannot starve the others.  A queue is bounded by
+``max_queue`` waiters (``0`` rejects immediately) and ``max_wait`` seconds
+(``0`` waits indefinitely).  A shed call fails with
+:data:`OVERLOADED_ERROR_CODE`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from mcp.shared.exceptions import McpError
+import mcp.types as types
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC error code of a call rejected by a concurrency limit
+OVERLOADED_ERROR_CODE = -32004
+
+LIMIT_SCOPES = ("tool", "group", "namespace")
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimit:
+    """At most ``max_concurrency`` calls at once, plus a bounded queue."""
+
+    max_concurrency: int
+    max_queue: int = 64
+    max_wait: float = 30.0
+
+    @classmethod
+    def parse(cls, value: Any, *, max_queue: int = 64, max_wait: float = 30.0) -> "ConcurrencyLimit":
+        """Build from ``N`` or ``{"max": N, "queue": Q, "timeout": T}``."""
+        if isinstance(value, dict):
+            return cls(
+                max_concurrency=int(value["max"]),
+                max_queue=int(value.get("queue", max_queue)),
+                max_wait=float(value.get("timeout", max_wait)),
+            )
+        return cls(max_concurrency=int(value), max_queue=max_queue, max_wait=max_wait)
+
+
+def limits_from_json(raw: str, *, max_queue: int = 64, max_wait: float = 30.0) -> dict[str, ConcurrencyLimit]:
+    """Parse ``{"name": N | {"max": ..., "queue": ..., "timeout": ...}}``."""
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+        return {
+            name: ConcurrencyLimit.parse(value, max_queue=max_queue, max_wait=max_wait)
+            for name, value in data.items()
+        }
+    except (ValueError, TypeError, KeyError, AttributeError) as exc:
+        logger.warning(f"Ignoring invalid concurrency limits {raw!r}: {exc}")
+        return {}
+
+
+class _Shed(Exception):
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+
+class FairLimiter:
+    """Counting semaphore whose waiters are served round-robin per party."""
+
+    def __init__(self, limit: ConcurrencyLimit) -> None:
+        self.limit = limit
+        self.active = 0
+        self.queued = 0
+        # party -> waiters; the first party is served next
+        self._queues: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def acquire(self, party: str = "") -> None:
+        if self.active < self.limit.max_concurrency and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            return
+        if self.queued >= self.limit.max_queue:
+            self.rejected += 1
+            raise _Shed("queue full")
+
+        fut = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(party, deque()).append(fut)
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait({fut}, timeout=self.limit.max_wait or None)
+        except asyncio.CancelledError:
+            if fut.done():
+                self.release()  # granted just as the caller went away
+            else:
+                self._withdraw(party, fut)
+            raise
+        if not fut.done():
+            self._withdraw(party, fut)
+            self.timed_out += 1
+            raise _Shed(f"waited {self.limit.max_wait:g}s")
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.waited += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def release(self) -> None:
+        self.active -= 1
+        while self.queued and self.active < self.limit.max_concurrency:
+            party, waiters = self._queues.popitem(last=False)
+            fut = waiters.popleft()
+            if waiters:
+                self._queues[party] = waiters  # back of the rotation
+            self.queued -= 1
+            fut.set_result(None)
+            self.active += 1
+
+    def _withdraw(self, party: str, fut: asyncio.Future) -> None:
+        waiters = self._queues.get(party)
+        if waiters is not None and fut in waiters:
+            waiters.remove(fut)
+            self.queued -= 1
+            if not waiters:
+                del self._queues[party]
+        fut.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.limit.max_concurrency,
+            "active": self.active,
+            "queue_depth": self.queued,
+            "max_queue": self.limit.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_avg": self.wait_total / self.waited if self.waited else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+class ConcurrencyLimits:
+    """The tool, group and namespace limiters of one :class:`McpServer`."""
+
+    def __init__(
+        self,
+        *,
+        groups: dict[str, ConcurrencyLimit] | None = None,
+        namespaces: dict[str, ConcurrencyLimit] | None = None,
+    ) -> None:
+        self._limiters: dict[tuple[str, str], FairLimiter] = {}
+        for name, limit in (groups or {}).items():
+            self.set_limit("group", name, limit)
+        for name, limit in (namespaces or {}).items():
+            self.set_limit("namespace", name, limit)
+
+    def set_limit(self, scope: str, name: str, limit: ConcurrencyLimit | None) -> None:
+        """Set (or with ``None`` remove) the limit of a group or namespace."""
+        if scope not in LIMIT_SCOPES:
+            raise ValueError(f"Unknown limit scope '{scope}' (expected one of {LIMIT_SCOPES})")
+        key = (scope, name)
+        if limit is None:
+            self._limiters.pop(key, None)
+        elif key in self._limiters:
+            self._limiters[key].limit = limit
+        else:
+            self._limiters[key] = FairLimiter(limit)
+
+    def _limiters_for(self, entry: Any) -> list[tuple[str, FairLimiter]]:
+        found = []
+        if entry.concurrency is not None:
+            limiter = self._limiters.get(("tool", entry.name))
+            if limiter is None:
+                limiter = self._limiters[("tool", entry.name)] = FairLimiter(entry.concurrency)
+            else:
+                limiter.limit = entry.concurrency  # may change on re-registration
+            found.append((f"tool '{entry.name}'", limiter))
+        if not self._limiters:
+            return found
+        if entry.group:
+            limiter = self._limiters.get(("group", entry.group))
+            if limiter is not None:
+                found.append((f"group '{entry.group}'", limiter))
+        limiter = self._limiters.get(("namespace", entry.security.namespace))
+        if limiter is not None:
+            found.append((f"namespace '{entry.security.namespace}'", limiter))
+        return found
+
+    @asynccontextmanager
+    async def slot(self, entry: Any, party: str = "") -> AsyncIterator[None]:
+        """Hold a slot at every level limiting *entry* for the block's duration.
+
+        Raises :class:`McpError` with :data:`OVERLOADED_ERROR_CODE` when a
+        call is shed.
+        """
+        limiters = self._limiters_for(entry)
+        held: list[FairLimiter] = []
+        try:
+            for label, limiter in limiters:
+                try:
+                    await limiter.acquire(party)
+                except _Shed as shed:
+                    raise McpError(types.ErrorData(
+                        code=OVERLOADED_ERROR_CODE,
+                        message=(
+                            f"Tool '{entry.name}' is overloaded: {label} is at "
+                            f"{limiter.limit.max_concurrency} concurrent calls ({shed.reason})"
+                        ),
+                        data={"scope": label, "reason": shed.reason},
+                    ))
+                held.append(limiter)
+            yield
+        finally:
+            for limiter in reversed(held):
+                limiter.release()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Queue depth, wait times and shed counts per ``"<scope>:<name>"``."""
+        return {f"{scope}:{name}": lim.stats() for (scope, name), lim in self._limiters.items()}
@@ -0,0 +1,122 @@
+"""Worker pools for running synchronous tool functions off the event loop.
+
+A plain ``def`` tool registered through ``@tool`` would otherwise run on the
+uvicorn event loop and stall every other MCP session, WS relay message and
+health check for its full duration.  :class:`ToolThreadPool` dispatches such
+calls to a bounded :class:`~concurrent.futures.ThreadPoolExecutor` while
+propagating :mod:`contextvars` (e.g. the agent identity) into the worker.
+CPU-bound tools can use the process pool in
+:mod:`viyv_mcp.server.process_pool` instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_INLINE = "inline"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+EXECUTOR_MODES = (EXECUTOR_INLINE, EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+
+class ToolThreadPool:
+    """Bounded, lazily started thread pool for synchronous tools.
+
+    The underlying executor is created on first use and recreated after
+    :meth:`shutdown`, so a server whose lifespan runs more than once (tests,
+    reloads) keeps working.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        thread_name_prefix: str = "viyv-tool",
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._finished = 0
+        self._failed = 0
+        self._active = 0
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix=self._thread_name_prefix,
+                )
+            return self._executor
+
+    async def run(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` in a worker thread and await the result.
+
+        The caller's context is copied so ContextVars such as
+        :func:`~viyv_mcp.app.security.context.get_agent_identity` resolve to
+        the same values inside the worker.
+        """
+        ctx = contextvars.copy_context()
+
+        def _invoke() -> Any:
+            with self._lock:
+                self._active += 1
+            try:
+                return ctx.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        executor = self._get_executor()
+        with self._lock:
+            self._submitted += 1
+        cfut = executor.submit(_invoke)
+        cfut.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(cfut)
+
+    def _on_done(self, cfut: Future) -> None:
+        with self._lock:
+            self._finished += 1
+            if cfut.cancelled() or cfut.exception() is not None:
+                self._failed += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool usage.
+
+        ``queued`` counts calls waiting for a free worker; ``utilization`` is
+        the fraction of workers currently busy.
+        """
+        with self._lock:
+            in_flight = self._submitted - self._finished
+            return {
+                "max_workers": self._max_workers,
+                "active": self._active,
+                "queued": max(0, in_flight - self._active),
+                "utilization": self._active / self._max_workers,
+                "submitted": self._submitted,
+                "completed": self._finished - self._failed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker threads.  A later :meth:`run` starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+            logger.debug(f"Tool thread pool '{self._thread_name_prefix}' shut down")
@@ -7,9 +7,12 @@ security at the handler level, and provides both stdio and HTTP transports.
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import inspect
 import json
 import logging
+import weakref
 from contextlib import asynccontextmanager
 from typing import Any, Callable
 
@@ -21,16 +24,69 @@ import mcp.types as types
 from starlette.applications import Starlette
 from starlette.routing import Mount
 
+from viyv_mcp.server.blob import BlobReader, FileResource, parse_byte_range
+from viyv_mcp.server.concurrency import (
+    OVERLOADED_ERROR_CODE,
+    ConcurrencyLimit,
+    ConcurrencyLimits,
+    limits_from_json,
+)
+from viyv_mcp.server.executor import ToolThreadPool
+from viyv_mcp.server.process_pool import ToolProcessPool
+from viyv_mcp.server.result_cache import (
+    CachePolicy,
+    ToolResultCache,
+    argument_key,
+    scope_key,
+)
+from viyv_mcp.server.single_flight import SingleFlight
 from viyv_mcp.server.registry import (
     McpRegistry,
     ToolEntry,
     ResourceEntry,
     PromptEntry,
 )
+from viyv_mcp.app.config import Config
 from viyv_mcp.app.security.domain.models import ToolSecurityMeta
 
 logger = logging.getLogger(__name__)
 
+# Distinct trusted-namespace sets cached per registry version
+_VISIBLE_TOOL_CACHE_SIZE = 1024
+
+# Shed tools/call errors of the current request (see _register_handlers)
+_shed_errors: contextvars.ContextVar[list[McpError] | None] = contextvars.ContextVar(
+    "viyv_shed_errors", default=None,
+)
+
+# notify_list_changed() kind -> ServerSession method
+_LIST_CHANGED_SENDERS = {
+    "tools": "send_tool_list_changed",
+    "resources": "send_resource_list_changed",
+    "prompts": "send_prompt_list_changed",
+}
+
+
+class _LowLevelServer(LowLevelServer):
+    """Low-level server that advertises ``listChanged`` by default.
+
+    ``StreamableHTTPSessionManager`` calls :meth:`create_initialization_options`
+    without arguments, which would otherwise leave the capability off.
+    """
+
+    def create_initialization_options(
+        self,
+        notification_options: NotificationOptions | None = None,
+        experimental_capabilities: dict[str, dict[str, Any]] | None = None,
+    ):
+        return super().create_initialization_options(
+            notification_options
+            or NotificationOptions(
+                tools_changed=True, resources_changed=True, prompts_changed=True,
+            ),
+            experimental_capabilities,
+        )
+
 
 class McpServer:
     """MCP server using the ``mcp`` SDK directly (no FastMCP).
@@ -46,10 +102,38 @@ class McpServer:
         *,
         version: str | None = None,
         lifespan: Callable | None = None,
+        tool_thread_pool_size: int | None = None,
     ) -> None:
         self.name = name
         self.registry = McpRegistry()
         self._security_service: Any = None
+        # Worker threads for synchronous tools (see decorators._ensure_async)
+        self.tool_pool = ToolThreadPool(
+            tool_thread_pool_size or Config.TOOL_THREAD_POOL_SIZE
+        )
+        # Worker processes for CPU-bound tools (@tool(executor="process"))
+        self.process_pool = ToolProcessPool(
+            Config.TOOL_PROCESS_POOL_SIZE,
+            max_calls_per_worker=Config.TOOL_PROCESS_MAX_CALLS,
+            shm_threshold=Config.TOOL_SHM_THRESHOLD_BYTES,
+        )
+        # Results of tools registered with a CachePolicy
+        self.result_cache = ToolResultCache()
+        # In-flight calls of single_flight (and cached) tools, by arguments
+        self.single_flight = SingleFlight()
+        # Tool / group / namespace concurrency limits
+        queue_defaults = {
+            "max_queue": Config.TOOL_QUEUE_MAX, "max_wait": Config.TOOL_QUEUE_TIMEOUT,
+        }
+        self.concurrency = ConcurrencyLimits(
+            groups=limits_from_json(Config.TOOL_GROUP_CONCURRENCY, **queue_defaults),
+            namespaces=limits_from_json(Config.TOOL_NAMESPACE_CONCURRENCY, **queue_defaults),
+        )
+        # Encodes bytes / FileResource results of resources/read
+        self.blob_reader = BlobReader(
+            max_inline_bytes=Config.RESOURCE_MAX_INLINE_BYTES,
+            cache_bytes=Config.RESOURCE_BLOB_CACHE_BYTES,
+        )
 
         if lifespan is None:
             @asynccontextmanager
@@ -59,8 +143,20 @@ class McpServer:
 
         self._resource_handlers_registered = False
         self._prompt_handlers_registered = False
-
-        self._server = LowLevelServer(
+        # (registry version, materialized tools, tools/list result)
+        self._tool_list_cache: tuple[int, list[types.Tool], types.ServerResult] | None = None
+        self._tool_by_name: dict[str, types.Tool] = {}
+        # trusted-namespace set -> filtered tools/list result (valid for one version)
+        self._visible_tool_cache: dict[frozenset[str], types.ServerResult] = {}
+        self._visible_tool_cache_version: tuple[int, int] | None = None
+        # Sessions that listed tools/resources/prompts; targets of list_changed
+        self._sessions: weakref.WeakSet = weakref.WeakSet()
+        self._list_changed_task: asyncio.Task | None = None
+        self._pending_changes: set[str] = set()
+        # Seconds to wait so that a burst of changes yields one notification
+        self.tools_changed_delay = 0.1
+
+        self._server = _LowLevelServer(
             name=name,
             version=version,
             lifespan=lifespan,
@@ -78,31 +174,44 @@ class McpServer:
 
     def set_security_service(self, service: Any) -> None:
         self._security_service = service
+        self._visible_tool_cache = {}
+        self._visible_tool_cache_version = None
+
+    @property
+    def security_service(self) -> Any:
+        return self._security_service
 
     # ------------------------------------------------------------------ #
     #  MCP protocol handlers                                              #
     # ------------------------------------------------------------------ #
 
     def _register_handlers(self) -> None:
-        @self._server.list_tools()
-        async def handle_list_tools() -> list[types.Tool]:
-            entries = self.registry.list_tools()
-            tools = [e.to_mcp_tool() for e in entries]
+        # tools/list is installed directly (not via the decorator) so that a
+        # repeat listing returns the memoized result without re-validating
+        # and re-indexing every tool on each request.
+        async def handle_list_tools(
+            req: types.ListToolsRequest | None = None,
+        ) -> types.ServerResult:
+            self._track_session()
+            _, tools, result = self._materialize_tools()
             svc = self._security_service
             if svc and not svc.is_bypass:
                 from viyv_mcp.app.security.context import get_agent_identity
 
                 agent = get_agent_identity()
                 if agent is None:
-                    return []
-                return svc.filter_tools_for_agent(agent, tools)
-            return tools
+                    return types.ServerResult(types.ListToolsResult(tools=[]))
+                return self._visible_tools_result(svc, svc.trusted_namespaces(agent))
+            return result
+
+        self._server.request_handlers[types.ListToolsRequest] = handle_list_tools
 
         @self._server.call_tool()
         async def handle_call_tool(
             name: str, arguments: dict | None
         ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
             svc = self._security_service
+            agent = None
             if svc and not svc.is_bypass:
                 from viyv_mcp.app.security.context import get_agent_identity
 
@@ -111,8 +220,9 @@ class McpServer:
                     raise McpError(
                         types.ErrorData(code=-32001, message="Authentication failed")
                     )
-                result = svc.authorize_tool_call(agent, name)
-                svc.log_access(agent, name, result)
+                meta = svc.tool_meta(name)
+                result = svc.authorize_tool_call(agent, name, meta=meta)
+                svc.log_access(agent, name, result, meta=meta)
                 if not result.allowed:
                     if result.reason == "namespace":
                         raise McpError(
@@ -135,16 +245,117 @@ class McpServer:
                 raise McpError(
                     types.ErrorData(code=-32601, message=f"Tool '{name}' not found")
                 )
+            # Authorization above runs on every call; only the result is cached
+            cache_key = None
+            if entry.cache is not None:
+                cache_key = argument_key(arguments, scope_key(entry.cache, agent))
+                cached = self.result_cache.get(entry, cache_key)
+                if cached is not None:
+                    return cached
+
+            async def invoke():
+                try:
+                    async with self.concurrency.slot(entry, agent.sub if agent else ""):
+                        raw = await entry.fn(**(arguments or {}))
+                except McpError:
+                    raise
+                except Exception as exc:
+                    logger.warning(f"Tool '{name}' raised: {type(exc).__name__}: {exc}")
+                    raise McpError(
+                        types.ErrorData(code=-32000, message=str(exc))
+                    )
+                content = _normalize_tool_result(raw)
+                if cache_key is not None and not getattr(raw, "isError", False):
+                    self.result_cache.put(entry, cache_key, content)
+                return content
+
             try:
-                raw = await entry.fn(**(arguments or {}))
-            except McpError:
+                # Cache misses of cached tools are coalesced as well
+                if entry.single_flight or cache_key is not None:
+                    flight_key = cache_key or argument_key(arguments)
+                    return await self.single_flight.run((name, flight_key), invoke)
+                return await invoke()
+            except McpError as exc:
+                shed = _shed_errors.get()
+                if exc.error.code == OVERLOADED_ERROR_CODE and shed is not None:
+                    shed.append(exc)
                 raise
-            except Exception as exc:
-                logger.warning(f"Tool '{name}' raised: {type(exc).__name__}: {exc}")
-                raise McpError(
-                    types.ErrorData(code=-32000, message=str(exc))
-                )
-            return _normalize_tool_result(raw)
+
+        # The SDK's tools/call handler turns every exception into an isError
+        # result; a shed call must instead reach the client as a JSON-RPC
+        # error carrying OVERLOADED_ERROR_CODE, so it is re-raised here.
+        sdk_call_tool = self._server.request_handlers[types.CallToolRequest]
+
+        async def handle_call_tool_request(req: types.CallToolRequest) -> types.ServerResult:
+            shed: list[McpError] = []
+            token = _shed_errors.set(shed)
+            try:
+                result = await sdk_call_tool(req)
+            finally:
+                _shed_errors.reset(token)
+            if shed:
+                raise shed[0]
+            return result
+
+        self._server.request_handlers[types.CallToolRequest] = handle_call_tool_request
+
+    def _materialize_tools(
+        self,
+    ) -> tuple[int, list[types.Tool], types.ServerResult]:
+        """Return the ``types.Tool`` list for the current registry version.
+
+        Rebuilt only when :attr:`McpRegistry.version` changes; the low-level
+        server's tool cache (used for input validation) is refreshed at the
+        same time.
+        """
+        cached = self._tool_list_cache
+        if cached is not None and cached[0] == self.registry.version:
+            return cached
+        version, entries = self.registry.snapshot_tools()
+        tools = [e.to_mcp_tool() for e in entries]
+        result = types.ServerResult(types.ListToolsResult(tools=tools))
+        self._tool_by_name = {t.name: t for t in tools}
+        self._server._tool_cache = dict(self._tool_by_name)
+        self._tool_list_cache = (version, tools, result)
+        return self._tool_list_cache
+
+    def _visible_tools_result(self, svc: Any, trusted: frozenset[str]) -> types.ServerResult:
+        """tools/list result for an agent trusting the *trusted* namespaces.
+
+        Namespaces come from the metadata provider *svc* authorizes
+        tools/call with, which is not this server's registry when one
+        service is shared (e.g. by the relay server), so listing and calling
+        agree.  Cached per namespace set while this registry and the
+        provider keep their versions, so after the first call an agent's
+        listing costs one dict lookup.  Providers without a ``version`` are
+        not cached.
+        """
+        provider = svc.tool_registry
+        provider_version = getattr(provider, "version", None)
+        cacheable = provider_version is not None
+        if cacheable:
+            version = (self.registry.version, provider_version)
+            if version != self._visible_tool_cache_version:
+                self._visible_tool_cache = {}
+                self._visible_tool_cache_version = version
+            cached = self._visible_tool_cache.get(trusted)
+            if cached is not None:
+                return cached
+
+        _, tools, _ = self._materialize_tools()
+        if provider is self.registry:
+            by_name = self._tool_by_name
+            names = self.registry.tool_names_in_namespaces(trusted)
+            visible = [by_name[n] for n in names if n in by_name]
+        else:
+            visible = svc.filter_tools_by_namespaces(trusted, tools)
+        result = types.ServerResult(types.ListToolsResult(tools=visible))
+        if not cacheable:
+            return result
+        if len(self._visible_tool_cache) >= _VISIBLE_TOOL_CACHE_SIZE:
+            self._visible_tool_cache.clear()
+        self._visible_tool_cache[trusted] = result
+        return result
 
     def _register_resource_handlers(self) -> None:
         """Register resource handlers lazily (called on first resource registration)."""
@@ -154,6 +365,7 @@ class McpServer:
 
         @self._server.list_resources()
         async def handle_list_resources() -> list[types.Resource]:
+            self._track_session()
             return [
                 types.Resource(
                     uri=types.AnyUrl(e.uri),
@@ -162,22 +374,102 @@ class McpServer:
                     mimeType=e.mime_type,
                 )
                 for e in self.registry.list_resources()
+                if not e.is_template
             ]
 
-        @self._server.read_resource()
-        async def handle_read_resource(uri: types.AnyUrl) -> str | bytes:
-            uri_str = str(uri)
-            entry = self.registry.get_resource(uri_str)
-            if entry is None:
-                raise McpError(
-                    types.ErrorData(
-                        code=-32601, message=f"Resource '{uri_str}' not found"
-                    )
+        @self._server.list_resource_templates()
+        async def handle_list_resource_templates() -> list[types.ResourceTemplate]:
+            self._track_session()
+            return [
+                types.ResourceTemplate(
+                    uriTemplate=e.uri,
+                    name=e.name,
+                    description=e.description,
+                    mimeType=e.mime_type,
                 )
-            fn = entry.fn
-            if inspect.iscoroutinefunction(fn):
-                return await fn(uri=uri_str)
-            return fn(uri=uri_str)
+                for e in self.registry.list_resources()
+                if e.is_template
+            ]
+
+        # resources/read is installed directly (not via the decorator) so
+        # that blobs are emitted as BlobResourceContents with their _meta
+        # and the entry's mime type, instead of bare str/bytes.
+        async def handle_read_resource(req: types.ReadResourceRequest) -> types.ServerResult:
+            contents = await self._read_resource(str(req.params.uri))
+            return types.ServerResult(types.ReadResourceResult(contents=contents))
+
+        self._server.request_handlers[types.ReadResourceRequest] = handle_read_resource
+
+    async def _read_resource(
+        self, uri: str,
+    ) -> list[types.TextResourceContents | types.BlobResourceContents]:
+        resolved = self.registry.resolve_resource(uri)
+        byte_range = None
+        resource_uri = uri
+        if resolved is None:
+            # "<uri>?bytes=START-END" reads part of a blob resource
+            parsed = parse_byte_range(uri)
+            if parsed is not None:
+                resource_uri, start, end = parsed
+                byte_range = (start, end)
+                resolved = self.registry.resolve_resource(resource_uri)
+        if resolved is None:
+            raise McpError(
+                types.ErrorData(
+                    code=-32601, message=f"Resource '{uri}' not found"
+                )
+            )
+        entry, variables = resolved
+        # Templates receive their variables; concrete resources the URI
+        kwargs = variables if entry.is_template else {"uri": resource_uri}
+        fn = entry.fn
+        if inspect.iscoroutinefunction(fn):
+            result = await fn(**kwargs)
+        else:
+            result = fn(**kwargs)
+        return await self._resource_contents(uri, result, entry.mime_type, byte_range)
+
+    async def _resource_contents(
+        self,
+        uri: str,
+        result: Any,
+        mime_type: str | None,
+        byte_range: tuple[int, int | None] | None,
+    ) -> list[types.TextResourceContents | types.BlobResourceContents]:
+        """Convert a resource function's return value into contents."""
+        if isinstance(result, FileResource):
+            return [await self.blob_reader.read_file(
+                uri, result, mime_type=mime_type, byte_range=byte_range,
+            )]
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            return [self.blob_reader.encode_bytes(
+                uri, result, mime_type=mime_type, byte_range=byte_range,
+            )]
+        if byte_range is not None:
+            raise McpError(
+                types.ErrorData(
+                    code=-32602,
+                    message=f"Resource '{uri}' does not support byte ranges",
+                )
+            )
+        if isinstance(result, types.ReadResourceResult):
+            return list(result.contents)
+        if isinstance(result, (types.TextResourceContents, types.BlobResourceContents)):
+            return [result]
+        if isinstance(result, (list, tuple)) and all(
+            isinstance(c, (types.TextResourceContents, types.BlobResourceContents))
+            for c in result
+        ):
+            # e.g. a bridged resource forwarding the upstream contents as-is
+            return list(result)
+        if isinstance(result, str):
+            text = result
+        else:
+            text = json.dumps(result, ensure_ascii=False, default=str)
+            mime_type = mime_type or "application/json"
+        return [types.TextResourceContents(
+            uri=uri, text=text, mimeType=mime_type or "text/plain",
+        )]
 
     def _register_prompt_handlers(self) -> None:
         """Register prompt handlers lazily (called on first prompt registration)."""
@@ -187,6 +479,7 @@ class McpServer:
 
         @self._server.list_prompts()
         async def handle_list_prompts() -> list[types.Prompt]:
+            self._track_session()
             return [
                 types.Prompt(
                     name=e.name,
@@ -242,6 +535,10 @@ class McpServer:
         destructive: bool | None = None,
         namespace: str | None = None,
         security_level: int | None = None,
+        read_only: bool | None = None,
+        cache: CachePolicy | None = None,
+        single_flight: bool = False,
+        concurrency: ConcurrencyLimit | None = None,
     ) -> None:
         entry = ToolEntry(
             name=name,
@@ -256,12 +553,74 @@ class McpServer:
                 namespace=namespace or "common",
                 security_level=security_level,
             ),
+            read_only=read_only,
+            cache=cache,
+            single_flight=single_flight,
+            concurrency=concurrency,
         )
         self.registry.register_tool(entry)
 
     def remove_tool(self, name: str) -> None:
         self.registry.unregister_tool(name)
 
+    # ------------------------------------------------------------------ #
+    #  */list_changed                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _track_session(self) -> None:
+        try:
+            session = self._server.request_context.session
+        except LookupError:
+            return
+        self._sessions.add(session)
+
+    def notify_tools_changed(self) -> None:
+        """Schedule ``notifications/tools/list_changed`` to connected sessions."""
+        self.notify_list_changed("tools")
+
+    def notify_list_changed(self, *kinds: str) -> None:
+        """Schedule ``notifications/<kind>/list_changed`` for each of *kinds*.
+
+        *kinds* are ``"tools"``, ``"resources"`` and/or ``"prompts"``.  Calls
+        within :attr:`tools_changed_delay` of each other are coalesced into a
+        single notification per kind and session.  A no-op outside an event
+        loop.
+        """
+        unknown = set(kinds) - set(_LIST_CHANGED_SENDERS)
+        if unknown:
+            raise ValueError(f"Unknown list kind(s): {sorted(unknown)}")
+        if not kinds:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._pending_changes.update(kinds)
+        task = self._list_changed_task
+        if task is not None and not task.done():
+            return
+        self._list_changed_task = loop.create_task(self._send_list_changed())
+
+    async def _send_list_changed(self) -> None:
+        await asyncio.sleep(self.tools_changed_delay)
+        # Changes arriving from here on schedule a fresh notification
+        self._list_changed_task = None
+        kinds = sorted(self._pending_changes)
+        self._pending_changes.clear()
+        sessions = list(self._sessions)
+        for session in sessions:
+            try:
+                for kind in kinds:
+                    await getattr(session, _LIST_CHANGED_SENDERS[kind])()
+            except Exception as exc:
+                # Closed sessions (e.g. stateless HTTP requests) are dropped
+                logger.debug(f"list_changed not delivered: {exc}")
+                self._sessions.discard(session)
+        if sessions:
+            logger.info(
+                f"Sent {'/'.join(kinds)} list_changed to {len(sessions)} session(s)"
+            )
+
     # ------------------------------------------------------------------ #
     #  HTTP Transport                                                     #
     # ------------------------------------------------------------------ #
@@ -287,7 +646,11 @@ class McpServer:
         async def lifespan(app):
             async with session_manager.run():
                 logger.info(f"MCP HTTP transport ready (stateless={bool(stateless_http)})")
-                yield
+                await self._start_worker_pools()
+                try:
+                    yield
+                finally:
+                    self._shutdown_worker_pools()
 
         return Starlette(
             routes=[Mount(path, app=handle_mcp)],
@@ -301,11 +664,29 @@ class McpServer:
     async def run_stdio_async(self) -> None:
         """Run the server over stdio transport."""
         async with stdio_server() as (read_stream, write_stream):
-            init_options = self._server.create_initialization_options(
-                notification_options=NotificationOptions(tools_changed=True),
-            )
+            init_options = self._server.create_initialization_options()
             logger.info(f"Starting MCP server '{self.name}' with transport 'stdio'")
-            await self._server.run(read_stream, write_stream, init_options)
+            await self._start_worker_pools()
+            try:
+                await self._server.run(read_stream, write_stream, init_options)
+            finally:
+                self._shutdown_worker_pools()
+
+    # ------------------------------------------------------------------ #
+    #  Worker pools                                                       #
+    # ------------------------------------------------------------------ #
+
+    async def _start_worker_pools(self) -> None:
+        """Warm the process pool when any tool uses ``executor="process"``."""
+        if self.process_pool.in_use:
+            try:
+                await self.process_pool.start()
+            except Exception as exc:
+                logger.error(f"Failed to warm tool process pool: {exc}")
+
+    def _shutdown_worker_pools(self) -> None:
+        self.tool_pool.shutdown()
+        self.process_pool.shutdown()
 
 
 def _normalize_tool_result(
@@ -0,0 +1,396 @@
+"""Warm process pool for CPU-bound tools (``@tool(executor="process")``).
+
+GIL-bound tools cannot use more than one core per thread, so
+:class:`ToolProcessPool` runs them in separate worker processes:
+
+* Large ``bytes``/``bytearray`` arguments and homogeneous ``list[float]`` /
+  ``list[int]`` arguments are handed over through
+  :mod:`multiprocessing.shared_memory` instead of being pickled.
+* Workers are recycled after a configurable number of calls.
+* A crashed worker surfaces as an :class:`McpError` and the pool is rebuilt,
+  instead of leaving the MCP call hanging.
+
+Module-level tool functions are sent to workers **by reference**.  Tools
+defined inside a module's ``register(mcp)`` (the usual layout) are sent as a
+:class:`_ToolRef` (module + tool name): the worker imports the module, runs
+its ``register`` against a stub that only collects ``@tool`` functions, and
+caches them.  ContextVars are not propagated across the process boundary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+from mcp.shared.exceptions import McpError
+import mcp.types as types
+
+logger = logging.getLogger(__name__)
+
+# True inside pool workers; decorators skip registration there
+_IN_WORKER = False
+
+# Worker side: tool name -> function, filled while a module's register() runs
+_collecting: dict[str, Callable[..., Any]] | None = None
+# Worker side: (module, tool name) -> function resolved from a _ToolRef
+_resolved: dict[tuple[str, str], Callable[..., Any]] = {}
+
+# Native per-worker recycling (max_tasks_per_child) requires Python 3.11+
+_NATIVE_RECYCLING = sys.version_info >= (3, 11)
+
+
+def in_tool_worker() -> bool:
+    """Return ``True`` when running inside a :class:`ToolProcessPool` worker."""
+    return _IN_WORKER
+
+
+def collect_worker_tool(name: str, fn: Callable[..., Any]) -> None:
+    """Record a ``@tool`` function while a worker resolves a :class:`_ToolRef`."""
+    if _collecting is not None:
+        _collecting[name] = fn
+
+
+@dataclass(frozen=True)
+class _ToolRef:
+    """Picklable reference to a tool defined inside ``<module>.register(mcp)``."""
+
+    module: str
+    name: str
+
+    @property
+    def __name__(self) -> str:
+        return self.name
+
+
+class _RegisterStub:
+    """Stand-in for ``mcp`` when a worker re-runs ``register(mcp)``.
+
+    ``@tool`` only collects functions inside workers; any direct ``mcp.*``
+    call made by ``register`` is ignored.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return lambda *args, **kwargs: None
+
+
+def _resolve_ref(ref: _ToolRef) -> Callable[..., Any]:
+    global _collecting
+    key = (ref.module, ref.name)
+    fn = _resolved.get(key)
+    if fn is not None:
+        return fn
+    module = importlib.import_module(ref.module)
+    collected: dict[str, Callable[..., Any]] = {}
+    _collecting = collected
+    try:
+        module.register(_RegisterStub())
+    finally:
+        _collecting = None
+    for name, tool_fn in collected.items():
+        _resolved[(ref.module, name)] = tool_fn
+    if key not in _resolved:
+        raise LookupError(f"Tool '{ref.name}' is not registered by {ref.module}.register()")
+    return _resolved[key]
+
+
+def _tool_ref(fn: Callable[..., Any], tool_name: str) -> _ToolRef | None:
+    """Reference for *fn* if its module has a ``register`` that can define it."""
+    module = sys.modules.get(getattr(fn, "__module__", None) or "")
+    if module is None or module.__name__ == "__main__":
+        return None
+    if not callable(getattr(module, "register", None)):
+        return None
+    return _ToolRef(module.__name__, tool_name)
+
+
+# --------------------------------------------------------------------------- #
+# Shared-memory argument handoff                                               #
+# --------------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class _SharedArg:
+    """Picklable reference to an argument stored in shared memory."""
+
+    name: str
+    size: int
+    kind: str  # "bytes" | "bytearray" | "list"
+    typecode: str = ""
+
+
+def _pack_list(value: list) -> array | None:
+    """Return an :class:`array` for homogeneous float/int lists, else ``None``."""
+    if not value:
+        return None
+    first = type(value[0])
+    if first is float and all(type(v) is float for v in value):
+        return array("d", value)
+    if first is int and all(type(v) is int for v in value):
+        try:
+            return array("q", value)
+        except OverflowError:
+            return None
+    return None
+
+
+def _export_arg(
+    value: Any, threshold: int
+) -> tuple[Any, shared_memory.SharedMemory | None]:
+    """Move *value* into shared memory if it is large enough to be worth it."""
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) < threshold:
+            return value, None
+        payload: Any = value
+        kind, typecode = type(value).__name__, ""
+    elif isinstance(value, list):
+        packed = _pack_list(value)
+        if packed is None or packed.itemsize * len(packed) < threshold:
+            return value, None
+        payload = memoryview(packed).cast("B")
+        kind, typecode = "list", packed.typecode
+    else:
+        return value, None
+
+    size = len(payload)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    shm.buf[:size] = payload
+    return _SharedArg(name=shm.name, size=size, kind=kind, typecode=typecode), shm
+
+
+def _import_arg(value: Any) -> Any:
+    """Worker side of :func:`_export_arg`."""
+    if not isinstance(value, _SharedArg):
+        return value
+    kwargs = {"track": False} if sys.version_info >= (3, 13) else {}
+    shm = shared_memory.SharedMemory(name=value.name, **kwargs)
+    try:
+        view = shm.buf[: value.size]
+        if value.kind == "list":
+            arr = array(value.typecode)
+            arr.frombytes(view)
+            result: Any = arr.tolist()
+        elif value.kind == "bytearray":
+            result = bytearray(view)
+        else:
+            result = bytes(view)
+        view.release()
+        return result
+    finally:
+        shm.close()
+
+
+# --------------------------------------------------------------------------- #
+# Worker entry points (module level so they pickle by reference)               #
+# --------------------------------------------------------------------------- #
+def _worker_init() -> None:
+    global _IN_WORKER
+    _IN_WORKER = True
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _run_in_worker(fn: Callable[..., Any] | _ToolRef, args: tuple, kwargs: dict) -> Any:
+    if isinstance(fn, _ToolRef):
+        fn = _resolve_ref(fn)
+    args = tuple(_import_arg(a) for a in args)
+    kwargs = {k: _import_arg(v) for k, v in kwargs.items()}
+    return fn(*args, **kwargs)
+
+
+# --------------------------------------------------------------------------- #
+# Pool                                                                         #
+# --------------------------------------------------------------------------- #
+class ToolProcessPool:
+    """Lazily started ``spawn`` process pool for CPU-bound tools.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker processes.
+    max_calls_per_worker : int
+        Recycle a worker after this many calls (``0`` disables recycling).
+    shm_threshold : int
+        Arguments at least this many bytes large travel via shared memory.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        max_calls_per_worker: int = 0,
+        shm_threshold: int = 64 * 1024,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self._max_workers = max_workers
+        self._max_calls = max(0, max_calls_per_worker)
+        self._shm_threshold = shm_threshold
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_use = False
+        self._generation_calls = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._crashes = 0
+        self._recycled = 0
+        self._shm_args = 0
+
+    @property
+    def in_use(self) -> bool:
+        """``True`` once at least one tool has been attached."""
+        return self._in_use
+
+    def attach(self, fn: Callable[..., Any], tool_name: str) -> Callable[..., Any] | _ToolRef:
+        """Return what to pass to :meth:`run` for *fn* and mark the pool as in use.
+
+        Module-level functions are sent as themselves; functions defined
+        inside their module's ``register(mcp)`` as a :class:`_ToolRef`.
+        Raises :class:`TypeError` for anything else (lambdas, closures in
+        modules without ``register``).
+        """
+        target: Callable[..., Any] | _ToolRef | None
+        try:
+            pickle.dumps(fn)
+            target = fn
+        except Exception:
+            target = _tool_ref(fn, tool_name)
+        if target is None:
+            raise TypeError(
+                f"Tool '{tool_name}' cannot run in a worker process: define it at "
+                "module level or inside the module's register(mcp)"
+            )
+        self._in_use = True
+        return target
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        kwargs: dict[str, Any] = {
+            "max_workers": self._max_workers,
+            "mp_context": multiprocessing.get_context("spawn"),
+            "initializer": _worker_init,
+        }
+        if self._max_calls and _NATIVE_RECYCLING:
+            kwargs["max_tasks_per_child"] = self._max_calls
+        return ProcessPoolExecutor(**kwargs)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+                self._generation_calls = 0
+            elif (
+                self._max_calls
+                and not _NATIVE_RECYCLING
+                and self._generation_calls >= self._max_calls * self._max_workers
+            ):
+                # Python 3.10: recycle the whole generation of workers at once
+                old, self._executor = self._executor, self._new_executor()
+                self._generation_calls = 0
+                self._recycled += self._max_workers
+                old.shutdown(wait=False)
+            self._generation_calls += 1
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """Spawn all workers up-front so the first call does not pay for it."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(loop.run_in_executor(executor, _warm_up) for _ in range(self._max_workers))
+        )
+        logger.info(f"Tool process pool warmed ({len(set(pids))} workers)")
+
+    async def run(self, fn: Callable[..., Any] | _ToolRef, /, *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` in a worker process and await the result.
+
+        *fn* is a function or the :class:`_ToolRef` returned by :meth:`attach`.
+        """
+        segments: list[shared_memory.SharedMemory] = []
+
+        def _export(value: Any) -> Any:
+            exported, shm = _export_arg(value, self._shm_threshold)
+            if shm is not None:
+                segments.append(shm)
+            return exported
+
+        try:
+            call_args = tuple(_export(a) for a in args)
+            call_kwargs = {k: _export(v) for k, v in kwargs.items()}
+            executor = self._get_executor()
+            with self._lock:
+                self._submitted += 1
+                self._shm_args += len(segments)
+            try:
+                cfut = executor.submit(_run_in_worker, fn, call_args, call_kwargs)
+                result = await asyncio.wrap_future(cfut)
+            except BrokenProcessPool:
+                with self._lock:
+                    self._failed += 1
+                    self._crashes += 1
+                self._discard_executor(executor)
+                name = getattr(fn, "__name__", repr(fn))
+                logger.error(f"Tool worker process crashed while running '{name}'")
+                raise McpError(
+                    types.ErrorData(
+                        code=-32000,
+                        message=f"Tool '{name}' worker process crashed",
+                    )
+                ) from None
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool usage.
+
+        With native recycling (Python 3.11+) ``recycled`` is derived from the
+        number of finished calls.
+        """
+        with self._lock:
+            recycled = self._recycled
+            if self._max_calls and _NATIVE_RECYCLING:
+                recycled = (self._completed + self._failed) // self._max_calls
+            return {
+                "max_workers": self._max_workers,
+                "in_flight": self._submitted - self._completed - self._failed,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "crashes": self._crashes,
+                "recycled": recycled,
+                "shared_memory_args": self._shm_args,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Terminate the workers.  A later :meth:`run` starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+            logger.debug("Tool process pool shut down")
@@ -7,13 +7,19 @@ tool in :class:`ToolEntry`, eliminating the Observer pattern.
 
 from __future__ import annotations
 
+import logging
 import threading
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 import mcp.types as types
 
 from viyv_mcp.app.security.domain.models import ToolSecurityMeta
+from viyv_mcp.server.concurrency import ConcurrencyLimit
+from viyv_mcp.server.result_cache import CachePolicy
+from viyv_mcp.server.uri_template import TemplateIndex, is_template
+
+logger = logging.getLogger(__name__)
 
 _DEFAULT_SECURITY = ToolSecurityMeta()
 
@@ -31,12 +37,20 @@ class ToolEntry:
     title: str | None = None
     destructive: bool | None = None
     security: ToolSecurityMeta = field(default_factory=ToolSecurityMeta)
+    read_only: bool | None = None
+    # Result caching (see viyv_mcp.server.result_cache); never for destructive tools
+    cache: CachePolicy | None = None
+    # Coalesce identical concurrent calls (see viyv_mcp.server.single_flight)
+    single_flight: bool = False
+    # Per-tool concurrency limit (see viyv_mcp.server.concurrency)
+    concurrency: ConcurrencyLimit | None = None
 
     def to_mcp_tool(self) -> types.Tool:
         annotations = None
-        if self.title or self.destructive is not None:
+        if self.title or self.destructive is not None or self.read_only is not None:
             annotations = types.ToolAnnotations(
                 title=self.title,
+                readOnlyHint=self.read_only,
                 destructiveHint=self.destructive,
             )
         return types.Tool(
@@ -49,7 +63,12 @@ class ToolEntry:
 
 @dataclass
 class ResourceEntry:
-    """A registered resource."""
+    """A registered resource.
+
+    If :attr:`uri` contains ``{...}`` expressions it is a URI template: it is
+    advertised via ``resources/templates/list`` and its handler is called
+    with the variables extracted from the requested URI.
+    """
 
     uri: str
     name: str
@@ -57,6 +76,10 @@ class ResourceEntry:
     fn: Callable[..., Any]
     mime_type: str | None = None
 
+    @property
+    def is_template(self) -> bool:
+        return is_template(self.uri)
+
 
 @dataclass
 class PromptEntry:
@@ -74,25 +97,66 @@ class McpRegistry:
     Also serves as the :class:`ToolMetadataProvider` consumed by
     :class:`~viyv_mcp.app.security.service.SecurityService` — the
     :meth:`get` method returns :class:`ToolSecurityMeta` for a tool.
+
+    :attr:`version` increases monotonically on every register/unregister so
+    consumers can memoize derived views (e.g. the materialized tools/list).
+    Tools are additionally indexed by security namespace so per-agent
+    visibility can be resolved without touching every tool.
     """
 
     def __init__(self) -> None:
         self._tools: Dict[str, ToolEntry] = {}
+        # namespace -> {tool name -> entry} (insertion-ordered)
+        self._ns_index: Dict[str, Dict[str, ToolEntry]] = {}
+        # tool name -> registration ordinal (same order as ``_tools``)
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
         self._resources: Dict[str, ResourceEntry] = {}
+        # Templated resources, resolved by :meth:`resolve_resource`
+        self._templates = TemplateIndex()
         self._prompts: Dict[str, PromptEntry] = {}
         self._lock = threading.Lock()
+        self._version = 0
         self.on_first_resource: Callable[[], None] | None = None
         self.on_first_prompt: Callable[[], None] | None = None
 
+    @property
+    def version(self) -> int:
+        """Monotonic change counter (no lock needed for an int read)."""
+        return self._version
+
     # -- Tools ---------------------------------------------------------- #
 
     def register_tool(self, entry: ToolEntry) -> None:
+        if entry.cache is not None and (entry.destructive or not entry.cache.enabled):
+            if entry.destructive:
+                logger.warning(f"Tool '{entry.name}' is destructive; its results are not cached")
+            entry.cache = None
         with self._lock:
+            old = self._tools.get(entry.name)
+            if old is not None:
+                self._unindex(old)
+            else:
+                self._order[entry.name] = self._next_order
+                self._next_order += 1
             self._tools[entry.name] = entry
+            self._ns_index.setdefault(entry.security.namespace, {})[entry.name] = entry
+            self._version += 1
 
     def unregister_tool(self, name: str) -> None:
         with self._lock:
-            self._tools.pop(name, None)
+            old = self._tools.pop(name, None)
+            if old is not None:
+                self._unindex(old)
+                del self._order[name]
+                self._version += 1
+
+    def _unindex(self, entry: ToolEntry) -> None:
+        bucket = self._ns_index.get(entry.security.namespace)
+        if bucket is not None:
+            bucket.pop(entry.name, None)
+            if not bucket:
+                del self._ns_index[entry.security.namespace]
 
     def get_tool(self, name: str) -> ToolEntry | None:
         with self._lock:
@@ -102,6 +166,27 @@ class McpRegistry:
         with self._lock:
             return list(self._tools.values())
 
+    def snapshot_tools(self) -> tuple[int, list[ToolEntry]]:
+        """Return ``(version, tools)`` read atomically under the lock."""
+        with self._lock:
+            return self._version, list(self._tools.values())
+
+    def tool_names_in_namespaces(self, namespaces: Iterable[str]) -> list[str]:
+        """Return the names of all tools whose namespace is in *namespaces*.
+
+        Names are in registration order, as in :meth:`list_tools`.  Cost is
+        proportional to the number of matching tools, not to the size of the
+        registry.
+        """
+        with self._lock:
+            names: list[str] = []
+            for ns in namespaces:
+                bucket = self._ns_index.get(ns)
+                if bucket:
+                    names.extend(bucket)
+            names.sort(key=self._order.__getitem__)
+            return names
+
     # -- ToolMetadataProvider (SecurityService 互換) ---------------------- #
 
     def get(self, tool_name: str) -> ToolSecurityMeta:
@@ -120,13 +205,40 @@ class McpRegistry:
         with self._lock:
             first = len(self._resources) == 0
             self._resources[entry.uri] = entry
+            if entry.is_template:
+                try:
+                    self._templates.add(entry.uri, entry)
+                except ValueError as exc:
+                    # Still listed, but cannot be resolved from a concrete URI
+                    logger.warning(f"Resource template not indexed: {exc}")
+            self._version += 1
         if first and self.on_first_resource:
             self.on_first_resource()
 
+    def unregister_resource(self, uri: str) -> None:
+        with self._lock:
+            if self._resources.pop(uri, None) is not None:
+                self._templates.remove(uri)
+                self._version += 1
+
     def get_resource(self, uri: str) -> ResourceEntry | None:
+        """Return the entry registered under exactly *uri* (or template string)."""
         with self._lock:
             return self._resources.get(uri)
 
+    def resolve_resource(self, uri: str) -> tuple[ResourceEntry, dict[str, str]] | None:
+        """Resolve a concrete *uri* to ``(entry, template variables)``.
+
+        An exactly registered URI wins; otherwise the template index is
+        consulted (cost proportional to the URI length, not to the number
+        of templates).
+        """
+        with self._lock:
+            entry = self._resources.get(uri)
+            if entry is not None and not entry.is_template:
+                return entry, {}
+            return self._templates.resolve(uri)
+
     def list_resources(self) -> list[ResourceEntry]:
         with self._lock:
             return list(self._resources.values())
@@ -137,9 +249,15 @@ class McpRegistry:
         with self._lock:
             first = len(self._prompts) == 0
             self._prompts[entry.name] = entry
+            self._version += 1
         if first and self.on_first_prompt:
             self.on_first_prompt()
 
+    def unregister_prompt(self, name: str) -> None:
+        with self._lock:
+            if self._prompts.pop(name, None) is not None:
+                self._version += 1
+
     def get_prompt(self, name: str) -> PromptEntry | None:
         with self._lock:
             return self._prompts.get(name)
@@ -0,0 +1,153 @@
+"""Result cache for read-only tools.
+
+Agents often repeat the same lookup with identical arguments.  A tool
+registered with a :class:`CachePolicy` has its successful results kept in a
+per-tool LRU (``size`` entries, each valid for ``ttl`` seconds) keyed by a
+digest of the canonicalized arguments and, optionally, the calling agent:
+
+* ``scope="global"``: one entry per argument set, shared by every caller
+* ``scope="namespace"``: separate entries per agent namespace
+* ``scope="agent"``: separate entries per agent (``sub`` claim)
+
+Errors (raised exceptions and ``isError`` results) are never stored, and
+:class:`~viyv_mcp.server.registry.McpRegistry` refuses policies on
+destructive tools.  Re-registering a tool drops its cached results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+CACHE_SCOPES = ("global", "namespace", "agent")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long and how many results of one tool to keep."""
+
+    ttl: float
+    size: int = 128
+    scope: str = "global"
+
+    def __post_init__(self) -> None:
+        if self.scope not in CACHE_SCOPES:
+            raise ValueError(f"Unknown cache scope '{self.scope}' (expected one of {CACHE_SCOPES})")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.size > 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CachePolicy":
+        return cls(
+            ttl=float(data.get("ttl", 60)),
+            size=int(data.get("size", 128)),
+            scope=str(data.get("scope", "global")),
+        )
+
+
+def scope_key(policy: CachePolicy, agent: Any) -> str:
+    """Partition of the cache an *agent*'s call falls into."""
+    if agent is None or policy.scope == "global":
+        return ""
+    if policy.scope == "namespace":
+        return f"ns:{agent.namespace}"
+    return f"sub:{agent.sub}"
+
+
+def argument_key(arguments: dict | None, scope: str = "") -> bytes:
+    """Digest of *arguments* that ignores key order and formatting."""
+    canonical = json.dumps(
+        arguments or {}, sort_keys=True, separators=(",", ":"),
+        ensure_ascii=False, default=str,
+    )
+    return hashlib.blake2b(f"{scope}\0{canonical}".encode("utf-8"), digest_size=16).digest()
+
+
+class _ToolCache:
+    def __init__(self, owner: Any, policy: CachePolicy) -> None:
+        self.owner = owner
+        self.policy = policy
+        self.entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+class ToolResultCache:
+    """Per-tool TTL + LRU caches of normalized tool results. Thread-safe."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._tools: dict[str, _ToolCache] = {}
+        self._lock = threading.Lock()
+
+    def get(self, entry: Any, key: bytes) -> Any | None:
+        """Return the cached result of *entry* for *key*, or None on a miss.
+
+        *entry* is the registry's ``ToolEntry``; a different object than the
+        one the results were cached for (re-registration) empties the cache.
+        """
+        now = self._clock()
+        with self._lock:
+            cache = self._cache_for(entry)
+            hit = cache.entries.get(key)
+            if hit is None or hit[0] <= now:
+                if hit is not None:
+                    del cache.entries[key]
+                cache.misses += 1
+                return None
+            cache.entries.move_to_end(key)
+            cache.hits += 1
+            return hit[1]
+
+    def put(self, entry: Any, key: bytes, result: Any) -> None:
+        policy = entry.cache
+        expires_at = self._clock() + policy.ttl
+        with self._lock:
+            cache = self._cache_for(entry)
+            cache.entries[key] = (expires_at, result)
+            cache.entries.move_to_end(key)
+            while len(cache.entries) > policy.size:
+                cache.entries.popitem(last=False)
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop the cached results of tool *name* (or of every tool)."""
+        with self._lock:
+            if name is None:
+                for cache in self._tools.values():
+                    cache.entries.clear()
+            elif name in self._tools:
+                self._tools[name].entries.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-tool entry counts, hits, misses and hit ratio."""
+        with self._lock:
+            out = {}
+            for name, cache in self._tools.items():
+                total = cache.hits + cache.misses
+                out[name] = {
+                    "size": len(cache.entries),
+                    "max_size": cache.policy.size,
+                    "ttl": cache.policy.ttl,
+                    "hits": cache.hits,
+                    "misses": cache.misses,
+                    "hit_ratio": cache.hits / total if total else 0.0,
+                }
+            return out
+
+    def _cache_for(self, entry: Any) -> _ToolCache:
+        cache = self._tools.get(entry.name)
+        if cache is None or cache.owner is not entry:
+            # First use, or the tool was re-registered: start afresh but
+            # keep the counters so the hit ratio spans re-syncs
+            fresh = _ToolCache(entry, entry.cache)
+            if cache is not None:
+                fresh.hits, fresh.misses = cache.hits, cache.misses
+            cache = self._tools[entry.name] = fresh
+        return cache
@@ -0,0 +1,76 @@
+"""Single-flight coalescing of identical concurrent tool calls.
+
+When several callers invoke the same idempotent tool with the same arguments
+at once, only the first (the *leader*) starts the call; the others
+(*followers*) await its outcome, success or error alike.
+
+The call runs in its own task, and every caller, the leader included,
+awaits it through :func:`asyncio.shield`.  A caller that is cancelled (for
+example because its client disconnected) only stops waiting; the call keeps
+running for the remaining callers and is cancelled once nobody is left.
+
+The shared call runs with the leader's context (ContextVars such as the
+agent identity), so coalesced tools must not depend on who calls them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent awaitables by key."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``fn()``, shared with concurrent calls for *key*."""
+        flight = self._flights.get(key)
+        if flight is None or flight.task.done():
+            flight = _Flight(asyncio.get_running_loop().create_task(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, k=key, f=flight: self._forget(k, f))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller went away: stop the call, and let a new
+                # caller start afresh instead of joining a dying flight
+                self._forget(key, flight)
+                flight.task.cancel()
+                logger.debug(f"Single-flight call {key!r} cancelled (no callers left)")
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
@@ -0,0 +1,251 @@
+"""RFC 6570 URI templates and a prefix-trie index for resolving them.
+
+Only the expressions that make sense for resource URIs are supported:
+
+* ``{var}`` (level 1, simple string expansion) matches one or more
+  characters up to the next ``/``, ``?`` or ``#``.
+* ``{+var}`` (level 2, reserved expansion) matches one or more characters
+  of any kind, including ``/``.
+
+Extracted values are percent-decoded.
+
+:class:`TemplateIndex` stores compiled templates in a trie keyed by the
+``/``-separated segments of the template (so the scheme and host form the
+first levels).  A lookup walks the URI's segments once, preferring literal
+children (one dict lookup) over per-segment matchers, so its cost grows with
+the length of the URI rather than with the number of registered templates.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+from urllib.parse import quote, unquote
+
+_EXPRESSION = re.compile(r"\{([^{}]*)\}")
+_VARNAME = re.compile(r"^[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)*$")
+# RFC 3986 reserved characters, kept as-is by {+var} expansion
+_RESERVED = ":/?#[]@!$&'()*+,;="
+
+
+def is_template(uri: str) -> bool:
+    """Return True if *uri* contains at least one ``{...}`` expression."""
+    return _EXPRESSION.search(uri) is not None
+
+
+@dataclass(frozen=True)
+class _Part:
+    literal: str | None = None
+    var: str | None = None
+    reserved: bool = False
+
+
+def _parse(template: str) -> List[_Part]:
+    parts: List[_Part] = []
+    pos = 0
+    for m in _EXPRESSION.finditer(template):
+        if m.start() > pos:
+            parts.append(_Part(literal=template[pos:m.start()]))
+        expr = m.group(1)
+        reserved = expr.startswith("+")
+        name = expr[1:] if reserved else expr
+        if not _VARNAME.match(name):
+            raise ValueError(
+                f"Unsupported expression '{{{expr}}}' in URI template '{template}' "
+                "(only {var} and {+var} are supported)"
+            )
+        if parts and parts[-1].var is not None:
+            raise ValueError(f"Adjacent expressions are ambiguous in '{template}'")
+        parts.append(_Part(var=name, reserved=reserved))
+        pos = m.end()
+    if "{" in template[pos:] or "}" in template[pos:]:
+        raise ValueError(f"Unbalanced braces in URI template '{template}'")
+    if pos < len(template):
+        parts.append(_Part(literal=template[pos:]))
+    return parts
+
+
+def _regex(parts: List[_Part]) -> re.Pattern:
+    pattern = []
+    for part in parts:
+        if part.literal is not None:
+            pattern.append(re.escape(part.literal))
+        elif part.reserved:
+            pattern.append(f"(?P<{_group(part.var)}>.+?)")
+        else:
+            pattern.append(f"(?P<{_group(part.var)}>[^/?#]+?)")
+    return re.compile("".join(pattern) + r"\Z")
+
+
+def _group(var: str) -> str:
+    # Regex group names cannot contain dots
+    return var.replace(".", "__")
+
+
+class UriTemplate:
+    """A compiled URI template.
+
+    >>> UriTemplate("echo://{message}").match("echo://hi%20there")
+    {'message': 'hi there'}
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts = _parse(template)
+        self.variables = [p.var for p in self.parts if p.var is not None]
+        # Compiled on first match: the index only matches per-segment pieces
+        self._regex: re.Pattern | None = None
+
+    def __repr__(self) -> str:
+        return f"UriTemplate({self.template!r})"
+
+    def match(self, uri: str) -> Dict[str, str] | None:
+        """Return the extracted variables if *uri* matches, else None."""
+        if self._regex is None:
+            self._regex = _regex(self.parts)
+        m = self._regex.match(uri)
+        if m is None:
+            return None
+        return {var: unquote(m.group(_group(var))) for var in self.variables}
+
+    def expand(self, variables: Dict[str, Any]) -> str:
+        """Build a concrete URI (the inverse of :meth:`match`)."""
+        out = []
+        for part in self.parts:
+            if part.literal is not None:
+                out.append(part.literal)
+            else:
+                value = str(variables[part.var])
+                out.append(quote(value, safe=_RESERVED if part.reserved else ""))
+        return "".join(out)
+
+    def segments(self) -> Tuple[List[str], str | None]:
+        """Split into ``/``-separated segments up to the first ``{+var}``.
+
+        Returns ``(segments, tail)`` where *tail* is the remainder of the
+        template starting at the segment holding the reserved expression
+        (or None when there is none).
+        """
+        segments = self.template.split("/")
+        for i, seg in enumerate(segments):
+            if "{+" in seg:
+                return segments[:i], "/".join(segments[i:])
+        return segments, None
+
+
+@dataclass
+class _Node:
+    literal: Dict[str, "_Node"] = field(default_factory=dict)
+    # segment template string -> (compiled matcher, child node)
+    patterns: Dict[str, Tuple[UriTemplate, "_Node"]] = field(default_factory=dict)
+    # tail template string -> (compiled matcher, value); may span segments
+    tails: Dict[str, Tuple[UriTemplate, Any]] = field(default_factory=dict)
+    # value stored for a template ending exactly at this node
+    value: Any = None
+    template: UriTemplate | None = None
+
+    def empty(self) -> bool:
+        return not (self.literal or self.patterns or self.tails or self.template)
+
+
+class TemplateIndex:
+    """Maps URI templates to values and resolves concrete URIs against them.
+
+    Not thread-safe on its own; :class:`~viyv_mcp.server.registry.McpRegistry`
+    guards it with its lock.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._templates: Dict[str, UriTemplate] = {}
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, template: str) -> bool:
+        return template in self._templates
+
+    def add(self, template: str, value: Any) -> UriTemplate:
+        """Index *template* (replacing any previous value). Raises ValueError."""
+        compiled = UriTemplate(template)
+        if template in self._templates:
+            self.remove(template)
+        segments, tail = compiled.segments()
+        node = self._root
+        for seg in segments:
+            if is_template(seg):
+                entry = node.patterns.get(seg)
+                if entry is None:
+                    entry = node.patterns[seg] = (UriTemplate(seg), _Node())
+                node = entry[1]
+            else:
+                node = node.literal.setdefault(seg, _Node())
+        if tail is None:
+            node.value, node.template = value, compiled
+        else:
+            node.tails[tail] = (UriTemplate(tail), (compiled, value))
+        self._templates[template] = compiled
+        return compiled
+
+    def remove(self, template: str) -> bool:
+        compiled = self._templates.pop(template, None)
+        if compiled is None:
+            return False
+        segments, tail = compiled.segments()
+        path: List[Tuple[_Node, str, bool]] = []
+        node = self._root
+        for seg in segments:
+            is_pattern = is_template(seg)
+            path.append((node, seg, is_pattern))
+            node = node.patterns[seg][1] if is_pattern else node.literal[seg]
+        if tail is None:
+            node.value, node.template = None, None
+        else:
+            node.tails.pop(tail, None)
+        # Prune empty branches
+        for parent, seg, is_pattern in reversed(path):
+            child = parent.patterns[seg][1] if is_pattern else parent.literal[seg]
+            if not child.empty():
+                break
+            if is_pattern:
+                del parent.patterns[seg]
+            else:
+                del parent.literal[seg]
+        return True
+
+    def resolve(self, uri: str) -> Tuple[Any, Dict[str, str]] | None:
+        """Return ``(value, variables)`` for the best match of *uri*, or None.
+
+        Literal segments win over templated ones; within a node, templated
+        segments are tried before ``{+var}`` tails.
+        """
+        segments = uri.split("/")
+        return self._resolve(self._root, segments, 0, {})
+
+    def _resolve(
+        self, node: _Node, segments: List[str], i: int, variables: Dict[str, str],
+    ) -> Tuple[Any, Dict[str, str]] | None:
+        if i == len(segments):
+            if node.template is not None:
+                return node.value, variables
+        else:
+            seg = segments[i]
+            child = node.literal.get(seg)
+            if child is not None:
+                found = self._resolve(child, segments, i + 1, variables)
+                if found is not None:
+                    return found
+            for matcher, child in node.patterns.values():
+                extracted = matcher.match(seg)
+                if extracted is not None:
+                    found = self._resolve(child, segments, i + 1, {**variables, **extracted})
+                    if found is not None:
+                        return found
+        if node.tails and i < len(segments):
+            rest = "/".join(segments[i:])
+            for matcher, (_, value) in node.tails.values():
+                extracted = matcher.match(rest)
+                if extracted is not None:
+                    return value, {**variables, **extracted}
+        return None
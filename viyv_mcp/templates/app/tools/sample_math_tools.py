@@ -69,6 +69,7 @@ def register(mcp):  # auto_register_modules から呼ばれる
         group="統計ツール",
         namespace="analytics",          # ★ namespace: analytics エージェントのみ表示
         security_level=2,               # ★ security_level: clearance ≤ 2 で実行可
+        executor="process",             # ★ CPU 負荷の高い計算はワーカープロセスで実行
     )
     def average(
         numbers: Annotated[